@@ -0,0 +1,14 @@
+"""
+Benchmarks for prance.
+
+The `generate` module creates synthetic specs of configurable size and shape,
+and the `run` module measures how long parsing, resolving and serializing
+them takes, and how much memory that needs. Run the benchmarks with::
+
+  $ python -m benchmarks.run --help
+"""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ("generate", "run")
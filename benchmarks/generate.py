@@ -0,0 +1,186 @@
+"""
+Deterministic generator of synthetic OpenAPI 3.0 specs.
+
+The specs are shaped by a few parameters:
+
+- `paths`: The number of paths. Each path has a GET and a POST operation,
+  referencing a schema each, and a shared parameter.
+- `schemas`: The number of schemas.
+- `fanout`: The number of schemas each schema references. Schemas form a
+  tree, with schema `i` referencing schemas `i * fanout + 1` and following,
+  so that every schema but the first is referenced by exactly one other
+  schema.
+- `depth`: How deeply the properties of each schema are nested before the
+  references to other schemas appear.
+- `recursive`: If True, every schema without references to other schemas
+  references the first schema instead, creating reference cycles. These
+  specs can only be resolved with a recursion limit handler.
+- `files`: The number of files schemas are spread across. With more than one
+  file, the spec itself contains no schemas; schema `i` is placed in the
+  file `schemas_{i % files}.yaml`.
+
+The same parameters always produce the same specs.
+"""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+def _schema_file(index, files):
+    """Return the name of the file schema `index` is placed in."""
+    if files <= 1:
+        return None
+    return f"schemas_{index % files}.yaml"
+
+
+def _schema_ref(index, files, from_file=None):
+    """Return the reference to schema `index` from the given file."""
+    target = _schema_file(index, files)
+    if target is None:
+        return f"#/components/schemas/Schema{index}"
+    if target == from_file:
+        return f"#/Schema{index}"
+    return f"{target}#/Schema{index}"
+
+
+def _schema(index, schemas, fanout, depth, recursive, files):
+    """Return schema `index`."""
+    here = _schema_file(index, files)
+
+    children = [
+        child
+        for child in range(index * fanout + 1, index * fanout + fanout + 1)
+        if child < schemas
+    ]
+    if not children and recursive:
+        children = [0]
+
+    innermost = {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": {"type": "integer", "format": "int64"},
+            "name": {"type": "string", "maxLength": 100},
+        },
+    }
+    for child in children:
+        innermost["properties"][f"child{child}"] = {
+            "$ref": _schema_ref(child, files, here)
+        }
+
+    schema = innermost
+    for level in range(depth):
+        schema = {
+            "type": "object",
+            "description": f"Level {level} of schema {index}.",
+            "properties": {
+                "tag": {"type": "string"},
+                "nested": schema,
+            },
+        }
+    return schema
+
+
+def _operation(name, schema_ref, request):
+    """Return an operation using the referenced schema."""
+    content = {"application/json": {"schema": {"$ref": schema_ref}}}
+    operation = {
+        "operationId": name,
+        "summary": f"Operation {name}.",
+        "parameters": [{"$ref": "#/components/parameters/Limit"}],
+        "responses": {
+            "200": {"description": "Success.", "content": content},
+            "default": {
+                "description": "Error.",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/Error"}
+                    }
+                },
+            },
+        },
+    }
+    if request:
+        operation["requestBody"] = {"required": True, "content": content}
+    return operation
+
+
+def generate_specs(paths=10, schemas=10, fanout=2, depth=1, recursive=False, files=1):
+    """
+    Return the synthetic specs.
+
+    See the module documentation for the parameters.
+
+    :return: The file names and contents, as a dict. The spec itself is
+        named `openapi.yaml`.
+    :rtype: dict
+    """
+    if schemas < 1:
+        raise ValueError("At least one schema is required!")
+
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic spec", "version": "1.0.0"},
+        "paths": {},
+        "components": {
+            "parameters": {
+                "Limit": {
+                    "name": "limit",
+                    "in": "query",
+                    "schema": {"type": "integer", "format": "int32"},
+                }
+            },
+            "schemas": {
+                "Error": {
+                    "type": "object",
+                    "required": ["code"],
+                    "properties": {
+                        "code": {"type": "integer"},
+                        "message": {"type": "string"},
+                    },
+                }
+            },
+        },
+    }
+    result = {"openapi.yaml": spec}
+
+    for index in range(schemas):
+        schema = _schema(index, schemas, fanout, depth, recursive, files)
+        filename = _schema_file(index, files)
+        if filename is None:
+            spec["components"]["schemas"][f"Schema{index}"] = schema
+        else:
+            result.setdefault(filename, {})[f"Schema{index}"] = schema
+
+    for index in range(paths):
+        get_ref = _schema_ref(index % schemas, files)
+        post_ref = _schema_ref((index * 7 + 3) % schemas, files)
+        spec["paths"][f"/resources{index}"] = {
+            "get": _operation(f"get{index}", get_ref, False),
+            "post": _operation(f"post{index}", post_ref, True),
+        }
+
+    return result
+
+
+def generate(directory, **parameters):
+    """
+    Write synthetic specs to the directory.
+
+    See `generate_specs()` for the parameters.
+
+    :param str directory: The directory to write the spec files to. It must
+        exist.
+    :return: The file name of the spec.
+    :rtype: str
+    """
+    import os.path
+
+    from prance.util import formats, fs
+
+    for filename, contents in generate_specs(**parameters).items():
+        path = os.path.join(directory, filename)
+        fs.write_file(path, formats.serialize_spec(contents, path))
+    return os.path.join(directory, "openapi.yaml")
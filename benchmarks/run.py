@@ -0,0 +1,269 @@
+"""
+Measure how prance scales with the size of specs.
+
+For each size, a synthetic spec is generated (see `benchmarks.generate`),
+and each phase is run a number of times. The time of the first and the
+fastest run is reported; the first run includes one-time costs such as
+building validators. Peak memory use of each phase is measured in a separate
+run, as tracing allocations slows everything down considerably.
+
+The phases are:
+
+- `load`: Reading and parsing the spec file.
+- `BaseParser`: Parsing and validating without resolving references. Not
+  possible for specs split across several files.
+- `RefResolver`: Resolving the references in the parsed spec.
+- `ResolvingParser`: Parsing, resolving and validating.
+- `TranslatingParser`: Parsing, translating references and validating.
+- `serialize-json` and `serialize-yaml`: Serializing the resolved spec.
+"""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+PHASES = (
+    "load",
+    "BaseParser",
+    "RefResolver",
+    "ResolvingParser",
+    "TranslatingParser",
+    "serialize-json",
+    "serialize-yaml",
+)
+
+
+def _recursion_limit_handler(limit, parsed_url, recursions=()):
+    # Stop recursing with an empty object schema; it keeps the spec valid.
+    return {"type": "object"}
+
+
+def _phases(filename, backend, recursive, files):
+    """Return the phases to run for the spec, as a dict of callables."""
+    import prance
+    from prance.util import formats, fs
+    from prance.util.resolver import RefResolver
+
+    options = {"backend": backend}
+    resolver_options = {}
+    if recursive:
+        resolver_options["recursion_limit_handler"] = _recursion_limit_handler
+
+    specs = formats.parse_spec(fs.read_file(filename), filename)
+    resolved = prance.ResolvingParser(
+        filename, **options, **resolver_options
+    ).specification
+
+    def load():
+        formats.parse_spec(fs.read_file(filename), filename)
+
+    def base_parser():
+        prance.BaseParser(filename, **options)
+
+    def ref_resolver():
+        RefResolver(
+            specs, fs.abspath(filename), **resolver_options
+        ).resolve_references()
+
+    def resolving_parser():
+        prance.ResolvingParser(filename, **options, **resolver_options)
+
+    def translating_parser():
+        prance._TranslatingParser(filename, **options)
+
+    def serialize_json():
+        formats.serialize_spec(resolved, "spec.json")
+
+    def serialize_yaml():
+        formats.serialize_spec(resolved, "spec.yaml")
+
+    phases = {
+        "load": load,
+        "BaseParser": base_parser,
+        "RefResolver": ref_resolver,
+        "ResolvingParser": resolving_parser,
+        "TranslatingParser": translating_parser,
+        "serialize-json": serialize_json,
+        "serialize-yaml": serialize_yaml,
+    }
+    if files > 1:
+        # Validation backends cannot follow relative references to files.
+        del phases["BaseParser"]
+    return phases
+
+
+def _measure_time(func, repeat):
+    """Return the duration of the first and the fastest run, in seconds."""
+    import time
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return durations[0], min(durations)
+
+
+def _measure_memory(func):
+    """Return the peak memory allocated during a run, in Bytes."""
+    import gc
+    import tracemalloc
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - base
+
+
+def run(
+    sizes,
+    fanout=2,
+    depth=1,
+    recursive=False,
+    files=1,
+    repeat=3,
+    memory=True,
+    backend=None,
+    phases=PHASES,
+):
+    """
+    Run the benchmarks.
+
+    :param list sizes: The sizes to run the benchmarks with. The size is used
+        both as the number of paths and the number of schemas.
+    :param int fanout: [optional] See `benchmarks.generate`.
+    :param int depth: [optional] See `benchmarks.generate`.
+    :param bool recursive: [optional] See `benchmarks.generate`.
+    :param int files: [optional] See `benchmarks.generate`.
+    :param int repeat: [optional] How often to run each phase.
+    :param bool memory: [optional] Whether to measure peak memory use.
+    :param str backend: [optional] The validation backend to use. Defaults
+        to the best of the installed backends.
+    :param list phases: [optional] The phases to run. Defaults to all.
+    :return: A result per size and phase, each a dict.
+    :rtype: list
+    """
+    import tempfile
+
+    from prance.util import default_validation_backend
+
+    from .generate import generate
+
+    backend = backend or default_validation_backend()
+
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            filename = generate(
+                directory,
+                paths=size,
+                schemas=size,
+                fanout=fanout,
+                depth=depth,
+                recursive=recursive,
+                files=files,
+            )
+            available = _phases(filename, backend, recursive, files)
+            for phase in phases:
+                func = available.get(phase, None)
+                if func is None:
+                    continue
+                first, best = _measure_time(func, repeat)
+                results.append(
+                    {
+                        "size": size,
+                        "phase": phase,
+                        "first": first,
+                        "best": best,
+                        "peak_memory": _measure_memory(func) if memory else None,
+                    }
+                )
+    return results
+
+
+def format_results(results):
+    """Return the results as a table."""
+    lines = [
+        f"{'size':>6}  {'phase':<18} {'first [s]':>10} {'best [s]':>10} "
+        f"{'peak [MiB]':>10}"
+    ]
+    for result in results:
+        peak = result["peak_memory"]
+        peak = "-" if peak is None else f"{peak / 1024 / 1024:.1f}"
+        lines.append(
+            f"{result['size']:>6}  {result['phase']:<18} "
+            f"{result['first']:>10.4f} {result['best']:>10.4f} {peak:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main(args=None):
+    """Run the benchmarks as configured on the command line."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run",
+        description="Measure how prance scales with the size of specs.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[10, 50, 200],
+        help="Comma separated spec sizes; each is used as the number of paths "
+        "and schemas. Default: 10,50,200",
+    )
+    parser.add_argument("--fanout", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--recursive", action="store_true")
+    parser.add_argument("--files", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="Do not measure peak memory use.",
+    )
+    parser.add_argument("--backend", default=None)
+    parser.add_argument(
+        "--phases",
+        type=lambda value: value.split(","),
+        default=list(PHASES),
+        help="Comma separated phases to run. Default: all of " + ",".join(PHASES),
+    )
+    parser.add_argument(
+        "--json",
+        metavar="FILENAME",
+        default=None,
+        help="Also write the results to this file as JSON.",
+    )
+    options = parser.parse_args(args)
+
+    results = run(
+        options.sizes,
+        fanout=options.fanout,
+        depth=options.depth,
+        recursive=options.recursive,
+        files=options.files,
+        repeat=options.repeat,
+        memory=options.memory,
+        backend=options.backend,
+        phases=options.phases,
+    )
+    print(format_results(results))
+
+    if options.json:
+        import json
+
+        with open(options.json, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
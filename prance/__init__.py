@@ -75,6 +75,25 @@ class BaseParser(mixins.YAMLMixin, mixins.JSONMixin):
           validation. Defaults to True.
         :param str encoding: [optional] For local URLs, use the given file encoding
           instead of auto-detecting. Defaults to None.
+        :param mixed disk_cache: [optional] Keep parse results in a persistent
+          cache on disk, so that unchanged files do not need to be parsed again
+          in later runs. Either True for the default cache directory, a
+          directory name or a :py:class:`util.cache.DiskCache` instance.
+          Defaults to None.
+        :param HTTPFetcher fetcher: [optional] Fetch remote URLs with this
+          :py:class:`util.url.HTTPFetcher`, e.g. to share connections, or to
+          set timeouts and retries. Defaults to None.
+        :param Observer observer: [optional] Notify this
+          :py:class:`util.events.Observer` of the phases of parsing, e.g. to
+          collect :py:class:`util.events.Timings`. Defaults to None.
+        :param bool intern: [optional] If True, intern mapping keys and short
+          string values when parsing, which saves memory when keeping many
+          specs around; see :py:func:`util.formats.intern_strings`. Defaults
+          to False.
+        :param bool freeze: [optional] If True, the specification is frozen,
+          i.e. immutable and hashable, so that it can be shared e.g. between
+          threads without copying; see :py:mod:`util.frozen`. Defaults to
+          False.
         """
         assert url or spec_string and not (url and spec_string), (
             "You must provide either a URL to read, or a spec string to "
@@ -125,27 +144,63 @@ class BaseParser(mixins.YAMLMixin, mixins.JSONMixin):
         multiple files by setting its url property and then invoking this
         function.
         """
-        strict = self.options.get("strict", True)
+        from .util.events import observe
 
-        # If we have a file name, we need to read that in.
-        if self.url and self.url != _PLACEHOLDER_URL:
-            from .util.url import fetch_url
+        with observe(self.options.get("observer", None)):
+            strict = self.options.get("strict", True)
+
+            from .util.cache import DiskCache
+
+            disk_cache = DiskCache.from_option(self.options.get("disk_cache", None))
+
+            # If we have a file name, we need to read that in.
+            if self.url and self.url != _PLACEHOLDER_URL:
+                from .util.url import fetch_url
+
+                encoding = self.options.get("encoding", None)
+                self.specification = fetch_url(
+                    self.url,
+                    encoding=encoding,
+                    strict=strict,
+                    disk_cache=disk_cache,
+                    fetcher=self.options.get("fetcher", None),
+                    intern=self.options.get("intern", False),
+                    freeze=self.options.get("freeze", False),
+                )
+
+            # If we have a spec string, try to parse it.
+            if self._spec_string:
+                self.specification = self._parse_spec_string(disk_cache)
 
-            encoding = self.options.get("encoding", None)
-            self.specification = fetch_url(self.url, encoding=encoding, strict=strict)
+            # If we have a parsed spec, convert it to JSON. Then we can validate
+            # the JSON. At this point, we *require* a parsed specification to exist,
+            # so we might as well assert.
+            assert self.specification, "No specification parsed, cannot validate!"
 
-        # If we have a spec string, try to parse it.
-        if self._spec_string:
-            from .util.formats import parse_spec
+            self._validate()
 
-            self.specification = parse_spec(self._spec_string, self.url)
+    def _parse_spec_string(self, disk_cache):
+        """Parse the spec string, using the disk cache if given."""
+        from .util.formats import intern_strings, parse_spec
+        from .util.frozen import freeze
 
-        # If we have a parsed spec, convert it to JSON. Then we can validate
-        # the JSON. At this point, we *require* a parsed specification to exist,
-        # so we might as well assert.
-        assert self.specification, "No specification parsed, cannot validate!"
+        if disk_cache is None:
+            result = parse_spec(self._spec_string, self.url)
+        else:
+            import hashlib
+
+            digest = hashlib.sha256(self._spec_string.encode("utf-8")).hexdigest()
+            key = disk_cache.key("string", digest, self.url)
+            result = disk_cache.get(key)
+            if result is None:
+                result = parse_spec(self._spec_string, self.url)
+                disk_cache.set(key, result)
 
-        self._validate()
+        if self.options.get("intern", False):
+            result = intern_strings(result)
+        if self.options.get("freeze", False):
+            result = freeze(result)
+        return result
 
     def _validate(self):
         # Ensure specification is a mapping
@@ -183,8 +238,11 @@ class BaseParser(mixins.YAMLMixin, mixins.JSONMixin):
         validator = getattr(self, validator_name)
 
         # Set valid flag according to whether validator succeeds
+        from .util.events import phase
+
         self.valid = False
-        validator(parsed)
+        with phase("validate", backend=self.backend):
+            validator(parsed)
         self.valid = True
 
     def __set_version(self, prefix, version: Version):
@@ -201,8 +259,9 @@ class BaseParser(mixins.YAMLMixin, mixins.JSONMixin):
         self.__set_version(BaseParser.SPEC_VERSION_2_PREFIX, spec_version)
 
         from flex.exceptions import ValidationError as JSEValidationError
-        from flex.core import parse as validate
+        from .util.validators import get_validator
 
+        validate = get_validator(self.backend, spec_version.major, spec_version.minor)
         try:
             validate(self.specification)
         except JSEValidationError as ex:
@@ -217,10 +276,11 @@ class BaseParser(mixins.YAMLMixin, mixins.JSONMixin):
         self.__set_version(BaseParser.SPEC_VERSION_2_PREFIX, spec_version)
 
         from swagger_spec_validator.common import SwaggerValidationError as SSVErr
-        from swagger_spec_validator.validator20 import validate_spec
+        from .util.validators import get_validator
 
+        validate = get_validator(self.backend, spec_version.major, spec_version.minor)
         try:
-            validate_spec(self.specification)
+            validate(self.specification)
         except SSVErr as ex:
             from .util.exceptions import raise_from
 
@@ -229,7 +289,6 @@ class BaseParser(mixins.YAMLMixin, mixins.JSONMixin):
     def _validate_openapi_spec_validator(
         self, spec_version: Version
     ):  # pragma: nocover
-        from openapi_spec_validator import validate
         from jsonschema.exceptions import ValidationError as JSEValidationError
         from referencing.exceptions import Unresolvable
 
@@ -244,6 +303,9 @@ class BaseParser(mixins.YAMLMixin, mixins.JSONMixin):
             # Set the version independently of whether validation succeeds
             self.__set_version(BaseParser.SPEC_VERSION_2_PREFIX, spec_version)
 
+        from .util.validators import get_validator
+
+        validate = get_validator(self.backend, spec_version.major, spec_version.minor)
         try:
             validate(self.specification)
         except TypeError as type_ex:  # pragma: nocover
@@ -277,19 +339,89 @@ class ResolvingParser(BaseParser):
         specs. The implication is that self.specification is fully resolved, and
         does not contain any references.
 
-        Additional parameters, see :py::class:`util.RefResolver`.
+        Additional parameters, see :py::class:`util.RefResolver`. In particular,
+        pass a :py:class:`util.cache.ReferenceCache` as `reference_cache` to
+        share fetched and parsed references between parser instances.
         """
-        # Create a reference cache
-        self.__reference_cache = {}
+        # Create a reference cache, unless one is given.
+        self.__reference_cache = kwargs.get("reference_cache", None)
+        if self.__reference_cache is None:
+            self.__reference_cache = {}
+
+        # The resolver of the last parse, for reparse(), and the files the
+        # last parse depended on.
+        self.__resolver = None
+        self.__dependencies = set()
 
         BaseParser.__init__(self, url=url, spec_string=spec_string, lazy=lazy, **kwargs)
 
-    def _validate(self):
-        # We have a problem with the BaseParser's validate function: the
-        # jsonschema implementation underlying it does not accept relative
-        # path references, but the Swagger specs allow them:
-        # http://swagger.io/specification/#referenceObject
-        # We therefore use our own resolver first, and validate later.
+    def dependencies(self):
+        """
+        Return the files the last parse depended on.
+
+        These are the spec file itself, and all files referenced by it,
+        directly or indirectly. If resolving failed, the files involved up to
+        that point are returned.
+
+        :return: The resource parts of the files' URLs, see
+            :py:func:`util.url.urlresource`.
+        :rtype: set
+        """
+        from .util.url import urlresource
+
+        result = set(self.__dependencies)
+        if self.url and self.url != _PLACEHOLDER_URL:
+            result.add(urlresource(self.url))
+        return result
+
+    def reparse(self, changed_urls):
+        """
+        Parse again after files referenced by the spec changed.
+
+        Only the changed files are read and parsed again, and only the
+        references that depend on them - directly or through other referenced
+        files - are resolved again; see
+        :py:meth:`util.resolver.RefResolver.update_references`. The previous
+        specification is left unmodified.
+
+        If the spec file itself is among the changed files, or the changes
+        cannot be applied incrementally, everything is parsed again. This is
+        always done synchronously, also for the AsyncResolvingParser.
+
+        :param list changed_urls: The URLs or file names of the changed files.
+        """
+        from .util.cache import invalidate
+        from .util.events import observe, phase
+        from .util.url import absurl
+        from .util.fs import abspath
+        import os
+
+        cwd = abspath(os.getcwd())
+        changed = [absurl(url, cwd) for url in changed_urls]
+
+        with observe(self.options.get("observer", None)):
+            resolver = self.__resolver
+            if resolver is not None:
+                try:
+                    with phase("resolve", url=self.url):
+                        resolver.update_references(changed)
+                except ValueError:
+                    resolver = None
+                finally:
+                    if resolver is not None:
+                        self.__dependencies = resolver.dependencies()
+
+            if resolver is None:
+                for url in changed:
+                    invalidate(self.__reference_cache, url)
+                BaseParser.parse(self)
+                return
+
+            self.specification = resolver.specs
+            BaseParser._validate(self)
+
+    def _resolver(self):
+        """Return a resolver for the specification, using the parser options."""
         from .util.resolver import RefResolver
 
         forward_arg_names = (
@@ -299,30 +431,262 @@ class ResolvingParser(BaseParser):
             "resolve_types",
             "resolve_method",
             "strict",
+            "share_references",
+            "disk_cache",
+            "prefetch_workers",
+            "fetcher",
+            "reference_stats",
+            "intern",
+            "freeze",
         )
         forward_args = {
             k: v for (k, v) in self.options.items() if k in forward_arg_names
         }
-        resolver = RefResolver(
+        return RefResolver(
             self.specification,
             self.url,
             reference_cache=self.__reference_cache,
             **forward_args,
         )
-        resolver.resolve_references()
+
+    def _validate(self):
+        # We have a problem with the BaseParser's validate function: the
+        # jsonschema implementation underlying it does not accept relative
+        # path references, but the Swagger specs allow them:
+        # http://swagger.io/specification/#referenceObject
+        # We therefore use our own resolver first, and validate later.
+        self.__resolver = None
+
+        from .util.events import phase
+
+        resolver = self._resolver()
+        try:
+            with phase("resolve", url=self.url):
+                resolver.resolve_references()
+        finally:
+            self.__dependencies = resolver.dependencies()
         self.specification = resolver.specs
+        self.__resolver = resolver
 
         # Now validate - the BaseParser knows the specifics
         BaseParser._validate(self)
 
 
+class LazyResolvingParser(ResolvingParser):
+    """
+    The LazyResolvingParser resolves references only when they are accessed.
+
+    Its `specification` is a read-only mapping in which references are
+    resolved when the value containing them is first accessed; see
+    :py:meth:`util.resolver.RefResolver.lazy_specs`. Reading e.g. the paths
+    and methods of a spec then only requires the spec file itself, and
+    reading an operation's schemas only the files these reference.
+
+    Validating a spec requires resolving all of its references, so the
+    parser does not validate on parsing. Call `validate()` to do so.
+
+    The parser takes the same parameters as the ResolvingParser, except that
+    the TRANSLATE_EXTERNAL resolve method is not supported.
+    """
+
+    def _validate(self):
+        from collections.abc import Mapping
+
+        if not isinstance(self.specification, Mapping):
+            raise ValidationError("Could not parse specifications!")
+
+        self.valid = False
+        self.specification = self._resolver().lazy_specs()
+
+    def validate(self):
+        """
+        Resolve all references, and validate the spec.
+
+        The `specification` remains a lazily resolving view, but all of its
+        references are resolved afterwards.
+        """
+        from .util.lazy import materialize
+
+        from .util.events import observe, phase
+
+        view = self.specification
+        with observe(self.options.get("observer", None)):
+            with phase("resolve", url=self.url):
+                self.specification = materialize(view)
+            try:
+                BaseParser._validate(self)
+            finally:
+                self.specification = view
+
+    def yaml(self):
+        """
+        Return a YAML representation of the specification.
+
+        This resolves all references, see `validate()`.
+        """
+        return self.__materialized(ResolvingParser.yaml)
+
+    def json(self):
+        """
+        Return a JSON representation of the specification.
+
+        This resolves all references, see `validate()`.
+        """
+        return self.__materialized(ResolvingParser.json)
+
+    def __materialized(self, method):
+        """Call the method with the specification fully resolved."""
+        from .util.lazy import materialize
+
+        view = self.specification
+        self.specification = materialize(view)
+        try:
+            return method(self)
+        finally:
+            self.specification = view
+
+
+class AsyncResolvingParser(ResolvingParser):
+    """
+    The AsyncResolvingParser is a ResolvingParser for use with asyncio.
+
+    The spec and all files it references are fetched concurrently via an
+    asynchronous fetcher, before references are resolved exactly as in the
+    ResolvingParser. As resolving and validating are CPU bound, they run in
+    the event loop without further I/O.
+
+    The parser never parses on construction; await `parse()` instead::
+
+      parser = AsyncResolvingParser("path/to/spec.yaml")
+      await parser.parse()
+    """
+
+    def __init__(self, url=None, spec_string=None, **kwargs):
+        """
+        See :py:class:`ResolvingParser`.
+
+        :param AsyncFetcher async_fetcher: [optional] The fetcher to use; see
+          :py:mod:`util.aio`. Defaults to a :py:class:`util.aio.DefaultFetcher`,
+          which reads local files in the default executor, and fetches remote
+          URLs with aiohttp.
+        """
+        kwargs.pop("lazy", None)
+        if kwargs.get("reference_cache", None) is None:
+            kwargs["reference_cache"] = {}
+        self.__reference_cache = kwargs["reference_cache"]
+
+        ResolvingParser.__init__(
+            self, url=url, spec_string=spec_string, lazy=True, **kwargs
+        )
+
+    async def parse(self):
+        """
+        Load, parse, resolve and validate the spec.
+
+        Any errors fetching referenced files are raised when resolving the
+        references, as with the ResolvingParser.
+        """
+        from .util.aio import DefaultFetcher
+        from .util.cache import DiskCache
+        from .util.events import observe
+
+        with observe(self.options.get("observer", None)):
+            disk_cache = DiskCache.from_option(self.options.get("disk_cache", None))
+
+            fetcher = self.options.get("async_fetcher", None)
+            own_fetcher = fetcher is None
+            if own_fetcher:
+                fetcher = DefaultFetcher(encoding=self.options.get("encoding", None))
+
+            try:
+                if self.url and self.url != _PLACEHOLDER_URL:
+                    self.specification = await self.__fetch(
+                        fetcher, self.url, disk_cache
+                    )
+
+                if self._spec_string:
+                    self.specification = self._parse_spec_string(disk_cache)
+
+                assert self.specification, "No specification parsed, cannot validate!"
+
+                await self.__fetch_references(fetcher, disk_cache)
+            finally:
+                if own_fetcher:
+                    await fetcher.close()
+
+            # All referenced files are in the reference cache now.
+            self._validate()
+
+    async def __fetch(self, fetcher, url, disk_cache):
+        """Fetch the URL into the reference cache, and return it parsed."""
+        from .util import url as _url
+
+        text_key = "text_" + _url.urlresource(url)
+        if text_key not in self.__reference_cache:
+            self.__reference_cache[text_key] = await fetcher.fetch(url)
+
+        return _url.fetch_url(
+            url,
+            self.__reference_cache,
+            strict=self.options.get("strict", True),
+            disk_cache=disk_cache,
+            intern=self.options.get("intern", False),
+            freeze=self.options.get("freeze", False),
+        )
+
+    async def __fetch_references(self, fetcher, disk_cache):
+        """Concurrently fetch all files the spec references."""
+        import asyncio
+        from .util.resolver import RefResolver, RESOLVE_ALL
+
+        # An empty resolver knows which references need fetching.
+        external_urls = RefResolver(
+            {},
+            self.url,
+            resolve_types=self.options.get("resolve_types", RESOLVE_ALL),
+        )._external_urls
+        seen = set()
+
+        async def fetch(ref_url):
+            try:
+                return await self.__fetch(fetcher, ref_url, disk_cache)
+            except Exception:
+                # Errors surface again when resolving.
+                return None
+
+        pending = {
+            asyncio.ensure_future(fetch(ref_url)): ref_url
+            for ref_url in external_urls(self.url, self.specification, seen)
+        }
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                base_url = pending.pop(task)
+                contents = task.result()
+                if contents is None:
+                    continue
+                for ref_url in external_urls(base_url, contents, seen):
+                    pending[asyncio.ensure_future(fetch(ref_url))] = ref_url
+
+
 # Underscored to allow some time for the public API to be stabilized.
 class _TranslatingParser(BaseParser):
     def _validate(self):
         from .util.translator import _RefTranslator
 
+        from .util.events import phase
+        from .util.frozen import freeze, is_frozen, thaw
+
+        # The translator modifies the specs in place.
+        frozen = is_frozen(self.specification)
+        if frozen:
+            self.specification = thaw(self.specification)
+
         translator = _RefTranslator(self.specification, self.url)
-        translator.translate_references()
+        with phase("resolve", url=self.url):
+            translator.translate_references()
         self.specification = translator.specs
+        if frozen:
+            self.specification = freeze(self.specification)
 
         BaseParser._validate(self)
@@ -10,6 +10,7 @@ import click
 
 import prance
 from prance.util import default_validation_backend
+from prance.util.stats import SORT_KEYS
 
 
 def __write_to_file(filename, specs):  # noqa: N802
@@ -24,7 +25,9 @@ def __write_to_file(filename, specs):  # noqa: N802
     fs.write_file(filename, contents)
 
 
-def __parser_for_url(url, resolve, backend, strict, encoding):  # noqa: N802
+def __parser_for_url(  # noqa: N802
+    url, resolve, backend, strict, encoding, disk_cache=None, reference_cache=None
+):
     """Return a parser instance for the URL and the given parameters."""
     # Try the URL
     formatted = click.format_filename(url)
@@ -43,12 +46,23 @@ def __parser_for_url(url, resolve, backend, strict, encoding):  # noqa: N802
     if resolve:
         click.echo(" -> Resolving external references.")
         parser = prance.ResolvingParser(
-            url, lazy=True, backend=backend, strict=strict, encoding=encoding
+            url,
+            lazy=True,
+            backend=backend,
+            strict=strict,
+            encoding=encoding,
+            disk_cache=disk_cache,
+            reference_cache=reference_cache,
         )
     else:
         click.echo(" -> Not resolving external references.")
         parser = prance.BaseParser(
-            url, lazy=True, backend=backend, strict=strict, encoding=encoding
+            url,
+            lazy=True,
+            backend=backend,
+            strict=strict,
+            encoding=encoding,
+            disk_cache=disk_cache,
         )
 
     # XXX maybe enable this in debug mode or something.
@@ -56,6 +70,93 @@ def __parser_for_url(url, resolve, backend, strict, encoding):  # noqa: N802
     return parser, formatted
 
 
+def __validate_worker(url, options):  # noqa: N802
+    """
+    Validate a single spec in a worker process of a batch validation.
+
+    Returns the result as a dict, including errors. No output is produced
+    here, as output of several workers would get mixed up.
+    """
+    import os.path
+    from prance.util import fs
+
+    fsurl = fs.abspath(url)
+    if os.path.exists(fs.from_posix(fsurl)):
+        fsurl_or_url = fsurl
+    else:
+        fsurl_or_url = url
+
+    klass = prance.ResolvingParser if options["resolve"] else prance.BaseParser
+    result = {
+        "url": url,
+        "valid": False,
+        "version": None,
+        "error_type": None,
+        "error": None,
+    }
+    try:
+        parser = klass(
+            fsurl_or_url,
+            lazy=True,
+            backend=options["backend"],
+            strict=options["strict"],
+            encoding=options["encoding"],
+            disk_cache=options["cache_dir"],
+        )
+        parser.parse()
+        result["valid"] = True
+        result["version"] = parser.version
+    except Exception as err:
+        result["error_type"] = type(err).__name__
+        result["error"] = str(err)
+    return result
+
+
+def __validate_batch(urls, options, jobs, report):  # noqa: N802
+    """
+    Validate all specs in a process pool, and summarize the results.
+
+    Unless a cache directory is given, a temporary one is used, so that files
+    referenced by several specs are only parsed once.
+    """
+    import contextlib
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    with contextlib.ExitStack() as stack:
+        options = dict(options)
+        if not options["cache_dir"]:
+            options["cache_dir"] = stack.enter_context(tempfile.TemporaryDirectory())
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(__validate_worker, urls, [options] * len(urls)))
+
+    for result in results:
+        name = click.format_filename(result["url"])
+        if result["valid"]:
+            click.echo(f'"{name}" validates OK as {result["version"]}!')
+        else:
+            msg = f'ERROR in "{name}" [{result["error_type"]}]: {result["error"]}'
+            click.secho(msg, err=True, fg="red")
+
+    valid = len([result for result in results if result["valid"]])
+    invalid = len(results) - valid
+    click.echo(f"Validated {len(results)} specs: {valid} OK, {invalid} failed.")
+
+    if report:
+        import json
+        from .util import fs
+
+        summary = {"total": len(results), "valid": valid, "invalid": invalid}
+        contents = json.dumps({"summary": summary, "results": results}, indent=2)
+        fs.write_file(report, contents)
+
+    if invalid:
+        import sys
+
+        sys.exit(1)
+
+
 def __validate(parser, name):  # noqa: N802
     """Validate a spec using this parser."""
     from prance.util.url import ResolutionError
@@ -74,6 +175,59 @@ def __validate(parser, name):  # noqa: N802
     click.echo(f"Validates OK as {parser.version}!")
 
 
+def __timings(enabled):  # noqa: N802
+    """
+    Return a context collecting timings, and printing them when it is left.
+
+    The timings are printed to stderr, so they do not mix with compiled specs
+    written to stdout. If not enabled, the context does nothing.
+    """
+    import contextlib
+
+    if not enabled:
+        return contextlib.nullcontext()
+
+    from prance.util.events import Timings, observe
+
+    timings = Timings()
+    stack = contextlib.ExitStack()
+    stack.callback(lambda: click.echo(timings.format(), err=True))
+    stack.enter_context(observe(timings))
+    return stack
+
+
+def __watch_dependencies(parser):  # noqa: N802
+    """Return the URLs of the files the parser's last parse depended on."""
+    if isinstance(parser, prance.ResolvingParser):
+        return parser.dependencies()
+
+    from prance.util.url import urlresource
+
+    return {urlresource(parser.url)}
+
+
+def __watch_validate(parser, name, changed=None):  # noqa: N802
+    """
+    Validate a spec in watch mode.
+
+    If changed URLs are given, only those are read again where possible.
+    Errors are reported, but do not end the program; files may well be
+    invalid while they are being edited.
+    """
+    try:
+        if changed and isinstance(parser, prance.ResolvingParser):
+            parser.reparse(changed)
+        else:
+            parser.parse()
+    except Exception as err:
+        msg = f'ERROR in "{name}" [{type(err).__name__}]: {str(err)}'
+        click.secho(msg, err=True, fg="red")
+        return False
+
+    click.echo(f'"{name}" validates OK as {parser.version}!')
+    return True
+
+
 @click.group()
 @click.version_option(version=prance.__version__)
 def cli():
@@ -144,12 +298,21 @@ class GroupWithCommandOptions(click.Group):
     help="If given, override file encoding detection and use the given "
     "encoding for all files. Does not work on remote URLs.",
 )
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    default=None,
+    metavar="DIRECTORY",
+    help="If given, keep parsed files in a cache in this directory, so that "
+    "unchanged files do not need to be parsed again in later runs.",
+)
 @click.pass_context
-def backend_options(ctx, resolve, backend, strict, encoding):
+def backend_options(ctx, resolve, backend, strict, encoding, cache_dir):
     ctx.obj["resolve"] = resolve
     ctx.obj["backend"] = backend
     ctx.obj["strict"] = strict
     ctx.obj["encoding"] = encoding
+    ctx.obj["cache_dir"] = cache_dir
 
 
 @backend_options.command()
@@ -165,13 +328,38 @@ def backend_options(ctx, resolve, backend, strict, encoding):
     "option, the output file will be a resolved version of the input "
     "file.",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    metavar="N",
+    help="Validate up to N specs in parallel processes. Instead of stopping "
+    "at the first invalid spec, all specs are validated, and a summary is "
+    "printed at the end.",
+)
+@click.option(
+    "--report",
+    type=click.Path(exists=False, dir_okay=False),
+    default=None,
+    metavar="FILENAME",
+    help="If given, validate all specs as with --jobs, and write the results "
+    "to this file as JSON.",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    default=False,
+    help="Print how long each phase of processing took, and how long "
+    "fetching each file took, to stderr.",
+)
 @click.argument(
     "urls",
     type=click.Path(exists=False),
     nargs=-1,
 )
 @click.pass_context
-def validate(ctx, output_file, urls):
+def validate(ctx, output_file, jobs, report, timings, urls):
     """
     Validate the given spec or specs.
 
@@ -182,6 +370,20 @@ def validate(ctx, output_file, urls):
     backends used by prance cannot validate referenced objects, so resolving
     the references before validation allows for full spec validation.
     """
+    # Batch mode validates everything, and does not produce output files.
+    if jobs > 1 or report:
+        if output_file:
+            raise click.UsageError(
+                "The --output-file parameter cannot be combined with --jobs "
+                "or --report!"
+            )
+        if timings:
+            raise click.UsageError(
+                "The --timings parameter cannot be combined with --jobs " "or --report!"
+            )
+        __validate_batch(urls, ctx.obj, jobs, report)
+        return
+
     # Ensure that when an output file is given, only one input file exists.
     if output_file:
         click.echo(
@@ -203,14 +405,16 @@ def validate(ctx, output_file, urls):
             ctx.obj["backend"],
             ctx.obj["strict"],
             ctx.obj["encoding"],
+            ctx.obj["cache_dir"],
         )
 
-        # Try parsing
-        __validate(parser, name)
+        with __timings(timings):
+            # Try parsing
+            __validate(parser, name)
 
-        # If an output file is given, write the specs to it.
-        if output_file:
-            __write_to_file(output_file, parser.specification)
+            # If an output file is given, write the specs to it.
+            if output_file:
+                __write_to_file(output_file, parser.specification)
 
 
 @backend_options.command()
@@ -225,8 +429,15 @@ def validate(ctx, output_file, urls):
     nargs=1,
     required=False,
 )
+@click.option(
+    "--timings",
+    is_flag=True,
+    default=False,
+    help="Print how long each phase of processing took, and how long "
+    "fetching each file took, to stderr.",
+)
 @click.pass_context
-def compile(ctx, url_or_path, output_file):
+def compile(ctx, url_or_path, output_file, timings):
     """
     Compile the given spec, resolving references if required.
 
@@ -243,15 +454,18 @@ def compile(ctx, url_or_path, output_file):
         ctx.obj["backend"],
         ctx.obj["strict"],
         ctx.obj["encoding"],
+        ctx.obj["cache_dir"],
     )
 
-    # Try parsing
-    __validate(parser, name)
+    with __timings(timings):
+        # Try parsing
+        __validate(parser, name)
+
+        # Write output
+        from prance.util import formats
 
-    # Write output
-    from prance.util import formats
+        contents = formats.serialize_spec(parser.specification, output_file)
 
-    contents = formats.serialize_spec(parser.specification, output_file)
     if output_file is None:
         click.echo(contents)
     else:
@@ -261,6 +475,230 @@ def compile(ctx, url_or_path, output_file):
         click.echo(f'Output written to "{output_file}".')
 
 
+@backend_options.command()
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.01),
+    default=0.5,
+    metavar="SECONDS",
+    help="How often to check files for changes. The default is every half " "second.",
+)
+@click.argument(
+    "urls",
+    type=click.Path(exists=False),
+    nargs=-1,
+    required=True,
+)
+@click.pass_context
+def watch(ctx, interval, urls):
+    """
+    Validate the given specs, and again whenever their files change.
+
+    Resolves references and uses backends exactly as in the "validate"
+    command. The spec files and all files they reference are watched. When
+    any of them change, only the changed files are read again, and only the
+    references depending on them are resolved again, before the specs are
+    validated.
+
+    Runs until interrupted, e.g. with Ctrl-C.
+    """
+    import time
+
+    from prance.util.cache import ReferenceCache
+    from prance.util.watch import FileWatcher
+
+    # Files referenced by several specs are shared.
+    reference_cache = ReferenceCache()
+
+    specs = []
+    watcher = FileWatcher()
+    for url in urls:
+        parser, name = __parser_for_url(
+            url,
+            ctx.obj["resolve"],
+            ctx.obj["backend"],
+            ctx.obj["strict"],
+            ctx.obj["encoding"],
+            ctx.obj["cache_dir"],
+            reference_cache,
+        )
+        __watch_validate(parser, name)
+        watcher.watch(__watch_dependencies(parser))
+        specs.append((parser, name))
+
+    click.echo("Watching for changes; press Ctrl-C to stop.")
+    try:
+        while True:
+            time.sleep(interval)
+            changed = set(watcher.poll())
+            if not changed:
+                continue
+
+            for parser, name in specs:
+                relevant = changed & __watch_dependencies(parser)
+                if not relevant:
+                    continue
+                click.echo(f'Changes affecting "{name}", validating...')
+                __watch_validate(parser, name, relevant)
+
+                # The changes may have added references to further files.
+                watcher.watch(__watch_dependencies(parser))
+    except KeyboardInterrupt:
+        pass
+
+
+@cli.command()
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "dot"]),
+    default=None,
+    help='The output format. The default is "dot" for output files ending in '
+    '".dot" or ".gv", and "json" otherwise.',
+)
+@click.option(
+    "--encoding",
+    default=None,
+    help="If given, override file encoding detection and use the given "
+    "encoding for all files. Does not work on remote URLs.",
+)
+@click.argument(
+    "url_or_path",
+    type=click.Path(exists=False),
+    nargs=1,
+)
+@click.argument(
+    "output_file",
+    type=click.Path(exists=False),
+    nargs=1,
+    required=False,
+)
+def graph(output_format, encoding, url_or_path, output_file):
+    """
+    Export the graph of references in the given spec.
+
+    Nodes of the graph are the spec itself and all objects referenced from
+    it, directly or indirectly. Edges are the references between them, with
+    the number of references. Reference cycles are listed in JSON output, and
+    highlighted in DOT output.
+
+    If an output file name is given, output is written there, otherwise
+    it is written to the terminal.
+    """
+    import os
+
+    from prance.util import fs
+    from prance.util.resolver import RefResolver
+    from prance.util.url import ResolutionError, absurl, fetch_url
+
+    if output_format is None:
+        output_format = "json"
+        if output_file and output_file.endswith((".dot", ".gv")):
+            output_format = "dot"
+
+    try:
+        url = absurl(url_or_path, fs.abspath(os.getcwd()))
+        specs = fetch_url(url, encoding=encoding)
+        references = RefResolver(specs, url, encoding=encoding).reference_graph()
+    except (ResolutionError, ValueError) as err:
+        name = click.format_filename(url_or_path)
+        msg = f'ERROR in "{name}" [{type(err).__name__}]: {str(err)}'
+        click.secho(msg, err=True, fg="red")
+        import sys
+
+        sys.exit(1)
+
+    if output_format == "dot":
+        contents = references.to_dot()
+    else:
+        import json
+
+        contents = json.dumps(references.to_dict(), indent=2)
+
+    if output_file is None:
+        click.echo(contents)
+    else:
+        fs.write_file(output_file, contents)
+        click.echo(f'Output written to "{output_file}".')
+
+
+@cli.command()
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=20,
+    metavar="N",
+    help="Report the N referenced objects with the highest statistics. The "
+    "default is 20.",
+)
+@click.option(
+    "--sort",
+    type=click.Choice(SORT_KEYS),
+    default="bytes",
+    help='The statistic to sort by. The default is "bytes", the approximate '
+    "size the inlined objects add to the resolved spec.",
+)
+@click.option(
+    "--encoding",
+    default=None,
+    help="If given, override file encoding detection and use the given "
+    "encoding for all files. Does not work on remote URLs.",
+)
+@click.argument(
+    "url_or_path",
+    type=click.Path(exists=False),
+    nargs=1,
+)
+@click.argument(
+    "output_file",
+    type=click.Path(exists=False),
+    nargs=1,
+    required=False,
+)
+def stats(top, sort, encoding, url_or_path, output_file):
+    """
+    Report statistics on resolving the references in the given spec.
+
+    For each referenced object, reports how often it is inlined, how long
+    dereferencing it takes, and how many nodes and bytes it adds to the
+    resolved spec. Objects adding the most to the resolved spec are good
+    candidates for restructuring.
+
+    If an output file name is given, the statistics are written there as
+    JSON, otherwise a table is written to the terminal.
+    """
+    import os
+
+    from prance.util import fs
+    from prance.util.resolver import RefResolver
+    from prance.util.stats import ReferenceStats
+    from prance.util.url import ResolutionError, absurl, fetch_url
+
+    collected = ReferenceStats()
+    try:
+        url = absurl(url_or_path, fs.abspath(os.getcwd()))
+        specs = fetch_url(url, encoding=encoding)
+        RefResolver(
+            specs, url, encoding=encoding, reference_stats=collected
+        ).resolve_references()
+    except (ResolutionError, ValueError) as err:
+        name = click.format_filename(url_or_path)
+        msg = f'ERROR in "{name}" [{type(err).__name__}]: {str(err)}'
+        click.secho(msg, err=True, fg="red")
+        import sys
+
+        sys.exit(1)
+
+    if output_file is None:
+        click.echo(collected.format(top, sort))
+    else:
+        import json
+
+        contents = json.dumps(collected.to_dict(top, sort), indent=2)
+        fs.write_file(output_file, contents)
+        click.echo(f'Output written to "{output_file}".')
+
+
 @cli.command()
 @click.argument(
     "url_or_path",
@@ -303,4 +741,7 @@ def convert(url_or_path, output_file):
 
 cli.add_command(validate)
 cli.add_command(compile)
+cli.add_command(watch)
+cli.add_command(graph)
+cli.add_command(stats)
 cli.add_command(convert)
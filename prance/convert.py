@@ -54,11 +54,12 @@ def convert_str(spec_str, filename=None, **kwargs):
     return r.text, "{}; {}".format(r.headers["content-type"], r.apparent_encoding)
 
 
-def convert_url(url, cache={}):
+def convert_url(url, cache=None):
     """
     Fetch a URL, and try to convert it to OpenAPI 3.x.y.
 
     :param str url: The URL to fetch.
+    :param Mapping cache: [optional] A cache for fetched URLs.
     :return: The converted spec and content type.
     :rtype: tuple
     :raises ParseError: when parsing fails.
@@ -42,6 +42,28 @@ class CacheSpecsMixin:
         return False
 
 
+def _dumper():
+    """
+    Return a PyYAML dumper for specs.
+
+    PyYAML would represent frozen specs as Python objects; the dumper
+    represents them as plain mappings and sequences. As in
+    :py:func:`util.formats.serialize_spec`, shared frozen values are written
+    out in full rather than as aliases.
+    """
+    import yaml
+
+    from .util.frozen import FrozenDict, FrozenList, is_frozen
+
+    class Dumper(yaml.Dumper):
+        def ignore_aliases(self, data):
+            return is_frozen(data) or yaml.Dumper.ignore_aliases(self, data)
+
+    Dumper.add_representer(FrozenDict, yaml.Dumper.represent_dict)
+    Dumper.add_representer(FrozenList, yaml.Dumper.represent_list)
+    return Dumper
+
+
 class YAMLMixin(CacheSpecsMixin):
     """
     YAMLMixin returns a YAML representation of the specification.
@@ -62,7 +84,7 @@ class YAMLMixin(CacheSpecsMixin):
         if self.specs_updated() or not getattr(self, self.__YAML, None):
             import yaml
 
-            setattr(self, self.__YAML, yaml.dump(self.specification))
+            setattr(self, self.__YAML, yaml.dump(self.specification, Dumper=_dumper()))
         return getattr(self, self.__YAML)
 
 
@@ -3,7 +3,24 @@
 __author__ = "Jens Finkhaeuser"
 __copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
 __license__ = "MIT"
-__all__ = ("iterators", "fs", "formats", "resolver", "url", "path", "exceptions")
+__all__ = (
+    "iterators",
+    "fs",
+    "formats",
+    "resolver",
+    "url",
+    "path",
+    "exceptions",
+    "cache",
+    "aio",
+    "validators",
+    "watch",
+    "graph",
+    "lazy",
+    "events",
+    "stats",
+    "frozen",
+)
 
 
 def stringify_keys(data):
@@ -0,0 +1,146 @@
+"""
+A PyYAML loader following YAML 1.2, as ruamel.yaml does.
+
+PyYAML implements YAML 1.1, in which e.g. `yes`, `on` and `off` are booleans
+and `017` is an octal number. Specs loaded with it would differ from specs
+loaded with ruamel.yaml, so this loader replaces the implicit scalar
+resolution with the YAML 1.2 rules ruamel.yaml uses. Duplicate mapping keys
+are rejected, also as with ruamel.yaml.
+"""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+import re
+
+from yaml.constructor import ConstructorError, SafeConstructor
+from yaml.nodes import MappingNode
+from yaml.resolver import Resolver
+
+try:
+    from yaml._yaml import CParser as _Parser
+
+    C_EXTENSION = True
+except ImportError:  # pragma: nocover
+    from yaml.composer import Composer
+    from yaml.parser import Parser
+    from yaml.reader import Reader
+    from yaml.scanner import Scanner
+
+    class _Parser(Reader, Scanner, Parser, Composer):
+        def __init__(self, stream):
+            Reader.__init__(self, stream)
+            Scanner.__init__(self)
+            Parser.__init__(self)
+            Composer.__init__(self)
+
+    C_EXTENSION = False
+
+
+# Implicit resolvers of the YAML 1.2 core schema, as used by ruamel.yaml.
+_IMPLICIT_RESOLVERS = (
+    (
+        "tag:yaml.org,2002:bool",
+        r"^(?:true|True|TRUE|false|False|FALSE)$",
+        "tTfF",
+    ),
+    (
+        "tag:yaml.org,2002:float",
+        r"""^(?:
+         [-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+        |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+        |[-+]?\.[0-9_]+(?:[eE][-+][0-9]+)?
+        |[-+]?\.(?:inf|Inf|INF)
+        |\.(?:nan|NaN|NAN))$""",
+        "-+0123456789.",
+    ),
+    (
+        "tag:yaml.org,2002:int",
+        r"""^(?:[-+]?0b[0-1_]+
+        |[-+]?0o?[0-7_]+
+        |[-+]?[0-9_]+
+        |[-+]?0x[0-9a-fA-F_]+)$""",
+        "-+0123456789",
+    ),
+    ("tag:yaml.org,2002:merge", r"^(?:<<)$", "<"),
+    ("tag:yaml.org,2002:null", r"^(?: ~ |null|Null|NULL | )$", ["~", "n", "N", ""]),
+    (
+        "tag:yaml.org,2002:timestamp",
+        r"""^(?:[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]
+        |[0-9][0-9][0-9][0-9] -[0-9][0-9]? -[0-9][0-9]?
+        (?:[Tt]|[ \t]+)[0-9][0-9]?
+        :[0-9][0-9] :[0-9][0-9] (?:\.[0-9]*)?
+        (?:[ \t]*(?:Z|[-+][0-9][0-9]?(?::[0-9][0-9])?))?)$""",
+        "0123456789",
+    ),
+    ("tag:yaml.org,2002:value", r"^(?:=)$", "="),
+)
+
+
+class _Resolver(Resolver):
+    yaml_implicit_resolvers = {}
+
+
+for _tag, _regexp, _first in _IMPLICIT_RESOLVERS:
+    _Resolver.add_implicit_resolver(_tag, re.compile(_regexp, re.X), list(_first))
+
+
+class _Constructor(SafeConstructor):
+    def construct_yaml_int(self, node):
+        value = self.construct_scalar(node).replace("_", "")
+        sign = 1
+        if value[0] in "+-":
+            if value[0] == "-":
+                sign = -1
+            value = value[1:]
+        for prefix, base in (("0b", 2), ("0o", 8), ("0x", 16)):
+            if value.startswith(prefix):
+                return sign * int(value[2:], base)
+        return sign * int(value)
+
+    def construct_yaml_float(self, node):
+        value = self.construct_scalar(node).replace("_", "").lower()
+        if value.endswith(".inf"):
+            return float("-inf") if value[0] == "-" else float("inf")
+        if value == ".nan":
+            return float("nan")
+        return float(value)
+
+    def construct_mapping(self, node, deep=False):
+        if isinstance(node, MappingNode):
+            seen = set()
+            for key_node, _ in node.value:
+                if key_node.tag == "tag:yaml.org,2002:merge":
+                    continue
+                key = self.construct_object(key_node, deep=deep)
+                try:
+                    duplicate = key in seen
+                    seen.add(key)
+                except TypeError:
+                    continue  # Unhashable; reported below.
+                if duplicate:
+                    raise ConstructorError(
+                        "while constructing a mapping",
+                        node.start_mark,
+                        f'found duplicate key "{key}"',
+                        key_node.start_mark,
+                    )
+        return SafeConstructor.construct_mapping(self, node, deep=deep)
+
+
+_Constructor.add_constructor("tag:yaml.org,2002:int", _Constructor.construct_yaml_int)
+_Constructor.add_constructor(
+    "tag:yaml.org,2002:float", _Constructor.construct_yaml_float
+)
+
+
+class Loader(_Parser, _Constructor, _Resolver):
+    """Safe YAML 1.2 loader, using libyaml where available."""
+
+    def __init__(self, stream):
+        _Parser.__init__(self, stream)
+        _Constructor.__init__(self)
+        _Resolver.__init__(self)
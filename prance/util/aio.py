@@ -0,0 +1,142 @@
+"""This submodule contains asynchronous fetchers for use with asyncio."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+import prance.util.url as _url
+
+
+class AsyncFetcher:
+    """
+    Interface for asynchronous fetchers.
+
+    Fetchers are used by :py:class:`prance.AsyncResolvingParser` to fetch the
+    spec and all referenced files.
+    """
+
+    async def fetch(self, url):
+        """
+        Fetch the URL.
+
+        :param tuple url: The url, parsed as returned by `absurl`.
+        :return: The resource text of the URL, and the content type.
+        :rtype: tuple
+        """
+        raise NotImplementedError  # pragma: nocover
+
+    async def close(self):
+        """Release any resources held by the fetcher."""
+        pass
+
+
+class LocalFetcher(AsyncFetcher):
+    """
+    Fetch `file` and `python` URLs.
+
+    File systems offer no asynchronous interface, so files are read in the
+    default executor of the event loop.
+    """
+
+    def __init__(self, encoding=None):
+        """
+        Construct a fetcher for local files.
+
+        :param str encoding: [optional] The file encoding; if not given, it is
+            detected.
+        """
+        self.encoding = encoding
+
+    async def fetch(self, url):
+        import asyncio
+
+        return await asyncio.to_thread(_url.fetch_url_text, url, None, self.encoding)
+
+
+class AiohttpFetcher(AsyncFetcher):
+    """
+    Fetch remote URLs with `aiohttp <https://docs.aiohttp.org/>`__.
+
+    Requests share one client session, and therefore its connection pool.
+    """
+
+    def __init__(self, session=None, timeout=30, limit=10):
+        """
+        Construct a fetcher for remote URLs.
+
+        :param aiohttp.ClientSession session: [optional] The session to use.
+            If not given, a session is created on first use, and closed when
+            the fetcher is closed.
+        :param float timeout: [optional] Total timeout per request, in seconds.
+            Defaults to 30.
+        :param int limit: [optional] The maximum number of simultaneous
+            connections. Defaults to 10.
+        """
+        self.timeout = timeout
+        self.limit = limit
+        self.__session = session
+        self.__own_session = session is None
+
+    def _session(self):
+        if self.__session is None:
+            import aiohttp
+
+            self.__session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.limit),
+            )
+        return self.__session
+
+    async def fetch(self, url):
+        from .events import phase
+
+        target = url._replace(fragment="").geturl()
+        with phase("fetch", url=target):
+            async with self._session().get(target) as response:
+                if response.status >= 400:
+                    raise _url.ResolutionError(
+                        'Cannot fetch URL "%s": %d %s'
+                        % (url.geturl(), response.status, response.reason)
+                    )
+                content_type = response.headers.get("content-type", "text/plain")
+                content = await response.text()
+        return content, content_type
+
+    async def close(self):
+        if self.__own_session and self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+
+class DefaultFetcher(AsyncFetcher):
+    """
+    Fetch local URLs with a LocalFetcher, and remote ones with an AiohttpFetcher.
+
+    The remote fetcher is only created when needed, so `aiohttp` only needs to
+    be installed for specs that reference remote URLs.
+    """
+
+    def __init__(self, encoding=None, local=None, remote=None):
+        """
+        Construct a fetcher dispatching on the URL scheme.
+
+        :param str encoding: [optional] The encoding of local files.
+        :param AsyncFetcher local: [optional] The fetcher for local URLs.
+        :param AsyncFetcher remote: [optional] The fetcher for remote URLs.
+        """
+        self.local = local or LocalFetcher(encoding)
+        self.remote = remote
+
+    async def fetch(self, url):
+        if url.scheme in (None, "", "file", "python"):
+            return await self.local.fetch(url)
+        if self.remote is None:
+            self.remote = AiohttpFetcher()
+        return await self.remote.fetch(url)
+
+    async def close(self):
+        await self.local.close()
+        if self.remote is not None:
+            await self.remote.close()
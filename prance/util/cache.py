@@ -0,0 +1,357 @@
+"""This submodule contains caches for fetched and parsed specs."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+from collections.abc import MutableMapping
+
+
+def default_cache_dir():
+    """
+    Return the default directory for the on-disk cache.
+
+    This is the `prance` subdirectory of `$XDG_CACHE_HOME`, which in turn
+    defaults to `~/.cache`.
+
+    :return: The default cache directory.
+    :rtype: str
+    """
+    import os.path
+
+    base = os.environ.get("XDG_CACHE_HOME", None)
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "prance")
+
+
+class DiskCache:
+    """
+    Persistent cache of parsed specs, kept in a directory on disk.
+
+    Entries are stored in pickled form, which is considerably faster to load
+    than parsing YAML or JSON again. Keys are built with `key()` from whatever
+    identifies an entry - for local files, that is the file name together with
+    its modification time and size, for other content a hash of the content
+    itself.
+
+    As entries are unpickled when read, the cache directory must not be
+    writable by anyone you would not trust to run code as you.
+    """
+
+    def __init__(self, directory=None):
+        """
+        Construct a cache in the given directory.
+
+        :param str directory: [optional] The cache directory. Defaults to the
+            result of `default_cache_dir()`. It is created when the first
+            entry is written.
+        """
+        self.directory = directory or default_cache_dir()
+
+    @classmethod
+    def from_option(cls, value):
+        """
+        Return a cache for the value of a `disk_cache` option.
+
+        :param mixed value: Either None or False for no cache, True for a cache
+            in the default directory, a directory name, or a DiskCache
+            instance, which is returned as is.
+        :return: The cache, or None.
+        :rtype: DiskCache
+        """
+        if value is None or value is False:
+            return None
+        if isinstance(value, DiskCache):
+            return value
+        if value is True:
+            return cls()
+        return cls(value)
+
+    @staticmethod
+    def key(*parts):
+        """
+        Return a cache key for the given parts.
+
+        The parts may be anything that has a stable `repr()`. The prance
+        version is mixed into the key, so that upgrading prance does not
+        return stale entries.
+
+        :return: The cache key.
+        :rtype: str
+        """
+        import hashlib
+        import prance
+
+        digest = hashlib.sha256(repr((prance.__version__,) + parts).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _filename(self, key):
+        import os.path
+
+        return os.path.join(self.directory, key[:2], key + ".pickle")
+
+    def get(self, key, default=None):
+        """
+        Return the entry for the key, or the default if there is none.
+
+        Unreadable entries are treated like missing entries.
+        """
+        import pickle
+
+        try:
+            with open(self._filename(key), "rb") as handle:
+                return pickle.load(handle)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            return default
+
+    def set(self, key, value):
+        """
+        Store the value for the key.
+
+        The entry is written to a temporary file first and then moved into
+        place, so that concurrent readers never see partial entries. Failure
+        to write is silently ignored; the cache is an optimization only.
+        """
+        import os
+        import pickle
+        import tempfile
+
+        filename = self._filename(key)
+        try:
+            os.makedirs(os.path.dirname(filename), mode=0o700, exist_ok=True)
+            fd, tmpname = tempfile.mkstemp(dir=os.path.dirname(filename))
+            try:
+                with os.fdopen(fd, "wb") as handle:
+                    pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmpname, filename)
+            except BaseException:
+                os.unlink(tmpname)
+                raise
+        except (OSError, TypeError, pickle.PicklingError):
+            pass
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        import shutil
+
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _approximate_size(value):
+    """
+    Return the approximate size of a cache entry in Bytes.
+
+    Strings count with their length, containers with the sizes of their
+    contents plus a small overhead per item. This is not meant to be exact,
+    just proportional to the memory an entry holds.
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (str, bytes)):
+            size += len(item)
+        elif isinstance(item, dict):
+            size += 8 * len(item)
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            size += 8 * len(item)
+            stack.extend(item)
+        else:
+            size += 8
+    return size
+
+
+def invalidate(cache, url):
+    """
+    Remove all entries for the URL from a reference cache.
+
+    Works on :py:class:`ReferenceCache` instances as well as on plain dicts
+    used as reference caches.
+
+    :param MutableMapping cache: The reference cache.
+    :param str/tuple url: The URL to remove entries for; only its resource
+        part is considered.
+    :return: The number of entries removed.
+    :rtype: int
+    """
+    if isinstance(cache, ReferenceCache):
+        return cache.invalidate(url)
+
+    keys = _keys_for_url(cache, url)
+    for key in keys:
+        del cache[key]
+    return len(keys)
+
+
+def _keys_for_url(cache, url):
+    """Return the keys of cache entries belonging to the URL."""
+    from .url import absurl, urlresource
+
+    resource = urlresource(absurl(url))
+
+    # Texts are stored under a prefixed resource, parse results under a tuple
+    # of the resource and further options.
+    text_key = "text_" + resource
+    return [
+        key
+        for key in list(cache.keys())
+        if key == text_key or (isinstance(key, tuple) and key[0] == resource)
+    ]
+
+
+class ReferenceCache(MutableMapping):
+    """
+    Bounded, thread-safe cache for fetched and parsed references.
+
+    The cache can be passed wherever prance accepts a reference cache, e.g.
+    the `reference_cache` option of :py:class:`prance.ResolvingParser` and
+    :py:class:`prance.util.resolver.RefResolver`, or the `cache` parameter of
+    :py:func:`prance.util.url.fetch_url`. A single instance may be shared
+    between parsers, including parsers running in different threads.
+
+    When either the number of entries or their combined approximate size
+    exceeds the given bounds, the least recently used entries are evicted.
+    Hits, misses and evictions are counted; see `stats()`.
+    """
+
+    def __init__(self, max_entries=None, max_size=None, sizeof=None):
+        """
+        Construct a reference cache.
+
+        :param int max_entries: [optional] The maximum number of entries to
+            keep. Defaults to None, i.e. unbounded.
+        :param int max_size: [optional] The maximum combined size of all
+            entries, in Bytes as determined by `sizeof`. Defaults to None, i.e.
+            unbounded.
+        :param callable sizeof: [optional] Callable returning the size of an
+            entry. Defaults to a rough estimate based on string lengths and
+            container sizes.
+        """
+        import collections
+        import threading
+
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.__sizeof = sizeof or _approximate_size
+
+        self.__lock = threading.RLock()
+        self.__entries = collections.OrderedDict()
+        self.__sizes = {}
+        self.__size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getitem__(self, key):
+        with self.__lock:
+            try:
+                value = self.__entries[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get(self, key, default=None):
+        """Return the entry for the key, or the default if there is none."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        size = self.__sizeof(value)
+        with self.__lock:
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = value
+            self.__sizes[key] = size
+            self.__size += size
+            self.__evict()
+
+    def __delitem__(self, key):
+        with self.__lock:
+            self.__remove(key)
+
+    def __iter__(self):
+        with self.__lock:
+            return iter(list(self.__entries.keys()))
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
+
+    def __contains__(self, key):
+        with self.__lock:
+            return key in self.__entries
+
+    @property
+    def size(self):
+        """Return the combined approximate size of all entries."""
+        with self.__lock:
+            return self.__size
+
+    def __remove(self, key):
+        del self.__entries[key]
+        self.__size -= self.__sizes.pop(key)
+
+    def __over_limits(self):
+        if self.max_entries is not None and len(self.__entries) > self.max_entries:
+            return True
+        if self.max_size is not None and self.__size > self.max_size:
+            return True
+        return False
+
+    def __evict(self):
+        # Evict least recently used entries, but never the one just added.
+        while len(self.__entries) > 1 and self.__over_limits():
+            key = next(iter(self.__entries))
+            self.__remove(key)
+            self.evictions += 1
+
+    def invalidate(self, url):
+        """
+        Remove all entries for the URL.
+
+        Use this when a referenced file is known to have changed.
+
+        :param str/tuple url: The URL to remove entries for.
+        :return: The number of entries removed.
+        :rtype: int
+        """
+        with self.__lock:
+            keys = _keys_for_url(self.__entries, url)
+            for key in keys:
+                self.__remove(key)
+            return len(keys)
+
+    def clear(self):
+        """Remove all entries; the statistics are kept."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__sizes.clear()
+            self.__size = 0
+
+    def stats(self):
+        """
+        Return cache statistics.
+
+        :return: The number of hits, misses and evictions so far, as well as the
+            current number of entries and their combined size.
+        :rtype: dict
+        """
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.__entries),
+                "size": self.__size,
+            }
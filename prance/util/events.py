@@ -0,0 +1,210 @@
+"""
+This submodule contains events for observing what parsing specs spends time on.
+
+Parsing a spec proceeds in phases, some of which repeat for each file the
+spec references:
+
+- `fetch`: Fetching a URL, including reading and decoding local files. The
+  event info contains the `url`.
+- `decode`: Detecting the encoding of a local file and decoding it. The event
+  info contains the `filename`.
+- `parse`: Parsing YAML or JSON. The event info contains the `filename`, if
+  known.
+- `resolve`: Resolving the references of a spec, including fetching and
+  parsing referenced files. The event info contains the `url`.
+- `validate`: Validating a spec with the validation backend. The event info
+  contains the `backend`.
+- `serialize`: Serializing a spec to YAML or JSON. The event info contains
+  the `filename`, if known.
+
+As the list shows, phases may be nested within others. Observers are
+notified of the start and end of each phase. They are registered for the
+current context via `observe()`, or via the `observer` option of the parsers.
+Being context variables, observers are also notified of phases running in
+threads prance starts itself, and in asyncio tasks.
+
+When no observer is registered, phases cost next to nothing.
+"""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+import contextlib
+import contextvars
+
+PHASES = ("fetch", "decode", "parse", "resolve", "validate", "serialize")
+
+_observers = contextvars.ContextVar("prance_observers", default=())
+
+
+class Observer:
+    """
+    Interface for observers of phase events.
+
+    Observers may be notified from several threads at once.
+    """
+
+    def phase_started(self, phase, info):
+        """
+        Notify the observer that a phase started.
+
+        :param str phase: The phase, one of `PHASES`.
+        :param dict info: Information on the phase, see the module
+            documentation.
+        """
+        pass
+
+    def phase_ended(self, phase, info, duration, error=None):
+        """
+        Notify the observer that a phase ended.
+
+        :param str phase: The phase, one of `PHASES`.
+        :param dict info: Information on the phase, see the module
+            documentation.
+        :param float duration: The duration of the phase, in seconds.
+        :param Exception error: [optional] The exception the phase failed
+            with, if any.
+        """
+        pass  # pragma: nocover
+
+
+@contextlib.contextmanager
+def observe(*observers):
+    """
+    Notify the observers of phases within the context.
+
+    Observers registered in enclosing contexts continue to be notified.
+    None values are ignored, which allows passing optional observers.
+
+    :param Observer observers: The observers to notify.
+    """
+    added = tuple(observer for observer in observers if observer is not None)
+    token = _observers.set(_observers.get() + added)
+    try:
+        yield
+    finally:
+        _observers.reset(token)
+
+
+@contextlib.contextmanager
+def phase(name, **info):
+    """
+    Run the context as a phase, notifying any observers.
+
+    :param str name: The name of the phase, one of `PHASES`.
+    :param info: Information on the phase, see the module documentation.
+    """
+    observers = _observers.get()
+    if not observers:
+        yield
+        return
+
+    import time
+
+    for observer in observers:
+        observer.phase_started(name, info)
+
+    error = None
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as ex:
+        error = ex
+        raise
+    finally:
+        duration = time.perf_counter() - start
+        for observer in observers:
+            observer.phase_ended(name, info, duration, error)
+
+
+class Timings(Observer):
+    """
+    Collect the durations of phases.
+
+    Durations of the same phase are summed up; as phases may be nested, the
+    sums of different phases may overlap. Fetches are also recorded per URL.
+    """
+
+    def __init__(self):
+        """Construct an empty collection."""
+        import threading
+
+        self.__lock = threading.Lock()
+        self.__phases = {}
+        self.__fetches = []
+
+    def phase_ended(self, phase, info, duration, error=None):
+        """See :py:meth:`Observer.phase_ended`."""
+        with self.__lock:
+            count, total = self.__phases.get(phase, (0, 0.0))
+            self.__phases[phase] = (count + 1, total + duration)
+            if phase == "fetch":
+                self.__fetches.append((info.get("url", None), duration, error))
+
+    @property
+    def phases(self):
+        """The number of times and total duration of each phase, by phase."""
+        with self.__lock:
+            return {
+                name: self.__phases[name]
+                for name in sorted(self.__phases, key=_phase_order)
+            }
+
+    @property
+    def fetches(self):
+        """The URL, duration and error of each fetch, in order of completion."""
+        with self.__lock:
+            return list(self.__fetches)
+
+    def to_dict(self):
+        """
+        Return the timings as a dict, e.g. for serializing to JSON.
+
+        :rtype: dict
+        """
+        return {
+            "phases": [
+                {"phase": name, "count": count, "duration": total}
+                for name, (count, total) in self.phases.items()
+            ],
+            "fetches": [
+                {
+                    "url": url,
+                    "duration": duration,
+                    "error": None if error is None else str(error),
+                }
+                for url, duration, error in self.fetches
+            ],
+        }
+
+    def format(self):
+        """
+        Return the timings as a table.
+
+        Fetches are listed slowest first.
+
+        :rtype: str
+        """
+        lines = [f"{'phase':<10} {'count':>6} {'total [s]':>10}"]
+        for name, (count, total) in self.phases.items():
+            lines.append(f"{name:<10} {count:>6} {total:>10.4f}")
+
+        fetches = sorted(self.fetches, key=lambda fetch: fetch[1], reverse=True)
+        if fetches:
+            lines.append("")
+            lines.append(f"{'fetch [s]':>10}  url")
+            for url, duration, error in fetches:
+                failed = "" if error is None else " (failed)"
+                lines.append(f"{duration:>10.4f}  {url}{failed}")
+        return "\n".join(lines)
+
+
+def _phase_order(name):
+    """Sort known phases in the order of `PHASES`, others after them."""
+    try:
+        return (PHASES.index(name), name)
+    except ValueError:
+        return (len(PHASES), name)
@@ -10,7 +10,27 @@ class ParseError(ValueError):
     pass  # pragma: nocover
 
 
-def __format_preferences(filename, content_type):  # noqa: N802
+def sniff_format(spec_str):
+    """
+    Guess the format of a spec string from its first characters.
+
+    JSON documents describing specs are objects, so anything starting with
+    an opening brace or bracket is likely JSON. Everything else is not JSON,
+    and so likely YAML.
+
+    :param str spec_str: The specifications as string.
+    :return: The most likely format, either `JSON` or `YAML`.
+    :rtype: str
+    """
+    # Skip a byte order mark and leading whitespace; looking at a prefix is
+    # enough, and avoids copying large strings.
+    prefix = str(spec_str[:1024]).lstrip("\ufeff \t\r\n")
+    if prefix[:1] in ("{", "["):
+        return "JSON"
+    return "YAML"
+
+
+def __format_preferences(filename, content_type, spec_str=None):  # noqa: N802
     """
     Detect the format based on file name and content type.
 
@@ -20,10 +40,11 @@ def __format_preferences(filename, content_type):  # noqa: N802
     :rtype: tuple
     """
     # Select the correct format.
-    # 1) If there is neither file name nor content type, use a heuristic.
+    # 1) If there is neither file name nor content type, sniff the content.
     # 2) If there is a file name but no content type, use the file extension.
     # 3) If there is no file name, but a content type, use the content type.
-    # 4) If both are present, prefer the content type.
+    # 4) If both are present, prefer the content type. If that does not
+    #    match a format, e.g. for text/plain, sniff the content.
     # 5) use a heuristic either way to catch bad content types, file names,
     #    etc. The selection process above is just the most likely match!
     best = None
@@ -45,11 +66,15 @@ def __format_preferences(filename, content_type):  # noqa: N802
             if content_type in ctypes:
                 best = __MIME_TO_FORMAT[ctypes]
 
-    # If we have no best format yet, we need to use a heuristic. This is tricky;
-    # Swagger is largely YAML-based, but JSON is used for remote references. In
-    # the end, JSON is probably more likely to match.
+    # If we have no best format yet, we need to use a heuristic. Where the
+    # content is known, sniff it. Otherwise this is tricky; Swagger is largely
+    # YAML-based, but JSON is used for remote references. In the end, JSON is
+    # probably more likely to match.
     if not best:
-        best = "JSON"
+        if spec_str is not None:
+            best = sniff_format(spec_str)
+        else:
+            best = "JSON"
 
     # Now assemble an ordered list of formats to return, with the best format
     # first.
@@ -60,18 +85,260 @@ def __format_preferences(filename, content_type):  # noqa: N802
     return tuple(formats)
 
 
-# Basic parse functions
-def __parse_yaml(spec_str):  # noqa: N802
-    from ruamel.yaml import YAML, parser
+# YAML loading backends. The ruamel.yaml backend uses its C extension
+# automatically where that is installed. PyYAML's libyaml-based loader can be
+# faster still, but must be selected explicitly - its errors are PyYAML's.
+YAML_BACKENDS = ("ruamel", "pyyaml")
+
+__yaml_backend = None
+__yaml_local = None
+
+
+def __ruamel_yaml():  # noqa: N802
+    # YAML instances are not thread-safe, so keep one per thread.
+    global __yaml_local
+    if __yaml_local is None:
+        import threading
+
+        __yaml_local = threading.local()
+
+    yaml = getattr(__yaml_local, "yaml", None)
+    if yaml is None:
+        from ruamel.yaml import YAML
 
-    try:
         yaml = YAML(typ="safe")
-        return yaml.load(str(spec_str))
+        __yaml_local.yaml = yaml
+    return yaml
+
+
+def __load_ruamel(spec_str):  # noqa: N802
+    from ruamel.yaml import parser
+
+    try:
+        return __ruamel_yaml().load(str(spec_str))
     except parser.ParserError as err:
         raise ParseError(str(err))
 
 
+def __load_pyyaml(spec_str):  # noqa: N802
+    from yaml import parser
+
+    from ._yaml12 import Loader
+
+    loader = Loader(str(spec_str))
+    try:
+        return loader.get_single_data()
+    except parser.ParserError as err:
+        raise ParseError(str(err))
+    finally:
+        loader.dispose()
+
+
+__YAML_LOADERS = {
+    "ruamel": __load_ruamel,
+    "pyyaml": __load_pyyaml,
+}
+
+
+def yaml_backends():
+    """
+    Return the YAML loading backends supported by the environment.
+
+    :return: The backend names, in order of preference.
+    :rtype: tuple
+    """
+    ret = []
+    for name, module in (("ruamel", "ruamel.yaml"), ("pyyaml", "yaml")):
+        try:
+            __import__(module)
+            ret.append(name)
+        except ImportError:  # pragma: nocover
+            pass
+    return tuple(ret)
+
+
+def yaml_backend():
+    """
+    Return the active YAML loading backend.
+
+    :return: One of the names in `YAML_BACKENDS`, suffixed with `-c` if the
+        backend's C extension is used, e.g. `ruamel-c`.
+    :rtype: str
+    """
+    name = __yaml_backend or yaml_backends()[0]
+    if name == "ruamel":
+        try:
+            from ruamel.yaml.cyaml import CParser  # noqa: F401
+
+            return "ruamel-c"
+        except ImportError:
+            return "ruamel"
+
+    from ._yaml12 import C_EXTENSION
+
+    return C_EXTENSION and "pyyaml-c" or "pyyaml"
+
+
+def set_yaml_backend(name=None):
+    """
+    Select the YAML loading backend.
+
+    The selection applies process-wide. Both backends load YAML 1.2; the
+    PyYAML backend is configured accordingly.
+
+    :param str name: [optional] One of the names in `YAML_BACKENDS`, or None
+        to select the default backend.
+    :raises ValueError: If the backend is unknown or not installed.
+    """
+    global __yaml_backend
+    if name is not None and name not in yaml_backends():
+        raise ValueError(
+            f'YAML backend "{name}" is not available, use one of {yaml_backends()}!'
+        )
+    __yaml_backend = name
+
+
+# JSON codecs. Fast codecs are used where installed, but only where they
+# produce the same results as the standard library's json module; otherwise
+# the json module is used.
+JSON_CODECS = ("orjson", "json")
+
+__json_codec = None
+
+
+class _CodecMismatch(Exception):
+    """Raised by codecs for input they cannot handle like the json module."""
+
+    pass
+
+
+def __json_compatible(value):  # noqa: N802
+    """
+    Return True if orjson would serialize the value as the json module does.
+
+    That is the case unless the value contains floats which the json module
+    writes in exponent notation or as NaN/Infinity, or types either module
+    does not support natively.
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        kind = type(item)
+        if kind is str or kind is int or kind is bool or item is None:
+            continue
+        if kind is dict or kind is list or kind is tuple:
+            pass
+        elif isinstance(item, (dict, list, tuple)):
+            pass
+        elif kind is float:
+            rep = repr(item)
+            if "e" in rep or "n" in rep:
+                return False
+            continue
+        elif isinstance(item, (str, int)):
+            continue
+        else:
+            return False
+
+        if isinstance(item, dict):
+            for key in item.keys():
+                if type(key) is not str:
+                    stack.append(key)
+            stack.extend(item.values())
+        else:
+            stack.extend(item)
+    return True
+
+
+def __orjson_loads(spec_str):  # noqa: N802
+    import orjson
+
+    try:
+        return orjson.loads(spec_str)
+    except orjson.JSONDecodeError:
+        # Either not JSON, or e.g. NaN or integers beyond 64 bit, which the
+        # json module accepts.
+        raise _CodecMismatch()
+
+
+def __orjson_dumps(specs):  # noqa: N802
+    import orjson
+
+    if not __json_compatible(specs):
+        raise _CodecMismatch()
+    try:
+        utf = orjson.dumps(specs, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        raise _CodecMismatch()
+    return utf.decode("utf-8")
+
+
+# Map codec names to loads and dumps functions; None means the json module.
+__JSON_CODECS = {
+    "orjson": (__orjson_loads, __orjson_dumps),
+    "json": None,
+}
+
+
+def json_codecs():
+    """
+    Return the JSON codecs supported by the environment.
+
+    :return: The codec names, in order of preference.
+    :rtype: tuple
+    """
+    ret = []
+    for name in JSON_CODECS:
+        try:
+            __import__(name)
+            ret.append(name)
+        except ImportError:
+            pass
+    return tuple(ret)
+
+
+def json_codec():
+    """
+    Return the active JSON codec.
+
+    :return: One of the names in `JSON_CODECS`.
+    :rtype: str
+    """
+    return __json_codec or json_codecs()[0]
+
+
+def set_json_codec(name=None):
+    """
+    Select the JSON codec.
+
+    The selection applies process-wide. Whichever codec is selected, parsing
+    and serializing produce the same results.
+
+    :param str name: [optional] One of the names in `JSON_CODECS`, or None to
+        select the fastest installed codec.
+    :raises ValueError: If the codec is unknown or not installed.
+    """
+    global __json_codec
+    if name is not None and name not in json_codecs():
+        raise ValueError(
+            f'JSON codec "{name}" is not available, use one of {json_codecs()}!'
+        )
+    __json_codec = name
+
+
+# Basic parse functions
+def __parse_yaml(spec_str):  # noqa: N802
+    return __YAML_LOADERS[__yaml_backend or "ruamel"](spec_str)
+
+
 def __parse_json(spec_str):  # noqa: N802
+    codec = __JSON_CODECS[__json_codec or json_codecs()[0]]
+    if codec is not None:
+        try:
+            return codec[0](spec_str)
+        except _CodecMismatch:
+            pass
+
     import json
 
     try:
@@ -84,14 +351,34 @@ def __parse_json(spec_str):  # noqa: N802
 def __serialize_yaml(specs):  # noqa: N802
     import io
     from ruamel.yaml import YAML
+    from ruamel.yaml.representer import RoundTripRepresenter
+
+    from .frozen import FrozenDict, FrozenList, is_frozen
 
     yaml = YAML()
+    yaml.representer.add_representer(FrozenDict, RoundTripRepresenter.represent_dict)
+    yaml.representer.add_representer(FrozenList, RoundTripRepresenter.represent_list)
+    # Frozen specs share values rather than copying them, but cannot contain
+    # themselves; write shared values out rather than as aliases.
+    default_ignore_aliases = yaml.representer.ignore_aliases
+
+    def ignore_aliases(data):
+        return is_frozen(data) or default_ignore_aliases(data)
+
+    yaml.representer.ignore_aliases = ignore_aliases
     buf = io.BytesIO()
     yaml.dump(specs, buf)
     return buf.getvalue().decode("UTF-8")
 
 
 def __serialize_json(specs):  # noqa: N802
+    codec = __JSON_CODECS[__json_codec or json_codecs()[0]]
+    if codec is not None:
+        try:
+            return codec[1](specs)
+        except _CodecMismatch:
+            pass
+
     # The default encoding is utf-8, no need to specify it. But we need to switch
     # off ensure_ascii, otherwise we do not get a unicode string back.
     import json
@@ -150,37 +437,102 @@ def format_info(format_name):
     return content_type, extension
 
 
+#: Interning string values longer than this is unlikely to save memory; such
+#: values are mostly descriptions and the like, which are rarely repeated.
+INTERN_MAX_LENGTH = 64
+
+
+def intern_strings(data, max_length=INTERN_MAX_LENGTH):
+    """
+    Intern the mapping keys and short string values in parsed specs.
+
+    Parsed specs contain many equal strings, such as the keys "type" and
+    "properties", or values like "string" and "object". Interning replaces
+    equal strings with one shared instance, also across specs, which saves
+    memory when many specs are kept around.
+
+    Mappings and sequences are modified in place, so that their identities,
+    and therefore any sharing between them, e.g. from YAML aliases, are kept.
+
+    :param mixed data: The parsed specs.
+    :param int max_length: [optional] The maximum length of string values to
+        intern. Keys are interned regardless of their length. Defaults to
+        `INTERN_MAX_LENGTH`.
+    :return: The data, with strings interned. Only if the data is a string
+        itself, this is a different object.
+    """
+    import sys
+    from collections.abc import MutableMapping, MutableSequence
+
+    def intern_value(value):
+        if isinstance(value, str) and len(value) <= max_length:
+            return sys.intern(value)
+        return value
+
+    seen = set()
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+
+        if isinstance(item, MutableMapping):
+            seen.add(id(item))
+            items = [
+                (sys.intern(key) if isinstance(key, str) else key, intern_value(value))
+                for key, value in item.items()
+            ]
+            item.clear()
+            item.update(items)
+            stack.extend(value for _, value in items if not isinstance(value, str))
+        elif isinstance(item, MutableSequence):
+            seen.add(id(item))
+            item[:] = [intern_value(value) for value in item]
+            stack.extend(value for value in item if not isinstance(value, str))
+
+    return intern_value(data)
+
+
 def parse_spec_details(spec_str, filename=None, **kwargs):
     """
     Return a parsed dict of the given spec string.
 
-    Also returned are the detected mime type and file name extension.
+    Also returned are the detected mime type and file name extension, i.e.
+    those of the format the spec string was successfully parsed as.
 
-    The default format is assumed to be JSON, but if you provide a filename,
-    its extension is used to determine whether YAML or JSON should be
-    parsed.
+    If you provide a filename, its extension is used to determine whether
+    YAML or JSON should be parsed. Otherwise, the format is guessed from the
+    spec string itself, see `sniff_format()`.
 
     :param str spec_str: The specifications as string.
     :param str filename: [optional] Filename to determine the format from.
     :param str content_type: [optional] Content type to determine the format
         from.
+    :param bool intern: [optional] If True, intern mapping keys and short
+        string values, see `intern_strings()`. Defaults to False.
     :return: The specifications, mime type, and extension.
     :rtype: tuple
     :raises ParseError: when parsing fails.
     """
     # Fetch optional content type & determine formats
     content_type = kwargs.get("content_type", None)
-    formats = __format_preferences(filename, content_type)
+    formats = __format_preferences(filename, content_type, spec_str)
+    intern = kwargs.get("intern", False)
 
     # Try parsing each format in order
-    for f in formats:
-        parser = __FORMAT_TO_PARSER[f]
-        try:
-            result = parser(spec_str)
-            ctype, ext = format_info(f)
-            return result, ctype, ext
-        except ParseError:
-            pass
+    from .events import phase
+
+    with phase("parse", filename=filename):
+        for f in formats:
+            parser = __FORMAT_TO_PARSER[f]
+            try:
+                result = parser(spec_str)
+                if intern:
+                    result = intern_strings(result)
+                ctype, ext = format_info(f)
+                return result, ctype, ext
+            except ParseError:
+                pass
 
     # All failed!
     raise ParseError("Could not detect format of spec string!")
@@ -197,6 +549,8 @@ def parse_spec(spec_str, filename=None, **kwargs):
     :param str filename: [optional] Filename to determine the format from.
     :param str content_type: [optional] Content type to determine the format
         from.
+    :param bool intern: [optional] If True, intern mapping keys and short
+        string values, see `intern_strings()`. Defaults to False.
     :return: The specifications.
     :rtype: dict
     :raises ParseError: when parsing fails.
@@ -227,4 +581,8 @@ def serialize_spec(specs, filename=None, **kwargs):
     # Instead of trying to parse various formats, we only serialize to the first
     # one in the list - nothing else makes much sense.
     serializer = __FORMAT_TO_SERIALIZER[formats[0]]
-    return serializer(specs)
+
+    from .events import phase
+
+    with phase("serialize", filename=filename):
+        return serializer(specs)
@@ -0,0 +1,224 @@
+"""
+This submodule contains an immutable, hashable representation of specs.
+
+Frozen specs consist of :py:class:`FrozenDict` and :py:class:`FrozenList`
+instances in place of dicts and lists. As they cannot be modified, they can
+be shared between caches, resolvers and threads without copying; copying
+them in fact returns the same object. As they are subclasses of dict and
+list, code reading specs, such as validation backends and JSON serializers,
+handles them like plain specs.
+
+Use `freeze()` to create frozen specs, and `thaw()` to turn them back into
+plain, mutable dicts and lists. Use `replace_paths()` to set values in
+frozen specs; it returns new frozen specs sharing everything that did not
+change with the original.
+"""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"'{type(self).__name__}' object is immutable")
+
+
+class FrozenDict(dict):
+    """
+    An immutable dict.
+
+    Its hash is computed from its items once, when it is first needed. All
+    values must therefore be hashable, which is the case for frozen specs.
+    """
+
+    __slots__ = ("__hash",)
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def __hash__(self):
+        try:
+            return self.__hash
+        except AttributeError:
+            self.__hash = hash(frozenset(self.items()))
+            return self.__hash
+
+    def __repr__(self):
+        return f"FrozenDict({dict.__repr__(self)})"
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def copy(self):
+        """Return the dict itself, as it is immutable."""
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class FrozenList(list):
+    """
+    An immutable list.
+
+    Its hash is computed from its items once, when it is first needed. All
+    items must therefore be hashable, which is the case for frozen specs.
+    """
+
+    __slots__ = ("__hash",)
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __iadd__ = _immutable
+    __imul__ = _immutable
+    append = _immutable
+    clear = _immutable
+    extend = _immutable
+    insert = _immutable
+    pop = _immutable
+    remove = _immutable
+    reverse = _immutable
+    sort = _immutable
+
+    def __hash__(self):
+        try:
+            return self.__hash
+        except AttributeError:
+            self.__hash = hash(tuple(self))
+            return self.__hash
+
+    def __repr__(self):
+        return f"FrozenList({list.__repr__(self)})"
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def copy(self):
+        """Return the list itself, as it is immutable."""
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def is_frozen(value):
+    """Return whether the value is a FrozenDict or FrozenList."""
+    return isinstance(value, (FrozenDict, FrozenList))
+
+
+def _convert(value, to_dict, to_list, done):
+    """
+    Convert all mappings and sequences in the value, innermost first.
+
+    Objects occurring several times in the value are converted only once, so
+    the result shares them like the value does.
+
+    :param mixed value: The value to convert.
+    :param callable to_dict: Converts a mapping, given its converted items.
+    :param callable to_list: Converts a sequence, given its converted items.
+    :param callable done: Returns whether a container needs no conversion.
+    :raises ValueError: If the value contains itself.
+    """
+    from collections.abc import Mapping, Sequence
+
+    def container(item):
+        if isinstance(item, Mapping):
+            return True
+        return isinstance(item, Sequence) and not isinstance(item, (str, bytes))
+
+    if not container(value) or done(value):
+        return value
+
+    converted = {}
+    pending = set()
+    stack = [(value, False)]
+    while stack:
+        item, children_done = stack.pop()
+        if id(item) in converted:
+            continue
+
+        if children_done:
+            pending.discard(id(item))
+            if isinstance(item, Mapping):
+                result = to_dict(
+                    (key, converted.get(id(child), child))
+                    for key, child in item.items()
+                )
+            else:
+                result = to_list(converted.get(id(child), child) for child in item)
+            converted[id(item)] = result
+            continue
+
+        # Containers are completed in stack order, so a container that is
+        # still pending when encountered again contains itself.
+        if id(item) in pending:
+            raise ValueError("Cannot convert a value that contains itself!")
+        pending.add(id(item))
+        stack.append((item, True))
+
+        children = item.values() if isinstance(item, Mapping) else item
+        for child in children:
+            if container(child) and not done(child) and id(child) not in converted:
+                stack.append((child, False))
+
+    return converted[id(value)]
+
+
+def freeze(value):
+    """
+    Return a frozen version of the value.
+
+    Frozen parts of the value are used as they are, so freezing frozen specs
+    is cheap.
+
+    :param mixed value: Parsed specs, or any part of them.
+    :return: The value with all mappings replaced by FrozenDicts, and all
+        sequences other than strings by FrozenLists.
+    :raises ValueError: If the value contains itself.
+    """
+    return _convert(value, FrozenDict, FrozenList, is_frozen)
+
+
+def thaw(value):
+    """
+    Return a plain, mutable version of frozen specs.
+
+    Objects occurring several times in the value occur several times in the
+    result, too; modifying one occurrence modifies all of them.
+
+    :param mixed value: Frozen specs, or any part of them.
+    :return: The value with all mappings replaced by dicts, and all
+        sequences other than strings by lists.
+    """
+    return _convert(value, dict, list, lambda item: False)
+
+
+def replace_paths(value, changes):
+    """
+    Return a copy of frozen specs with values set at the given paths.
+
+    Only the containers along the changed paths are copied; everything else
+    is shared between the value and the result. Intermediate containers are
+    created as needed.
+
+    :param mixed value: The frozen specs.
+    :param iterable changes: Pairs of paths and values, as for
+        :py:func:`prance.util.path.path_set_many`.
+    :return: The frozen result.
+    """
+    from .path import path_set_many
+
+    return freeze(path_set_many(value, changes, create=True, copy=True))
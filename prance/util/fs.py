@@ -213,6 +213,105 @@ def canonical_filename(filename):
             return path
 
 
+# Byte order marks and the encodings they indicate. UTF-32 must be checked
+# first, as its little endian BOM starts with the UTF-16 one.
+_BOMS = (
+    (b"\xef\xbb\xbf", "utf-8-sig"),
+    (b"\xff\xfe\x00\x00", "utf-32"),
+    (b"\x00\x00\xfe\xff", "utf-32"),
+    (b"\xff\xfe", "utf-16"),
+    (b"\xfe\xff", "utf-16"),
+)
+
+# Files larger than this are memory mapped instead of read.
+_MMAP_THRESHOLD = 1024 * 1024
+
+
+def _detect_encoding_bytes(raw, default_to_utf8=True, final=True, limit=None):
+    """
+    Detect the character encoding of raw file contents.
+
+    See `_detect_and_decode()` for the parameters.
+
+    :return: The encoding.
+    :rtype: str
+    """
+    return _detect_and_decode(raw, default_to_utf8, final, limit)[0]
+
+
+def _detect_and_decode(raw, default_to_utf8=True, final=True, limit=None):
+    """
+    Detect the character encoding of raw file contents, keeping any decoding.
+
+    Detecting UTF-8 means decoding the contents; if they are complete, the
+    decoded contents are returned, too, so that they need not be decoded
+    again.
+
+    :param bytes raw: The file contents, or a prefix of them. Any object
+        supporting the buffer protocol and slicing works, e.g. an mmap.
+    :param bool default_to_utf8: Treat contents valid as UTF-8 as UTF-8.
+    :param bool final: If False, `raw` is a prefix of the contents, which may
+        end in the middle of a character.
+    :param int limit: [optional] Only pass this many Bytes to the charset
+        detector.
+    :return: The encoding, and the decoded contents if the contents are
+        complete and UTF-8, or else None.
+    :rtype: tuple
+    """
+    head = raw[:4]
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, None
+
+    # Contents that decode as UTF-8 are most likely UTF-8, unless they contain
+    # NUL Bytes - those are typical for UTF-16 or UTF-32 without BOM. There is
+    # no need to ask a detector then.
+    decoded = None
+    utf8 = False
+    if default_to_utf8:
+        import codecs
+
+        try:
+            decoded = codecs.getincrementaldecoder("utf-8")().decode(raw, final)
+            utf8 = True
+        except UnicodeDecodeError:
+            pass
+        if not final:
+            decoded = None
+        if utf8 and raw.find(b"\x00") < 0:
+            return "utf-8", decoded
+
+    sample = raw[:limit] if limit is not None else bytes(raw)
+
+    # Detect encoding using the best detector available
+    try:
+        # First try ICU. ICU will report ASCII in the first 32 Bytes as
+        # ISO-8859-1, which isn't exactly wrong, but maybe optimistic.
+        import icu
+
+        encoding = icu.CharsetDetector(sample).detect().getName().lower()
+    except ImportError:  # pragma: nocover
+        # If that doesn't work, try chardet - it's not got native components,
+        # which is a bonus in some environments, but it's not as precise.
+        import chardet
+
+        encoding = chardet.detect(sample)["encoding"].lower()
+
+        # Chardet is more brutal in that it reports ASCII if none of the first
+        # Bytes contain high bits. To emulate ICU, we just bump up the detected
+        # encoding.
+        if encoding == "ascii":
+            encoding = "iso-8859-1"
+
+    # Both chardet and ICU may detect ISO-8859-x, which may not be possible
+    # to decode as UTF-8. So whatever they report, we'll prefer UTF-8 if the
+    # contents could be decoded as such.
+    if utf8 and encoding in ("ascii", "iso-8859-1", "windows-1252"):
+        return "utf-8", decoded
+
+    return encoding, None
+
+
 def detect_encoding(filename, default_to_utf8=True, **kwargs):
     """
     Detect the named file's character encoding.
@@ -244,67 +343,62 @@ def detect_encoding(filename, default_to_utf8=True, **kwargs):
     with open(filename, "rb") as raw_handle:
         raw = raw_handle.read(read_len)
 
-    # Detect the encoding the file specifies, if any.
-    import codecs
+    return _detect_encoding_bytes(raw, default_to_utf8, final=read_len == file_len)
+
+
+def _read_bytes(filename):
+    """
+    Return the raw contents of a file.
+
+    Large files are memory mapped rather than read; the result must be
+    closed when no longer needed.
+
+    :return: A context manager for the contents, either bytes or an mmap.
+    """
+    import contextlib
+    import os
+
+    with open(filename, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size >= _MMAP_THRESHOLD:
+            import mmap
 
-    if raw.startswith(codecs.BOM_UTF8):
-        encoding = "utf-8-sig"
-    else:
-        # Detect encoding using the best detector available
-        try:
-            # First try ICU. ICU will report ASCII in the first 32 Bytes as
-            # ISO-8859-1, which isn't exactly wrong, but maybe optimistic.
-            import icu
-
-            encoding = icu.CharsetDetector(raw).detect().getName().lower()
-        except ImportError:  # pragma: nocover
-            # If that doesn't work, try chardet - it's not got native components,
-            # which is a bonus in some environments, but it's not as precise.
-            import chardet
-
-            encoding = chardet.detect(raw)["encoding"].lower()
-
-            # Chardet is more brutal in that it reports ASCII if none of the first
-            # Bytes contain high bits. To emulate ICU, we just bump up the detected
-            # encoding.
-            if encoding == "ascii":
-                encoding = "iso-8859-1"
-
-        # Both chardet and ICU may detect ISO-8859-x, which may not be possible
-        # to decode as UTF-8. So whatever they report, we'll try decoding as
-        # UTF-8 before reporting it.
-        if default_to_utf8 and encoding in ("ascii", "iso-8859-1", "windows-1252"):
-            # Try decoding as utf-8
             try:
-                raw.decode("utf-8")
-                # If this worked... well there's no guarantee it's utf-8, to be
-                # honest.
-                encoding = "utf-8"
-            except UnicodeDecodeError:
-                # Decoding as utf-8 failed, so we can't default to it.
+                return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):  # pragma: nocover
                 pass
-
-    return encoding
+        return contextlib.nullcontext(handle.read())
 
 
 def read_file(filename, encoding=None):
     """
     Read and decode a file, taking BOMs into account.
 
+    The file is read only once, whether its encoding is given or detected.
+
     :param str filename: The name of the file to read.
-    :param str encoding: The encoding to use. If not given, detect_encoding is
-        used to determine the encoding.
+    :param str encoding: The encoding to use. If not given, the encoding is
+        detected as by detect_encoding.
     :return: The file contents.
     :rtype: unicode string
     """
-    filename = from_posix(filename)
-    if not encoding:
-        # Detect encoding
-        encoding = detect_encoding(filename)
+    from .events import phase
 
-    # Finally, read the file in the detected encoding
-    with open(filename, encoding=encoding) as handle:
-        return handle.read()
+    filename = from_posix(filename)
+    with _read_bytes(filename) as raw, phase("decode", filename=filename):
+        contents = None
+        if not encoding:
+            # Detect encoding; detecting UTF-8 decodes the contents already.
+            encoding, contents = _detect_and_decode(raw, limit=_READ_CHUNK_SIZE)
+
+        # Decode the contents in the detected encoding
+        if contents is None:
+            contents = str(raw, encoding)
+
+    # Translate line endings, as reading in text mode would.
+    if "\r" in contents:
+        contents = contents.replace("\r\n", "\n").replace("\r", "\n")
+    return contents
 
 
 def write_file(filename, contents, encoding=None):
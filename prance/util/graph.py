@@ -0,0 +1,230 @@
+"""This submodule contains a graph of the references within specs."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+def node_id(node):
+    """
+    Return the string form of a graph node.
+
+    That is the node's URL, with its object path as JSON pointer fragment.
+
+    :param tuple node: The node, a tuple of the URL and the object path.
+    :rtype: str
+    """
+    from .path import JSONPointer
+
+    url, pointer = node
+    return url + "#" + str(JSONPointer(pointer))
+
+
+class ReferenceGraph:
+    """
+    The graph of references between the parts of a spec.
+
+    Nodes are the referenced objects, identified by the resource part of the
+    URL they are located at and their object path within it, e.g.
+    ``("file:///path/to/spec.yaml", ("definitions", "Pet"))``. The document
+    root of the spec itself is a node, too. An edge leads from the innermost
+    node containing a reference to the node the reference points to, and
+    counts how many such references there are.
+
+    Use :py:meth:`prance.util.resolver.RefResolver.reference_graph` to build
+    the graph of a spec.
+    """
+
+    def __init__(self, root=None):
+        """
+        Construct an empty graph.
+
+        :param tuple root: [optional] The root node; it is added to the graph.
+        """
+        self.root = root
+        self.__edges = {}
+        if root is not None:
+            self.add_node(root)
+
+    def __contains__(self, node):
+        return node in self.__edges
+
+    def __len__(self):
+        return len(self.__edges)
+
+    def add_node(self, node):
+        """Add a node, unless it is already part of the graph."""
+        self.__edges.setdefault(node, {})
+
+    def add_edge(self, source, target, count=1):
+        """
+        Add references from the source to the target node.
+
+        Nodes are added as needed; the count is added to any references
+        between the nodes added before.
+        """
+        self.add_node(target)
+        targets = self.__edges.setdefault(source, {})
+        targets[target] = targets.get(target, 0) + count
+
+    @property
+    def nodes(self):
+        """All nodes, in the order in which they were added."""
+        return list(self.__edges.keys())
+
+    @property
+    def edges(self):
+        """All edges, as (source, target, count) tuples."""
+        return [
+            (source, target, count)
+            for source, targets in self.__edges.items()
+            for target, count in targets.items()
+        ]
+
+    def targets(self, node):
+        """
+        Return the nodes the given node references.
+
+        :return: The number of references by referenced node.
+        :rtype: dict
+        """
+        return dict(self.__edges[node])
+
+    def reference_counts(self):
+        """
+        Return how often each node is referenced.
+
+        :return: The number of references by node; nodes that are not
+            referenced at all have a count of zero.
+        :rtype: dict
+        """
+        counts = dict.fromkeys(self.__edges, 0)
+        for _, target, count in self.edges:
+            counts[target] += count
+        return counts
+
+    def cycles(self):
+        """
+        Return the reference cycles in the graph.
+
+        Each cycle is a strongly connected component of the graph, i.e. a
+        list of nodes that all reach each other via references. Nodes that
+        reference themselves form cycles of their own. Nodes in a cycle can
+        only be resolved up to a recursion limit.
+
+        :return: The cycles, each a list of nodes in the order they were added.
+        :rtype: list
+        """
+        # Tarjan's algorithm, iteratively, so that deep graphs do not run into
+        # Python's recursion limit.
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        result = []
+
+        def visit(node):
+            index[node] = lowlink[node] = len(index)
+            stack.append(node)
+            on_stack.add(node)
+            return (node, iter(self.__edges[node]))
+
+        for start in self.__edges:
+            if start in index:
+                continue
+
+            work = [visit(start)]
+            while work:
+                node, targets = work[-1]
+                for target in targets:
+                    if target not in index:
+                        work.append(visit(target))
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], index[target])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in self.__edges[node]:
+                            result.append(sorted(component, key=index.get))
+
+        return sorted(result, key=lambda component: index[component[0]])
+
+    def to_dict(self):
+        """
+        Return the graph as a dict, e.g. for serializing to JSON.
+
+        Nodes are given as strings, see `node_id()`.
+
+        :rtype: dict
+        """
+        from .path import JSONPointer
+
+        counts = self.reference_counts()
+        return {
+            "root": node_id(self.root) if self.root is not None else None,
+            "nodes": [
+                {
+                    "id": node_id(node),
+                    "url": node[0],
+                    "pointer": str(JSONPointer(node[1])),
+                    "references": counts[node],
+                }
+                for node in self.__edges
+            ],
+            "edges": [
+                {"source": node_id(source), "target": node_id(target), "count": count}
+                for source, target, count in self.edges
+            ],
+            "cycles": [[node_id(node) for node in cycle] for cycle in self.cycles()],
+        }
+
+    def to_dot(self):
+        """
+        Return the graph in the DOT language of Graphviz.
+
+        Nodes are labelled with the file name and pointer, edges with the
+        number of references if there is more than one. Edges within cycles
+        are drawn in red.
+
+        :rtype: str
+        """
+        import json
+
+        def quote(value):
+            # JSON string escaping is a valid subset of DOT's.
+            return json.dumps(value, ensure_ascii=False)
+
+        in_cycles = {}
+        for number, cycle in enumerate(self.cycles()):
+            for node in cycle:
+                in_cycles[node] = number
+
+        lines = ["digraph references {"]
+        for node in self.__edges:
+            label = node_id((node[0].rsplit("/", 1)[-1], node[1]))
+            lines.append(f"  {quote(node_id(node))} [label={quote(label)}];")
+        for source, target, count in self.edges:
+            attrs = []
+            if count > 1:
+                attrs.append(f'label="{count}"')
+            if source in in_cycles and in_cycles[source] == in_cycles.get(target):
+                attrs.append("color=red")
+            attrs = f" [{', '.join(attrs)}]" if attrs else ""
+            lines.append(
+                f"  {quote(node_id(source))} -> {quote(node_id(target))}{attrs};"
+            )
+        lines.append("}")
+        return "\n".join(lines) + "\n"
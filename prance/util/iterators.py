@@ -56,6 +56,21 @@ def item_iterator(value, path=()):
             yield from item_iterator(item, path + (idx,))
 
 
+# Types that can never contain references; the reference iterator skips them
+# without further inspection.
+_SCALAR_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def _link_path(link):
+    """Turn a linked path of (parent_link, key) pairs into a tuple path."""
+    keys = []
+    while link is not None:
+        link, key = link
+        keys.append(key)
+    keys.reverse()
+    return tuple(keys)
+
+
 def reference_iterator(specs, path=()):
     """
     Iterate through the given specs, returning only references.
@@ -68,16 +83,45 @@ def reference_iterator(specs, path=()):
         in sequence, so that you can reasonably easily find the containing
         item. It does not include the final '$ref' key.
 
+    References are yielded in the same order in which `item_iterator` would
+    encounter them. Unlike `item_iterator`, this function does not build a
+    path for every item; paths are only assembled for the references found.
+
     :param dict specs: The specifications to iterate over.
     :return: An iterator over all references in the specs.
     :rtype: iterator
     """
-    # We need to iterate through the nested specification dict, so let's
-    # start with an appropriate iterator. We can immediately optimize it by
-    # only returning '$ref' items.
-    for item_path, item in item_iterator(specs, path):
-        if len(item_path) <= 0:
+    from collections.abc import Mapping, Sequence
+
+    # Depth-first walk over (key, value, link) entries, where the link is
+    # the item's path as nested (parent_link, key) pairs. Scalars other than
+    # references are never put on the stack.
+    stack = [(None, specs, None)]
+    while stack:
+        key, value, link = stack.pop()
+
+        if key == "$ref" and link is not None:
+            yield key, value, path + _link_path(link[0])
+
+        # Dispatch on the concrete types first; they're by far the most
+        # common, and much cheaper to test for than the abstract base classes.
+        if isinstance(value, dict):
+            items = value.items()
+        elif isinstance(value, list):
+            items = enumerate(value)
+        elif isinstance(value, _SCALAR_TYPES):
             continue
-        key = item_path[-1]
-        if key == "$ref":
-            yield key, item, item_path[:-1]
+        elif isinstance(value, Mapping):
+            items = value.items()
+        elif isinstance(value, Sequence):
+            items = enumerate(value)
+        else:
+            continue
+
+        children = [
+            (k, v, (link, k))
+            for k, v in items
+            if k == "$ref" or not isinstance(v, _SCALAR_TYPES)
+        ]
+        children.reverse()
+        stack.extend(children)
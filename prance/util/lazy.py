@@ -0,0 +1,224 @@
+"""
+This submodule contains read-only views of specs that resolve references lazily.
+
+References in a view are resolved when the value containing them is first
+accessed, and the result is remembered. Only the files needed for the values
+accessed are fetched and parsed.
+"""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+from collections.abc import Mapping, Sequence
+
+
+def wrap(resolver, base_url, value, recursions=(), overlay=None):
+    """
+    Return a lazily resolving view of the value.
+
+    References are followed until the value is not a reference itself. Then
+    mappings and sequences are wrapped in views; other values are returned
+    as they are.
+
+    As when resolving eagerly, references next to a reference are resolved
+    into the referenced value; see `_overlay()`.
+
+    :param RefResolver resolver: The resolver to dereference with.
+    :param tuple base_url: URL that the value is located at.
+    :param mixed value: The unresolved value.
+    :param tuple recursions: [optional] A recursion stack for resolving
+        references.
+    :param dict overlay: [optional] Values to resolve into the value, see
+        `_overlay()`.
+    :return: The view, or the value.
+    """
+    overlays = [overlay] if overlay else []
+    while isinstance(value, Mapping) and "$ref" in value:
+        result = resolver._lazy_dereference(base_url, value["$ref"], recursions)
+        if result is None:
+            # The reference is not to be resolved.
+            break
+        if len(value) > 1:
+            overlays.append(_overlay(base_url, value, recursions))
+        base_url, value, recursions = result
+        if recursions is None:
+            # The recursion limit handler produced the value; like when
+            # resolving eagerly, it is used as is.
+            return value
+
+    # Overlays of references further out take precedence.
+    overlay = {}
+    for layer in reversed(overlays):
+        overlay = _merge(overlay, layer)
+
+    if isinstance(value, Mapping):
+        return LazyMapping(resolver, base_url, value, recursions, overlay)
+    if isinstance(value, Sequence) and not isinstance(value, (str, bytes)):
+        return LazySequence(resolver, base_url, value, recursions, overlay)
+    return value
+
+
+def _overlay(base_url, value, recursions):
+    """
+    Return the overlay of the references next to a reference.
+
+    When resolving eagerly, the references among the keys next to a
+    reference are resolved, and set at the same paths within the referenced
+    value; other keys are dropped. The overlay describes these references
+    as a tree of nodes by key. Each node is a pair of the unresolved value
+    with its URL and recursion stack, or None, and the nodes below it.
+
+    :param tuple base_url: URL that the value is located at.
+    :param dict value: The reference, with other keys.
+    :param tuple recursions: The recursion stack for resolving references.
+    :return: The nodes by key.
+    :rtype: dict
+    """
+    from .iterators import reference_iterator
+    from .path import path_get
+
+    siblings = {key: item for key, item in value.items() if key != "$ref"}
+    paths = sorted((path for _, _, path in reference_iterator(siblings)), key=len)
+
+    overlay = {}
+    for path in paths:
+        nodes = overlay
+        for key in path[:-1]:
+            node = nodes.setdefault(key, (None, {}))
+            if node[0] is not None:
+                # The reference is next to a reference already in the
+                # overlay, and resolved with it.
+                break
+            nodes = node[1]
+        else:
+            nodes[path[-1]] = ((base_url, path_get(siblings, path), recursions), {})
+    return overlay
+
+
+def _merge(lower, upper):
+    """Return the overlays merged, with the upper one taking precedence."""
+    result = dict(lower)
+    for key, node in upper.items():
+        if node[0] is not None or key not in result:
+            result[key] = node
+        else:
+            result[key] = (result[key][0], _merge(result[key][1], node[1]))
+    return result
+
+
+def materialize(value):
+    """
+    Return the value with all views replaced by dicts and lists.
+
+    This resolves all references in the value.
+
+    :param mixed value: A view, or any other value.
+    :return: The fully resolved value.
+    """
+    if isinstance(value, LazyMapping):
+        return {key: materialize(item) for key, item in value.items()}
+    if isinstance(value, LazySequence):
+        return [materialize(item) for item in value]
+    return value
+
+
+class _LazyContainer:
+    """Common implementation of the views."""
+
+    def __init__(self, resolver, base_url, value, recursions, overlay=None):
+        self._resolver = resolver
+        self._base_url = base_url
+        self._value = value
+        self._recursions = recursions
+        self._overlay = overlay or {}
+        self._resolved = {}
+
+    def _item(self, key):
+        try:
+            return self._resolved[key]
+        except KeyError:
+            pass
+
+        node = self._overlay.get(key, None)
+        if node is None:
+            item = wrap(
+                self._resolver, self._base_url, self._value[key], self._recursions
+            )
+        elif node[0] is None:
+            # Only values within the item are overlaid; it is created if need
+            # be, as when resolving eagerly.
+            try:
+                value = self._value[key]
+            except (KeyError, IndexError):
+                integers = all(type(child) is int for child in node[1])
+                value = [] if integers else {}
+            item = wrap(
+                self._resolver, self._base_url, value, self._recursions, node[1]
+            )
+        else:
+            base_url, value, recursions = node[0]
+            item = wrap(self._resolver, base_url, value, recursions, node[1])
+        self._resolved[key] = item
+        return item
+
+    def __len__(self):
+        return len(self._value)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._value!r})"
+
+
+class LazyMapping(_LazyContainer, Mapping):
+    """A read-only mapping resolving references on access."""
+
+    def __getitem__(self, key):
+        return self._item(key)
+
+    def __len__(self):
+        return len(self._value) + sum(
+            1 for key in self._overlay if key not in self._value
+        )
+
+    def __iter__(self):
+        yield from self._value
+        for key in self._overlay:
+            if key not in self._value:
+                yield key
+
+    def __contains__(self, key):
+        return key in self._value or key in self._overlay
+
+
+class LazySequence(_LazyContainer, Sequence):
+    """A read-only sequence resolving references on access."""
+
+    def __getitem__(self, index):
+        length = len(self)
+        if isinstance(index, slice):
+            return [self[i] for i in range(length)[index]]
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("LazySequence index out of range")
+        if index >= len(self._value) and index not in self._overlay:
+            # Overlays past the end are reached by filling with None, as when
+            # resolving eagerly.
+            return None
+        return self._item(index)
+
+    def __len__(self):
+        return max([len(self._value)] + [index + 1 for index in self._overlay])
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
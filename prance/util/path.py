@@ -6,6 +6,9 @@ __license__ = "MIT"
 __all__ = ()
 
 
+import functools
+
+
 def _json_ref_escape(path):
     """JSON-reference escape object path."""
     path = str(path)  # Could be an int, etc.
@@ -19,6 +22,99 @@ def _str_path(path):
     return "/" + "/".join([_json_ref_escape(p) for p in path])
 
 
+def _json_ref_unescape(part):
+    """JSON-reference unescape object path part."""
+    if "~" in part:
+        part = part.replace("~1", "/")
+        part = part.replace("~0", "~")
+    return part
+
+
+class JSONPointer(tuple):
+    """
+    A parsed JSON pointer, i.e. the object path of a JSON reference.
+
+    The pointer is a tuple of its unescaped parts, so it can be used wherever
+    object paths are. Use `parse()` to create pointers from strings; parsed
+    pointers are interned, so that every distinct pointer string is split and
+    unescaped only once.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def parse(pointer):
+        """
+        Return the pointer for a string.
+
+        Leading slashes are ignored, so `/foo/bar` and `foo/bar` denote the
+        same pointer.
+
+        :param str pointer: The pointer string, e.g. the fragment of a
+            reference URL.
+        :return: The parsed pointer.
+        :rtype: JSONPointer
+        """
+        parts = pointer.split("/")
+        start = 0
+        while start < len(parts) and not parts[start]:
+            start += 1
+        return JSONPointer(_json_ref_unescape(part) for part in parts[start:])
+
+    def resolve(self, obj):
+        """
+        Return the value the pointer points to in obj.
+
+        Any Mapping or Sequence is supported, as with path_get().
+
+        :param mixed obj: The Sequence or Mapping to look up values in.
+        :return: The value.
+        :raises KeyError: If a Mapping does not contain a key, or a Sequence is
+            indexed with a non-integer.
+        :raises IndexError: If a Sequence index is out of bounds.
+        :raises TypeError: If a value other than a Mapping or Sequence is to be
+            indexed.
+        """
+        from collections.abc import Mapping, Sequence
+
+        value = obj
+        for index, part in enumerate(self):
+            kind = type(value)
+            if kind is dict or (kind is not list and isinstance(value, Mapping)):
+                try:
+                    value = value[part]
+                except KeyError:
+                    raise KeyError(
+                        'Object at "{}" does not contain key: {}'.format(
+                            _str_path(self[:index]), part
+                        )
+                    )
+            elif kind is list or isinstance(value, Sequence):
+                try:
+                    idx = int(part)
+                except ValueError:
+                    raise KeyError(
+                        'Sequence at "%s" needs integer indices only, but got: '
+                        "%s" % (_str_path(self[:index]), part)
+                    )
+                if idx < 0 or idx >= len(value):
+                    raise IndexError(
+                        'Index out of bounds for sequence at "%s": %d'
+                        % (_str_path(self[:index]), idx)
+                    )
+                value = value[idx]
+            else:
+                raise TypeError(f"Cannot get anything from type {type(value)}!")
+        return value
+
+    def __str__(self):
+        return _str_path(self)
+
+    def __repr__(self):
+        return f"JSONPointer({str(self)!r})"
+
+
 def path_get(obj, path, defaultvalue=None, path_of_obj=()):
     """
     Retrieve the value from obj indicated by path.
@@ -37,57 +133,121 @@ def path_get(obj, path, defaultvalue=None, path_of_obj=()):
     """
     from collections.abc import Mapping, Sequence
 
-    # For error reporting.
-    path_of_obj_str = _str_path(path_of_obj)
-
     if path is not None and not isinstance(path, Sequence):
         raise TypeError(f"Path is a {type(path)}, but must be None or a Collection!")
 
-    if isinstance(obj, Mapping):
-        if path is None or len(path) < 1:
-            return obj or defaultvalue
+    # For error reporting.
+    def path_of_obj_str(index):
+        return _str_path(tuple(path_of_obj) + tuple(path[:index]))
+
+    for index, key in enumerate(path or ()):
+        if isinstance(obj, Mapping):
+            if key not in obj:
+                raise KeyError(
+                    'Object at "{}" does not contain key: {}'.format(
+                        path_of_obj_str(index), key
+                    )
+                )
+            obj = obj[key]
+
+        elif isinstance(obj, Sequence):
+            try:
+                idx = int(key)
+            except ValueError:
+                raise KeyError(
+                    'Sequence at "%s" needs integer indices only, but got: '
+                    "%s"
+                    % (
+                        path_of_obj_str(index),
+                        key,
+                    )
+                )
 
-        if path[0] not in obj:
-            raise KeyError(
-                'Object at "{}" does not contain key: {}'.format(
-                    path_of_obj_str, path[0]
+            if idx < 0 or idx >= len(obj):
+                raise IndexError(
+                    'Index out of bounds for sequence at "%s": %d'
+                    % (path_of_obj_str(index), idx)
                 )
-            )
+            obj = obj[idx]
+
+        else:
+            raise TypeError(f"Cannot get anything from type {type(obj)}!")
+
+    return obj or defaultvalue
+
+
+def _fill_sequence(seq, index, value_index_type):
+    """
+    Fill the sequence seq with elements until index can be accessed.
+
+    Fills with None except for the indexed element. That is either a dict or
+    a list, depending on the value_index_type. If the latter is an int, a
+    list is added. If the latter is None (unknown), None is added. Otherwise
+    a dict is added.
+    """
+    if len(seq) > index:
+        return
+
+    while len(seq) < index:
+        seq.append(None)
+
+    if value_index_type is int:
+        seq.append([])
+    elif value_index_type is None:
+        seq.append(None)
+    else:
+        seq.append({})
+
+
+def _path_step(obj, path, index, create):
+    """
+    Apply the path element at index to obj, for setting values.
+
+    :return: The container the path element refers to, and the key or index to
+        use with it.
+    """
+    from collections.abc import Sequence, MutableSequence, Mapping, MutableMapping
+
+    key = path[index]
+    last = index == len(path) - 1
+
+    if isinstance(obj, Mapping):
+        # If we don't have a mutable mapping, we should raise a TypeError
+        if not isinstance(obj, MutableMapping):  # pragma: nocover
+            raise TypeError(f"Mapping is not mutable: {type(obj)}")
 
-        return path_get(
-            obj[path[0]], path[1:], defaultvalue, path_of_obj=path_of_obj + (path[0],)
-        )
+        if last:
+            if not create and key not in obj:
+                # dicts would normally silently create, but we have to make it
+                # explicit to fulfil our contract.
+                raise KeyError(f'Key "{key}" not in Mapping!')
+        elif create and key not in obj:
+            if type(path[index + 1]) is int:
+                obj[key] = []
+            else:
+                obj[key] = {}
+        return key
 
     elif isinstance(obj, Sequence):
-        if path is None or len(path) < 1:
-            return obj or defaultvalue
+        # If we don't have a mutable sequence, we should raise a TypeError
+        if not isinstance(obj, MutableSequence):
+            raise TypeError(f"Sequence is not mutable: {type(obj)}")
 
+        # Ensure integer indices
         try:
-            idx = int(path[0])
+            idx = int(key)
         except ValueError:
-            raise KeyError(
-                'Sequence at "%s" needs integer indices only, but got: '
-                "%s"
-                % (
-                    path_of_obj_str,
-                    path[0],
-                )
-            )
-
-        if idx < 0 or idx >= len(obj):
-            raise IndexError(
-                'Index out of bounds for sequence at "%s": %d' % (path_of_obj_str, idx)
-            )
+            raise KeyError("Sequences need integer indices only.")
 
-        return path_get(
-            obj[idx], path[1:], defaultvalue, path_of_obj=path_of_obj + (path[0],)
-        )
+        # If we're supposed to create and the index doesn't exist, then we need
+        # to push some dummy objects.
+        if create:
+            next_type = None if last else type(path[index + 1])
+            _fill_sequence(obj, idx, next_type)
+        return idx
 
     else:
-        # Path must be empty.
-        if path is not None and len(path) > 0:
-            raise TypeError(f"Cannot get anything from type {type(obj)}!")
-        return obj or defaultvalue
+        raise TypeError(f"Cannot set anything on type {type(obj)}!")
 
 
 def path_set(obj, path, value, **options):
@@ -108,45 +268,7 @@ def path_set(obj, path, value, **options):
     # Retrieve options
     create = options.get("create", False)
 
-    def fill_sequence(seq, index, value_index_type):
-        """
-        Fill the sequence seq with elements until index can be accessed.
-
-        Fills with None except for the indexed element. That is either a dict or
-        a list, depending on the value_index_type. If the latter is an int, a
-        list is added. If the latter is None (unknown), None is added. Otherwise
-        a dict is added.
-        """
-        if len(seq) > index:
-            return
-
-        while len(seq) < index:
-            seq.append(None)
-
-        if value_index_type == int:
-            seq.append([])
-        elif value_index_type is None:
-            seq.append(None)
-        else:
-            seq.append({})
-
-    def safe_idx(seq, index):
-        """
-        Safely index a sequence.
-
-        Much like dict.get with default value, except returns None instead of
-        raising IndexError.
-        """
-        try:
-            return type(seq[index])
-        except IndexError:
-            return None
-
-    # print('obj', obj, type(obj))
-    # print('path', path)
-    # print('value', value)
-
-    from collections.abc import Sequence, MutableSequence, Mapping, MutableMapping
+    from collections.abc import Sequence
 
     if path is not None and not isinstance(path, Sequence):
         raise TypeError(f"Path is a {type(path)}, but must be None or a Collection!")
@@ -154,55 +276,76 @@ def path_set(obj, path, value, **options):
     if len(path) < 1:
         raise KeyError("Cannot set with an empty path!")
 
-    if isinstance(obj, Mapping):
-        # If we don't have a mutable mapping, we should raise a TypeError
-        if not isinstance(obj, MutableMapping):  # pragma: nocover
-            raise TypeError(f"Mapping is not mutable: {type(obj)}")
+    container = obj
+    for index in range(len(path) - 1):
+        container = container[_path_step(container, path, index, create)]
+    container[_path_step(container, path, len(path) - 1, create)] = value
 
-        # If the path has only one element, we just overwrite the element at the
-        # given key. Otherwise we recurse.
-        if len(path) == 1:
-            if not create and path[0] not in obj:
-                # dicts would normally silently create, but we have to make it
-                # explicit to fulfil our contract.
-                raise KeyError(f'Key "{path[0]}" not in Mapping!')
-            obj[path[0]] = value
-        else:
-            if create and path[0] not in obj:
-                if type(path[1]) == int:
-                    obj[path[0]] = []
-                else:
-                    obj[path[0]] = {}
-            path_set(obj[path[0]], path[1:], value, create=create)
+    return obj
 
-        return obj
 
-    elif isinstance(obj, Sequence):
-        idx = path[0]
+def path_set_many(obj, changes, **options):
+    """
+    Set many values in obj, each indicated by a path.
 
-        # If we don't have a mutable sequence, we should raise a TypeError
-        if not isinstance(obj, MutableSequence):
-            raise TypeError(f"Sequence is not mutable: {type(obj)}")
+    Same as calling path_set() for each change, but containers shared by
+    several paths are looked up only once. Changes are applied in order of
+    path length, so that values set at one path can be modified by changes at
+    longer paths.
 
-        # Ensure integer indices
-        try:
-            idx = int(idx)
-        except ValueError:
-            raise KeyError("Sequences need integer indices only.")
+    :param mixed obj: The Sequence or Mapping in which to set values.
+    :param iterable changes: Pairs of paths and values, e.g. the items of a
+      dict mapping paths to values.
+    :param bool create: [optional] Flag indicating whether to create
+      intermediate values or not. Defaults to False.
+    :param bool copy: [optional] If True, obj is left unmodified. Instead, obj
+      and every container along the changed paths are copied shallowly, and
+      the changes are applied to the copies. Everything not along the changed
+      paths is shared between obj and the result. Frozen containers, see
+      :py:mod:`prance.util.frozen`, are copied to plain dicts and lists.
+      Defaults to False.
+    :return: The modified obj, or the modified copy of obj.
+    """
+    create = options.get("create", False)
+    if options.get("copy", False):
+        from copy import copy
 
-        # If we're supposed to create and the index at path[0] doesn't exist,
-        # then we need to push some dummy objects.
-        if create:
-            fill_sequence(obj, idx, safe_idx(path, 1))
+        from .frozen import FrozenDict, FrozenList
 
-        # If the path has only one element, we just overwrite the element at the
-        # given index. Otherwise we recurse.
-        # print('pl', len(path))
-        if len(path) == 1:
-            obj[idx] = value
-        else:
-            path_set(obj[idx], path[1:], value, create=create)
+        def duplicate(container):
+            if isinstance(container, FrozenDict):
+                return dict(container)
+            if isinstance(container, FrozenList):
+                return list(container)
+            return copy(container)
 
-        return obj
     else:
-        raise TypeError(f"Cannot set anything on type {type(obj)}!")
+
+        def duplicate(container):
+            return container
+
+    # Containers by the path that leads to them. As changes are applied in
+    # order of path length, no change can replace a container that is
+    # already known here.
+    obj = duplicate(obj)
+    containers = {(): obj}
+
+    for path, value in sorted(changes, key=lambda change: len(change[0])):
+        path = tuple(path)
+        if len(path) < 1:
+            raise KeyError("Cannot set with an empty path!")
+
+        # Find the closest known container.
+        start = len(path) - 1
+        while path[:start] not in containers:
+            start -= 1
+        container = containers[path[:start]]
+
+        for index in range(start, len(path) - 1):
+            key = _path_step(container, path, index, create)
+            container[key] = duplicate(container[key])
+            container = container[key]
+            containers[path[: index + 1]] = container
+        container[_path_step(container, path, len(path) - 1, create)] = value
+
+    return obj
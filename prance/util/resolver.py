@@ -51,13 +51,14 @@ class RefResolver:
 
         :param dict specs: The parsed specs in which to resolve any references.
         :param str url: [optional] The URL to base relative references on.
-        :param dict reference_cache: [optional] Reference cache to use. When
-            encountering references, nested RefResolvers are created, and this
-            parameter is used by the RefResolver hierarchy to create only one
-            resolver per unique URL.
+        :param dict reference_cache: [optional] Reference cache to use. Fetched
+            and parsed referenced files are kept here, so that each file is
+            only read and parsed once.
             If you wish to use this optimization across distinct RefResolver
-            instances, pass a dict here for the RefResolvers you create
-            yourself. It's safe to ignore this parameter in other cases.
+            instances, pass a dict or a bounded, thread-safe
+            :py:class:`prance.util.cache.ReferenceCache` here for the
+            RefResolvers you create yourself. It's safe to ignore this
+            parameter in other cases.
         :param int recursion_limit: [optional] set the limit on recursive
             references. The default is 1, indicating that an element may be
             referred to exactly once when resolving references. When the limit
@@ -77,10 +78,46 @@ class RefResolver:
             to TRANSLATE_DEFAULT.
         :param bool strict: [optional] Whether to use strict mode or not; in
             lenient mode, malformed keys will be silently rewritten.
+        :param bool share_references: [optional] If True, each unique
+            reference target is resolved only once, and the same resolved
+            object is inlined wherever it is referenced. This saves time and
+            memory for specs with many references to the same objects, but
+            means that the resolved specs contain shared subtrees; modifying
+            one occurrence modifies all of them, and YAML serialization emits
+            them as anchors and aliases. Defaults to False.
+        :param mixed disk_cache: [optional] A persistent cache for parsed
+            referenced files; see :py:class:`prance.util.cache.DiskCache` for
+            possible values.
+        :param int prefetch_workers: [optional] If greater than zero, all
+            files referenced directly or indirectly by the specs are fetched
+            and parsed up front, using a pool of this many threads, before
+            any references get resolved. This helps when references point to
+            many files on slow file systems or remote servers. Defaults to 0,
+            i.e. files are fetched one by one as references are encountered.
+        :param HTTPFetcher fetcher: [optional] Fetch remote references with
+            this :py:class:`prance.util.url.HTTPFetcher`.
+        :param ReferenceStats reference_stats: [optional] Collect statistics
+            on each referenced object in this
+            :py:class:`prance.util.stats.ReferenceStats`.
+        :param bool intern: [optional] If True, intern mapping keys and short
+            string values of referenced files when they are parsed; see
+            :py:func:`prance.util.formats.intern_strings`. The resolved specs
+            then share these strings, as copies made while resolving do not
+            copy strings. Defaults to False.
+        :param bool freeze: [optional] If True, the specs and all referenced
+            files are frozen, see :py:mod:`prance.util.frozen`, and so are the
+            resolved specs. Frozen values are shared rather than copied while
+            resolving. Defaults to False.
         """
-        import copy
+        self.__freeze = options.get("freeze", False)
+        if self.__freeze:
+            from .frozen import freeze
+
+            self.specs = freeze(specs)
+        else:
+            import copy
 
-        self.specs = copy.deepcopy(specs)
+            self.specs = copy.deepcopy(specs)
         self.url = url
 
         self.__reclimit = options.get("recursion_limit", 1)
@@ -92,34 +129,355 @@ class RefResolver:
         self.__resolve_method = options.get("resolve_method", TRANSLATE_DEFAULT)
         self.__encoding = options.get("encoding", None)
         self.__strict = options.get("strict", True)
+        self.__share_references = options.get("share_references", False)
+        self.__prefetch_workers = options.get("prefetch_workers", 0)
+        self.__fetcher = options.get("fetcher", None)
+        self.__stats = options.get("reference_stats", None)
+        self.__intern = options.get("intern", False)
+
+        from .cache import DiskCache
+
+        self.__disk_cache = DiskCache.from_option(options.get("disk_cache", None))
+
+        # Resolved values by reference path, and the number of times the
+        # recursion limit handler was invoked. The latter determines whether
+        # a resolved value is independent of the recursion stack it was
+        # resolved with, and may therefore be shared.
+        self.__shared_values = {}
+        self.__reclimit_hits = 0
+
+        # The resources each reference in the specs depends on, directly or
+        # through further references. Each reference resolved pushes a set of
+        # dependencies here, which is merged into the enclosing reference's
+        # set when done. The dependencies of references in the specs
+        # themselves are kept, by their path, along with the reference string.
+        self.__dependencies = []
+        self.__sites = {}
 
         if self.url:
             self.parsed_url = _url.absurl(self.url)
             self._url_key = (_url.urlresource(self.parsed_url), self.__strict)
-
-            # If we have a url, we want to add ourselves to the reference cache
-            # - that creates a reference loop, but prevents child resolvers from
-            # creating a new resolver for this url.
-            if self.specs:
-                self.__reference_cache[self._url_key] = self.specs
         else:
             self.parsed_url = self._url_key = None
 
+        # References into the document itself are looked up in the specs we
+        # were given. These must not go into the reference cache, as that may
+        # be shared with other resolvers, and the specs may not even match the
+        # contents at the URL.
+        self.__root_specs = self.specs
+
         self.__soft_dereference_objs = {}
 
     def resolve_references(self):
         """Resolve JSON pointers/references in the spec."""
-        self.specs = self._resolve_partial(self.parsed_url, self.specs, ())
+        if self.__prefetch_workers and self.parsed_url:
+            self._prefetch(self.__prefetch_workers)
+
+        # The unresolved specs are kept intact, so that references into them
+        # can be resolved again by update_references().
+        changes = dict(
+            tuple(
+                self._dereferencing_iterator(self.parsed_url, self.__root_specs, (), ())
+            )
+        )
+        self.specs = self._apply_root_changes(self.__root_specs, changes)
 
         # If there are any objects collected when using TRANSLATE_EXTERNAL, add
         # them to components/schemas
         if self.__soft_dereference_objs:
-            if "components" not in self.specs:
-                self.specs["components"] = {}
-            if "schemas" not in self.specs["components"]:
-                self.specs["components"].update({"schemas": {}})
+            schemas = dict(self.specs.get("components", {}).get("schemas", {}))
+            schemas.update(self.__soft_dereference_objs)
+            self.specs = self._apply_root_changes(
+                self.specs, {("components", "schemas"): schemas}
+            )
+
+    def update_references(self, changed_urls):
+        """
+        Resolve references again after referenced files changed.
+
+        Only the references in the specs that depend on any of the changed
+        files - directly, or through other referenced files - are resolved
+        again, and only the changed files are fetched and parsed again. The
+        result replaces the `specs` member; the previous result is left
+        unmodified, and shares all unaffected parts with the new one.
+
+        This requires a previous call to `resolve_references`. It cannot be
+        used if the specs themselves changed, nor with the TRANSLATE_EXTERNAL
+        resolve method; in either case, construct a new resolver instead.
+
+        :param list changed_urls: The URLs of the files that changed.
+        :return: The number of references resolved again.
+        :rtype: int
+        :raises ValueError: If the changes cannot be applied incrementally.
+        """
+        if self.__resolve_method == TRANSLATE_EXTERNAL:
+            raise ValueError(
+                "Cannot update references resolved with TRANSLATE_EXTERNAL!"
+            )
+
+        from .cache import invalidate
+
+        changed = set()
+        for url in changed_urls:
+            parsed = _url.absurl(url)
+            resource = _url.urlresource(parsed)
+            if self.parsed_url and resource == _url.urlresource(self.parsed_url):
+                raise ValueError("Cannot update references after the specs changed!")
+            changed.add(resource)
+            invalidate(self.__reference_cache, parsed)
+
+        # Shared values may have been resolved from stale contents.
+        for ref_path, (_, deps) in tuple(self.__shared_values.items()):
+            if deps & changed:
+                del self.__shared_values[ref_path]
+
+        # References are resolved again if they depend on changed files, or
+        # are located within the value of such a reference.
+        affected = [path for path, (_, deps) in self.__sites.items() if deps & changed]
+        affected = [
+            path
+            for path in self.__sites
+            if any(path[: len(prefix)] == prefix for prefix in affected)
+        ]
+
+        changes = {}
+        for path in affected:
+            refstring, _ = self.__sites[path]
+            changes.update(
+                self._dereferencing_iterator(
+                    self.parsed_url, {"$ref": refstring}, path, ()
+                )
+            )
+
+        self.specs = self._apply_root_changes(self.specs, changes)
+        return len(affected)
+
+    def lazy_specs(self):
+        """
+        Return a view of the specs that resolves references lazily.
+
+        Instead of resolving all references up front, references in the view
+        are resolved when the value containing them is first accessed. The
+        view resolves to the same values as `resolve_references`, but only
+        the files needed for the values accessed are fetched and parsed.
+
+        Resolving references lazily does not support the TRANSLATE_EXTERNAL
+        resolve method.
+
+        :return: A read-only mapping, see :py:mod:`prance.util.lazy`.
+        :rtype: prance.util.lazy.LazyMapping
+        """
+        if self.__resolve_method == TRANSLATE_EXTERNAL:
+            raise ValueError("Cannot resolve lazily with TRANSLATE_EXTERNAL!")
+
+        from .lazy import wrap
+
+        return wrap(self, self.parsed_url, self.__root_specs)
+
+    def _lazy_dereference(self, base_url, refstring, recursions):
+        """
+        Dereference a single reference, without resolving references within.
+
+        :param mixed base_url: URL that the reference is located at.
+        :param str refstring: The reference.
+        :param tuple recursions: A recursion stack for resolving references.
+        :return: None if the reference is not to be resolved. Otherwise the
+            URL of the referenced value, the unresolved value, and the
+            recursion stack for references within the value; the latter is
+            None if the value was produced by the recursion limit handler.
+        :rtype: tuple
+        """
+        ref_url, obj_path = _url.split_url_pointer(base_url, refstring)
+        if self._skip_reference(base_url, ref_url):
+            return None
+
+        ref_path = (_url.urlresource(ref_url), obj_path)
+        next_recursions = recursions + (ref_path,)
+
+        if recursions.count(ref_path) >= self.__reclimit:
+            self.__reclimit_hits += 1
+            value = self.__reclimit_handler(self.__reclimit, ref_url, next_recursions)
+            return ref_url, value, None
+
+        return ref_url, self._lookup(ref_url, obj_path), next_recursions
+
+    def reference_graph(self):
+        """
+        Return the graph of references in the specs.
+
+        The graph is built from the unresolved specs and the files they
+        reference, which are fetched as for resolving, so the reference cache
+        is used and filled. References that would not be resolved due to the
+        `resolve_types` option are not part of the graph.
+
+        :return: The reference graph.
+        :rtype: prance.util.graph.ReferenceGraph
+        """
+        from collections import deque
+
+        from .graph import ReferenceGraph
+        from .iterators import reference_iterator
+        from .path import JSONPointer
+
+        root_resource = _url.urlresource(self.parsed_url)
+        graph = ReferenceGraph((root_resource, JSONPointer(())))
+
+        # Find all nodes first. The parsed URL of each file is kept, as that
+        # is what references within the file are relative to.
+        urls = {root_resource: self.parsed_url._replace(fragment="")}
+        pending = deque(graph.nodes)
+        while pending:
+            resource, pointer = pending.popleft()
+            base_url = urls[resource]
+            value = self._lookup(base_url, pointer)
+            for _, refstring, _ in reference_iterator(value):
+                ref_url, obj_path = _url.split_url_pointer(base_url, refstring)
+                if self._skip_reference(base_url, ref_url):
+                    continue
+                target = (_url.urlresource(ref_url), obj_path)
+                if target not in graph:
+                    urls.setdefault(target[0], ref_url._replace(fragment=""))
+                    graph.add_node(target)
+                    pending.append(target)
+
+        # Nodes may contain other nodes, so each reference is attributed to
+        # the innermost node containing it. References outside of any node
+        # are never resolved, and so are not part of the graph.
+        pointers = {}
+        for resource, pointer in graph.nodes:
+            pointers.setdefault(resource, set()).add(tuple(pointer))
+
+        for resource, contained in pointers.items():
+            base_url = urls[resource]
+            contents = self._fetch(base_url)
+            for _, refstring, item_path in reference_iterator(contents):
+                location = tuple(str(part) for part in item_path)
+                for length in range(len(location), -1, -1):
+                    if location[:length] in contained:
+                        break
+                else:
+                    continue
+
+                ref_url, obj_path = _url.split_url_pointer(base_url, refstring)
+                if self._skip_reference(base_url, ref_url):
+                    continue
+                graph.add_edge(
+                    (resource, JSONPointer(location[:length])),
+                    (_url.urlresource(ref_url), obj_path),
+                )
+
+        return graph
+
+    def dependencies(self):
+        """
+        Return the files that the references in the specs depend on.
+
+        These are all files referenced, directly or indirectly, by the
+        references resolved so far - including references that failed to
+        resolve.
+
+        :return: The resource parts of the files' URLs, see
+            :py:func:`prance.util.url.urlresource`.
+        :rtype: set
+        """
+        result = set()
+        for _, deps in self.__sites.values():
+            result |= deps
+        return result
 
-            self.specs["components"]["schemas"].update(self.__soft_dereference_objs)
+    def _apply_root_changes(self, specs, changes):
+        """Return a copy of the specs with the changes applied."""
+        from prance.util.path import path_set_many
+
+        from .frozen import is_frozen, replace_paths
+
+        if () in changes:
+            specs = changes.pop(())
+        if is_frozen(specs):
+            return replace_paths(specs, changes.items())
+        return path_set_many(specs, changes.items(), create=True, copy=True)
+
+    def _prefetch(self, workers):
+        """
+        Fetch all files the specs reference, directly or indirectly.
+
+        Fetched files end up in the reference cache, from where they are
+        taken when the references are resolved. Errors are ignored here; the
+        same errors are raised when the references are resolved, in the order
+        in which they are encountered there.
+
+        Note that files referenced by *any* part of a referenced file are
+        fetched, even if resolving would not need to visit that part.
+
+        :param int workers: The number of threads to use.
+        """
+        import contextvars
+        from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+        seen = set()
+
+        def fetch(ref_url):
+            try:
+                return self._fetch(ref_url)
+            except Exception:
+                # Errors surface again when resolving; see above.
+                return None
+
+        def submit(executor, ref_url):
+            # Run in a copy of the current context, so that observers of
+            # phase events are notified of fetches, too.
+            context = contextvars.copy_context()
+            return executor.submit(context.run, fetch, ref_url)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {
+                submit(executor, ref_url): ref_url
+                for ref_url in self._external_urls(self.parsed_url, self.specs, seen)
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    base_url = pending.pop(future)
+                    contents = future.result()
+                    if contents is None:
+                        continue
+                    for ref_url in self._external_urls(base_url, contents, seen):
+                        pending[submit(executor, ref_url)] = ref_url
+
+    def _external_urls(self, base_url, partial, seen):
+        """
+        Return the URLs of files referenced by the partial specs.
+
+        Only URLs that are to be resolved and that are not in the seen set are
+        returned; their resources are added to the seen set. References to
+        the document itself are never returned.
+
+        :param mixed base_url: URL that the partial specs is located at.
+        :param dict partial: The partial specs to search for references.
+        :param set seen: The resources of URLs already returned.
+        :return: The parsed URLs of newly found referenced files.
+        :rtype: list
+        """
+        from .iterators import reference_iterator
+
+        if self.parsed_url:
+            seen.add(_url.urlresource(self.parsed_url))
+
+        result = []
+        for _, refstring, _ in reference_iterator(partial):
+            try:
+                ref_url, _ = _url.split_url_pointer(base_url, refstring)
+                if self._skip_reference(base_url, ref_url):
+                    continue
+            except (_url.ResolutionError, ValueError, TypeError, AttributeError):
+                # Malformed references are reported when resolving.
+                continue
+
+            resource = _url.urlresource(ref_url)
+            if resource not in seen:
+                seen.add(resource)
+                result.append(ref_url)
+        return result
 
     def _dereferencing_iterator(self, base_url, partial, path, recursions):
         """
@@ -136,7 +494,7 @@ class RefResolver:
 
         for _, refstring, item_path in reference_iterator(partial):
             # Split the reference string into parsed URL and object path
-            ref_url, obj_path = _url.split_url_reference(base_url, refstring)
+            ref_url, obj_path = _url.split_url_pointer(base_url, refstring)
 
             translate = (self.__resolve_method == TRANSLATE_EXTERNAL) and (
                 self.parsed_url.path != ref_url.path
@@ -146,7 +504,7 @@ class RefResolver:
                 continue
 
             # The reference path is the url resource and object path
-            ref_path = (_url.urlresource(ref_url), tuple(obj_path))
+            ref_path = (_url.urlresource(ref_url), obj_path)
 
             # Count how often the reference path has been recursed into.
             from collections import Counter
@@ -154,20 +512,45 @@ class RefResolver:
             rec_counter = Counter(recursions)
             next_recursions = recursions + (ref_path,)
 
-            if rec_counter[ref_path] >= self.__reclimit:
-                # The referenced value may be produced by the handler, or the handler
-                # may raise, etc.
-                ref_value = self.__reclimit_handler(
-                    self.__reclimit, ref_url, next_recursions
-                )
-            else:
-                # The referenced value is to be used, but let's copy it to avoid
-                # building recursive structures.
-                ref_value = self._dereference(ref_url, obj_path, next_recursions)
-
             # Full item path
             full_path = path + item_path
 
+            deps = {ref_path[0]}
+            self.__dependencies.append(deps)
+            if self.__stats is not None:
+                self.__stats.begin()
+            resolved = False
+            try:
+                if rec_counter[ref_path] >= self.__reclimit:
+                    # The referenced value may be produced by the handler, or the
+                    # handler may raise, etc.
+                    self.__reclimit_hits += 1
+                    ref_value = self.__reclimit_handler(
+                        self.__reclimit, ref_url, next_recursions
+                    )
+                elif self.__share_references:
+                    ref_value = self._shared_dereference(
+                        ref_url, obj_path, ref_path, next_recursions
+                    )
+                else:
+                    # The referenced value is to be used, but let's copy it to
+                    # avoid building recursive structures.
+                    ref_value = self._dereference(ref_url, obj_path, next_recursions)
+                resolved = True
+            finally:
+                # Dependencies are recorded even if resolving fails, so that
+                # fixing any of the files involved can be detected.
+                self.__dependencies.pop()
+                if self.__dependencies:
+                    self.__dependencies[-1] |= deps
+                elif not recursions:
+                    self.__sites[full_path] = (refstring, deps)
+
+                if self.__stats is not None:
+                    self.__stats.end(
+                        ref_path, ref_value if resolved else None, not resolved
+                    )
+
             # First yield parent
             if translate:
                 url = self._collect_soft_refs(ref_url, obj_path, ref_value)
@@ -204,6 +587,35 @@ class RefResolver:
                 )
             )
 
+    def _shared_dereference(self, ref_url, obj_path, ref_path, recursions):
+        """
+        Dereference the URL and object path, re-using earlier results.
+
+        If the reference path was resolved before, the previously resolved
+        value is returned as-is. Otherwise, the value is dereferenced, and
+        remembered if resolving it did not run into the recursion limit. If
+        it did not, the value contains no recursions, and so resolves the
+        same no matter which recursion stack it is resolved with.
+
+        :param mixed ref_url: The URL at which the reference is located.
+        :param list obj_path: The object path within the URL resource.
+        :param tuple ref_path: The reference path, used as the cache key.
+        :param tuple recursions: A recursion stack for resolving references.
+        :return: The dereferenced value, with all internal references resolved.
+        """
+        try:
+            value, deps = self.__shared_values[ref_path]
+            self.__dependencies[-1] |= deps
+            return value
+        except KeyError:
+            pass
+
+        hits = self.__reclimit_hits
+        value = self._dereference(ref_url, obj_path, recursions)
+        if hits == self.__reclimit_hits:
+            self.__shared_values[ref_path] = (value, set(self.__dependencies[-1]))
+        return value
+
     def _dereference(self, ref_url, obj_path, recursions):
         """
         Dereference the URL and object path.
@@ -211,41 +623,74 @@ class RefResolver:
         Returns the dereferenced object.
 
         :param mixed ref_url: The URL at which the reference is located.
-        :param list obj_path: The object path within the URL resource.
+        :param list obj_path: The object path within the URL resource, e.g. a
+            JSONPointer.
         :param tuple recursions: A recursion stack for resolving references.
         :return: A copy of the dereferenced value, with all internal references
             resolved.
         """
+        value = self._lookup(ref_url, obj_path)
+
+        # Deep copy value; we don't want to create recursive structures
+        import copy
+
+        value = copy.deepcopy(value)
+
+        # Now resolve partial specs
+        value = self._resolve_partial(ref_url, value, recursions)
+
+        # That's it!
+        return value
+
+    def _lookup(self, ref_url, obj_path):
+        """
+        Return the unresolved value at the URL and object path.
+
+        :param mixed ref_url: The URL at which the reference is located.
+        :param list obj_path: The object path within the URL resource.
+        :return: The value itself, not a copy.
+        """
         # In order to start dereferencing anything in the referenced URL, we have
         # to read and parse it, of course.
-        contents = _url.fetch_url(
-            ref_url, self.__reference_cache, self.__encoding, self.__strict
-        )
+        contents = self._fetch(ref_url)
 
         # In this inner parser's specification, we can now look for the referenced
         # object.
         value = contents
         if len(obj_path) != 0:
-            from prance.util.path import path_get
+            from prance.util.path import JSONPointer
 
+            if not isinstance(obj_path, JSONPointer):
+                obj_path = JSONPointer(obj_path)
             try:
-                value = path_get(value, obj_path)
+                # Like path_get(), which this used to be, return None for empty
+                # values.
+                value = obj_path.resolve(value) or None
             except (KeyError, IndexError, TypeError) as ex:
                 raise _url.ResolutionError(
                     f'Cannot resolve reference "{ref_url.geturl()}": {str(ex)}'
                 )
-
-        # Deep copy value; we don't want to create recursive structures
-        import copy
-
-        value = copy.deepcopy(value)
-
-        # Now resolve partial specs
-        value = self._resolve_partial(ref_url, value, recursions)
-
-        # That's it!
         return value
 
+    def _fetch(self, ref_url):
+        """Return the parsed contents at the URL."""
+        if self.__root_specs and self._url_key == (
+            _url.urlresource(ref_url),
+            self.__strict,
+        ):
+            return self.__root_specs
+
+        return _url.fetch_url(
+            ref_url,
+            self.__reference_cache,
+            self.__encoding,
+            self.__strict,
+            disk_cache=self.__disk_cache,
+            fetcher=self.__fetcher,
+            intern=self.__intern,
+            freeze=self.__freeze,
+        )
+
     def _resolve_partial(self, base_url, partial, recursions):
         """
         Resolve a (partial) spec's references.
@@ -256,22 +701,29 @@ class RefResolver:
         :return: The partial with all references resolved.
         """
         # Gather changes from the dereferencing iterator - we need to set new
-        # values from the outside in, so we have to post-process this a little,
-        # sorting paths by path length.
+        # values from the outside in, which path_set_many() takes care of.
         changes = dict(
             tuple(self._dereferencing_iterator(base_url, partial, (), recursions))
         )
 
-        paths = sorted(changes.keys(), key=len)
+        # A change at the empty path replaces the partial itself; everything
+        # else is set within it, shorter paths first.
+        if () in changes:
+            partial = changes.pop(())
 
-        # With the paths sorted, set them to the resolved values.
-        from prance.util.path import path_set
+        # Frozen partials are shared, e.g. with the reference cache, and not
+        # copied by _dereference(); changes are applied to a copy instead.
+        from .frozen import is_frozen, replace_paths
 
-        for path in paths:
-            value = changes[path]
-            if len(path) == 0:
-                partial = value
-            else:
-                path_set(partial, list(path), value, create=True)
+        if is_frozen(partial):
+            if changes:
+                partial = replace_paths(partial, changes.items())
+            return partial
+
+        from prance.util.path import path_set_many
 
-        return partial
+        # With shared references, the values set may be shared with other
+        # places they are inlined in; changes within them must not leak there.
+        return path_set_many(
+            partial, changes.items(), create=True, copy=self.__share_references
+        )
@@ -0,0 +1,201 @@
+"""This submodule contains statistics on resolving references."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+#: The keys statistics can be sorted by.
+SORT_KEYS = ("inlined", "time", "self_time", "nodes", "bytes")
+
+
+def _measure(value):
+    """
+    Return the approximate size of a resolved value.
+
+    :return: The number of nodes, i.e. of mappings, sequences and scalars in
+        the value, and the length of its compact JSON serialization. Both are
+        None for values containing themselves.
+    :rtype: tuple
+    """
+    import json
+
+    try:
+        size = len(json.dumps(value, separators=(",", ":"), default=str))
+    except ValueError:
+        # Circular reference; the value is not finite when serialized.
+        return None, None
+
+    from collections.abc import Mapping, Sequence
+
+    nodes = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        nodes += 1
+        if isinstance(item, Mapping):
+            stack.extend(item.values())
+        elif isinstance(item, Sequence) and not isinstance(item, (str, bytes)):
+            stack.extend(item)
+    return nodes, size
+
+
+class ReferenceStats:
+    """
+    Collect statistics on the references a RefResolver resolves.
+
+    Pass an instance as the `reference_stats` option to
+    :py:class:`prance.util.resolver.RefResolver` or the resolving parsers.
+    For each referenced object, identified by its URL resource and object
+    path as in :py:class:`prance.util.graph.ReferenceGraph`, it counts:
+
+    - `inlined`: How often the object was inlined.
+    - `time`: The time spent dereferencing it, in seconds, including the
+      time spent on references within it.
+    - `self_time`: The same, excluding the time spent on references within
+      it.
+    - `nodes`: The number of mappings, sequences and scalars inlined, in
+      total.
+    - `bytes`: The length of the inlined values' compact JSON serialization,
+      in total; an approximation of what the object adds to the output.
+    - `failed`: How often dereferencing the object failed.
+
+    Sizes include the references resolved within the object. With the
+    `share_references` option, references within a shared object are only
+    dereferenced, and therefore counted, once. Measuring sizes takes time
+    proportional to the size of the output, so resolving takes longer when
+    collecting statistics.
+    """
+
+    def __init__(self):
+        """Construct an empty collection."""
+        self.__targets = {}
+        self.__sizes = {}
+        self.__stack = []
+
+    def __len__(self):
+        return len(self.__targets)
+
+    def begin(self):
+        """Notify the collection that dereferencing starts."""
+        import time
+
+        self.__stack.append([time.perf_counter(), 0.0])
+
+    def end(self, target, value=None, failed=False):
+        """
+        Notify the collection that dereferencing ended.
+
+        Calls to `begin()` and `end()` must be paired, and may be nested.
+
+        :param tuple target: The referenced object, a tuple of the URL
+            resource and the object path.
+        :param mixed value: [optional] The resolved value.
+        :param bool failed: [optional] Whether dereferencing failed. If so,
+            the value is ignored.
+        """
+        import time
+
+        start, children = self.__stack.pop()
+        duration = time.perf_counter() - start
+        if self.__stack:
+            self.__stack[-1][1] += duration
+
+        entry = self.__targets.get(target, None)
+        if entry is None:
+            entry = {
+                "inlined": 0,
+                "time": 0.0,
+                "self_time": 0.0,
+                "nodes": 0,
+                "bytes": 0,
+                "failed": 0,
+            }
+            self.__targets[target] = entry
+
+        entry["time"] += duration
+        entry["self_time"] += duration - children
+        if failed:
+            entry["failed"] += 1
+            return
+
+        # Shared references inline the same value many times; measure it only
+        # once. The value is kept, so that its id is not reused.
+        sizes = self.__sizes.get(id(value), None)
+        if sizes is None:
+            sizes = (value, _measure(value))
+            self.__sizes[id(value)] = sizes
+        nodes, size = sizes[1]
+
+        entry["inlined"] += 1
+        if nodes is not None:
+            entry["nodes"] += nodes
+            entry["bytes"] += size
+
+    @property
+    def targets(self):
+        """The statistics of each referenced object, by object."""
+        return {target: dict(entry) for target, entry in self.__targets.items()}
+
+    def top(self, limit=None, sort="bytes"):
+        """
+        Return the referenced objects with the highest statistics.
+
+        :param int limit: [optional] The number of objects to return. Defaults
+            to all of them.
+        :param str sort: [optional] The statistic to sort by, one of
+            `SORT_KEYS`. Defaults to "bytes".
+        :return: Tuples of the objects and their statistics, highest first.
+        :rtype: list
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Cannot sort by {sort!r}; use one of {SORT_KEYS}!")
+
+        result = sorted(
+            self.targets.items(), key=lambda item: item[1][sort], reverse=True
+        )
+        if limit is not None:
+            result = result[:limit]
+        return result
+
+    def to_dict(self, limit=None, sort="bytes"):
+        """
+        Return the statistics as a dict, e.g. for serializing to JSON.
+
+        Objects are given as strings, see
+        :py:func:`prance.util.graph.node_id`. See `top()` for the parameters.
+
+        :rtype: dict
+        """
+        from .graph import node_id
+
+        return {
+            "references": [
+                dict(target=node_id(target), **entry)
+                for target, entry in self.top(limit, sort)
+            ],
+        }
+
+    def format(self, limit=None, sort="bytes"):
+        """
+        Return the statistics as a table.
+
+        See `top()` for the parameters.
+
+        :rtype: str
+        """
+        from .graph import node_id
+
+        lines = [
+            f"{'inlined':>8} {'time [s]':>9} {'self [s]':>9} {'nodes':>9} "
+            f"{'bytes':>11}  reference"
+        ]
+        for target, entry in self.top(limit, sort):
+            failed = f" ({entry['failed']} failed)" if entry["failed"] else ""
+            lines.append(
+                f"{entry['inlined']:>8} {entry['time']:>9.4f} "
+                f"{entry['self_time']:>9.4f} {entry['nodes']:>9} "
+                f"{entry['bytes']:>11}  {node_id(target)}{failed}"
+            )
+        return "\n".join(lines)
@@ -103,10 +103,14 @@ class _RefTranslator:
         # object.
         value = contents
         if len(obj_path) != 0:
-            from prance.util.path import path_get
+            from prance.util.path import JSONPointer
 
+            if not isinstance(obj_path, JSONPointer):
+                obj_path = JSONPointer(obj_path)
             try:
-                value = path_get(value, obj_path)
+                # Like path_get(), which this used to be, return None for empty
+                # values.
+                value = obj_path.resolve(value) or None
             except (KeyError, IndexError, TypeError) as ex:
                 raise _url.ResolutionError(
                     f'Cannot resolve reference "{ref_url.geturl()}": {str(ex)}'
@@ -126,16 +130,12 @@ class _RefTranslator:
     def _translate_partial(self, base_url, partial):
         changes = dict(tuple(self._translating_iterator(base_url, partial, ())))
 
-        paths = sorted(changes.keys(), key=len)
+        if () in changes:
+            partial = changes.pop(())
 
-        from prance.util.path import path_set
+        from prance.util.path import path_set_many
 
-        for path in paths:
-            value = changes[path]
-            if len(path) == 0:
-                partial = value
-            else:
-                path_set(partial, list(path), value, create=True)
+        path_set_many(partial, changes.items(), create=True)
 
         return partial
 
@@ -143,7 +143,7 @@ class _RefTranslator:
         from prance.util.iterators import reference_iterator
 
         for _, ref_string, item_path in reference_iterator(partial):
-            ref_url, obj_path = _url.split_url_reference(base_url, ref_string)
+            ref_url, obj_path = _url.split_url_pointer(base_url, ref_string)
             full_path = path + item_path
 
             if ref_url.path == self.url.path:
@@ -6,6 +6,7 @@ __license__ = "MIT"
 __all__ = ()
 
 
+import functools
 from urllib import parse
 
 
@@ -13,6 +14,7 @@ class ResolutionError(LookupError):
     pass
 
 
+@functools.lru_cache(maxsize=4096)
 def urlresource(url):
     """
     Return the resource part of a parsed URL.
@@ -39,12 +41,46 @@ def absurl(url, relative_to=None):
     Non-file URLs are left untouched. URLs without scheme are assumed to be file
     URLs.
 
+    Results are cached; the cache assumes that the file system links involved
+    do not change. Call `absurl.cache_clear()` if they do.
+
     :param str/tuple url: The input URL.
     :param str/tuple relative_to: [optional] The URL to which the input URL is
         relative.
     :return: The output URL, parsed into components.
     :rtype: tuple
     """
+    # The fragment does not influence the rest of the result, so split it off.
+    # That way, all references into the same file share cache entries.
+    if isinstance(url, str):
+        url, _, fragment = url.partition("#")
+    else:
+        fragment = url.fragment
+        url = url._replace(fragment="")
+    if isinstance(relative_to, tuple) and relative_to.fragment:
+        relative_to = relative_to._replace(fragment="")
+
+    # Fragment-only references point into the reference URL itself. There is
+    # no need to look at the file system for those.
+    if not url and isinstance(relative_to, tuple) and relative_to.path:
+        return relative_to._replace(fragment=fragment)
+
+    # Relative reference paths would be resolved relative to the current
+    # working directory, so results are only cached for absolute ones.
+    if relative_to is None or (
+        isinstance(relative_to, tuple) and relative_to.path.startswith("/")
+    ):
+        result = _cached_absurl(url, relative_to)
+    else:
+        result = _absurl(url, relative_to)
+
+    if fragment:
+        result = result._replace(fragment=fragment)
+    return result
+
+
+def _absurl(url, relative_to):
+    """Implement `absurl` for URLs without fragment."""
     # Parse input URL, if necessary
     parsed = url
     if not isinstance(parsed, tuple):
@@ -116,6 +152,14 @@ def absurl(url, relative_to=None):
     return result
 
 
+@functools.lru_cache(maxsize=4096)
+def _cached_absurl(url, relative_to):
+    return _absurl(url, relative_to)
+
+
+absurl.cache_clear = _cached_absurl.cache_clear
+
+
 def split_url_reference(base_url, reference):
     """
     Return a normalized, parsed URL and object path.
@@ -129,26 +173,151 @@ def split_url_reference(base_url, reference):
     :param str reference: A JSON reference string.
     :return: The parsed absolute URL of the reference and the object path.
     """
-    # Parse URL
+    parsed_url, pointer = split_url_pointer(base_url, reference)
+    return parsed_url, list(pointer)
+
+
+def split_url_pointer(base_url, reference):
+    """
+    Return a normalized, parsed URL and JSON pointer.
+
+    Same as split_url_reference(), except that the object path is returned
+    as a :py:class:`prance.util.path.JSONPointer`, which is parsed only once
+    per distinct reference.
+
+    :param mixed base_url: A parsed URL.
+    :param str reference: A JSON reference string.
+    :return: The parsed absolute URL of the reference and the JSON pointer.
+    """
+    from .path import JSONPointer
+
     parsed_url = absurl(reference, base_url)
+    return parsed_url, JSONPointer.parse(parsed_url.fragment)
+
+
+class HTTPFetcher:
+    """
+    Fetch remote URLs via a shared HTTP session.
+
+    By default, prance fetches each remote URL with a separate request, which
+    means a new connection each time. A fetcher instead keeps a pool of
+    connections open, and applies timeouts and a retry policy to all requests.
+    Pass it as the `fetcher` option to the parsers, or as the `fetcher`
+    parameter to `fetch_url_text()` and `fetch_url()`.
+
+    If given a disk cache, responses carrying an `ETag` or `Last-Modified`
+    header are kept there, and later requests for the same URL are made
+    conditional. If the server responds that the content is unchanged, the
+    cached content is used.
+    """
+
+    def __init__(self, **kwargs):
+        """
+        Construct a fetcher.
+
+        :param int pool_size: [optional] The maximum number of connections to
+            keep open per host. Defaults to 10.
+        :param float timeout: [optional] Timeout for connecting and reading, in
+            seconds. Defaults to 30.
+        :param int retries: [optional] How often to retry failed connections
+            and server errors. Defaults to 3.
+        :param float backoff_factor: [optional] Factor for the exponential
+            back-off between retries. Defaults to 0.5.
+        :param mixed disk_cache: [optional] A persistent cache for conditional
+            requests; see :py:class:`prance.util.cache.DiskCache` for possible
+            values. Defaults to None.
+        :param requests.Session session: [optional] The session to use. If
+            given, the pool and retry options are applied to it.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        pool_size = kwargs.get("pool_size", 10)
+        retry = Retry(
+            total=kwargs.get("retries", 3),
+            backoff_factor=kwargs.get("backoff_factor", 0.5),
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+
+        self.session = kwargs.get("session", None) or requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.timeout = kwargs.get("timeout", 30)
+
+        from .cache import DiskCache
+
+        self.disk_cache = DiskCache.from_option(kwargs.get("disk_cache", None))
+
+    def fetch(self, url):
+        """
+        Fetch the URL.
+
+        :param tuple url: The url, parsed as returned by `absurl`.
+        :return: The resource text of the URL, and the content type.
+        :rtype: tuple
+        """
+        target = url._replace(fragment="").geturl()
+
+        # Make the request conditional if we have cached content.
+        cache_key = None
+        entry = None
+        headers = {}
+        if self.disk_cache is not None:
+            cache_key = self.disk_cache.key("http", target)
+            entry = self.disk_cache.get(cache_key)
+            if entry is not None:
+                if entry["etag"]:
+                    headers["If-None-Match"] = entry["etag"]
+                if entry["last_modified"]:
+                    headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self.session.get(target, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and entry is not None:
+            return entry["content"], entry["content_type"]
+
+        if not response.ok:
+            raise ResolutionError(
+                'Cannot fetch URL "%s": %d %s'
+                % (url.geturl(), response.status_code, response.reason)
+            )
+        content_type = response.headers.get("content-type", "text/plain")
+        content = response.text
+
+        etag = response.headers.get("etag", None)
+        last_modified = response.headers.get("last-modified", None)
+        if cache_key is not None and (etag or last_modified):
+            self.disk_cache.set(
+                cache_key,
+                {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "content": content,
+                    "content_type": content_type,
+                },
+            )
 
-    # Grab object path
-    obj_path = parsed_url.fragment.split("/")
-    while len(obj_path) and not obj_path[0]:
-        obj_path = obj_path[1:]
+        return content, content_type
 
-    # Normalize the object path by substituting ~1 and ~0 respectively.
-    def _normalize(path):
-        path = path.replace("~1", "/")
-        path = path.replace("~0", "~")
-        return path
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
 
-    obj_path = [_normalize(p) for p in obj_path]
+    def __enter__(self):
+        return self
 
-    return parsed_url, obj_path
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
 
 
-def fetch_url_text(url, cache={}, encoding=None):
+def fetch_url_text(url, cache=None, encoding=None, fetcher=None):
     """
     Fetch the URL.
 
@@ -161,12 +330,18 @@ def fetch_url_text(url, cache={}, encoding=None):
 
     :param tuple url: The url, parsed as returned by `absurl` above.
     :param Mapping cache: An optional cache. If the URL can be found in the
-      cache, return the cache contents.
+      cache, return the cache contents. See also
+      :py:class:`prance.util.cache.ReferenceCache`.
     :param str encoding: Provide an encoding for local URLs to override
       encoding detection, if desired. Defaults to None.
+    :param HTTPFetcher fetcher: Fetch remote URLs with this fetcher, if
+      given. Any object with a compatible `fetch()` method may be used.
     :return: The resource text of the URL, and the content type.
     :rtype: tuple
     """
+    if cache is None:
+        cache = {}
+
     url_key = "text_" + urlresource(url)
     entry = cache.get(url_key, None)
     if entry is not None:
@@ -176,46 +351,111 @@ def fetch_url_text(url, cache={}, encoding=None):
     # non-file schemes, or throw otherwise.
     content = None
     content_type = None
-    if url.scheme in (None, "", "file"):
-        from .fs import read_file, from_posix
+    from .events import phase
+
+    with phase("fetch", url=url._replace(fragment="").geturl()):
+        if url.scheme in (None, "", "file"):
+            from .fs import read_file, from_posix
+
+            try:
+                content = read_file(from_posix(url.path), encoding)
+            except FileNotFoundError as ex:
+                from .exceptions import raise_from
+
+                raise_from(ResolutionError, ex, f"File not found: {url.path}")
+        elif url.scheme == "python":
+            # Resolve package path
+            package = url.netloc
+            path = url.path
+            if path[0] == "/":
+                path = path[1:]
+
+            from importlib.resources import files
+
+            path = files(package).joinpath(path)
+
+            from .fs import read_file, from_posix
+
+            content = read_file(from_posix(path), encoding)
+        elif fetcher is not None:
+            content, content_type = fetcher.fetch(url)
+        else:
+            import requests
+
+            response = requests.get(url.geturl())
+            if not response.ok:  # pragma: nocover
+                raise ResolutionError(
+                    'Cannot fetch URL "%s": %d %s'
+                    % (url.geturl(), response.status_code, response.reason)
+                )
+            content_type = response.headers.get("content-type", "text/plain")
+            content = response.text
 
-        try:
-            content = read_file(from_posix(url.path), encoding)
-        except FileNotFoundError as ex:
-            from .exceptions import raise_from
+    cache[url_key] = (content, content_type)
+    return content, content_type
 
-            raise_from(ResolutionError, ex, f"File not found: {url.path}")
-    elif url.scheme == "python":
-        # Resolve package path
-        package = url.netloc
-        path = url.path
-        if path[0] == "/":
-            path = path[1:]
 
-        from importlib.resources import files
+def _file_cache_key(url, encoding, strict):
+    """
+    Return a disk cache key for local file URLs, or None for other URLs.
 
-        path = files(package).joinpath(path)
+    The key is derived from the file's path, modification time and size, so
+    the file does not need to be read to look up its entry.
+    """
+    if url.scheme not in (None, "", "file"):
+        return None
 
-        from .fs import read_file, from_posix
+    import os
+    from .fs import from_posix
+    from .cache import DiskCache
 
-        content = read_file(from_posix(path), encoding)
-    else:
-        import requests
+    try:
+        stat = os.stat(from_posix(url.path))
+    except OSError:
+        return None
+    return DiskCache.key(
+        "file", url.path, stat.st_mtime_ns, stat.st_size, encoding, strict
+    )
 
-        response = requests.get(url.geturl())
-        if not response.ok:  # pragma: nocover
-            raise ResolutionError(
-                'Cannot fetch URL "%s": %d %s'
-                % (url.geturl(), response.status_code, response.reason)
-            )
-        content_type = response.headers.get("content-type", "text/plain")
-        content = response.text
 
-    cache[url_key] = (content, content_type)
-    return content, content_type
+def _prepare(result, intern, freeze):
+    """Intern strings in and freeze parse results, as requested."""
+    if intern:
+        from .formats import intern_strings
 
+        result = intern_strings(result)
+    if freeze:
+        from .frozen import freeze as freeze_value
 
-def fetch_url(url, cache={}, encoding=None, strict=True):
+        result = freeze_value(result)
+    return result
+
+
+def _cached_copy(entry, freeze):
+    """
+    Return a cache entry as requested.
+
+    Frozen entries need no copy, unless plain results are requested.
+    """
+    from .frozen import freeze as freeze_value, is_frozen, thaw
+
+    if freeze:
+        return freeze_value(entry)
+    if is_frozen(entry):
+        return thaw(entry)
+    return entry.copy()
+
+
+def fetch_url(
+    url,
+    cache=None,
+    encoding=None,
+    strict=True,
+    disk_cache=None,
+    fetcher=None,
+    intern=False,
+    freeze=False,
+):
     """
     Fetch the URL and parse the contents.
 
@@ -224,20 +464,64 @@ def fetch_url(url, cache={}, encoding=None, strict=True):
 
     :param tuple url: The url, parsed as returned by `absurl` above.
     :param Mapping cache: An optional cache. If the URL can be found in the
-      cache, return the cache contents.
+      cache, return the cache contents. See also
+      :py:class:`prance.util.cache.ReferenceCache`.
     :param str encoding: Provide an encoding for local URLs to override
       encoding detection, if desired. Defaults to None.
+    :param DiskCache disk_cache: An optional persistent cache for parse
+      results, see :py:class:`prance.util.cache.DiskCache`. Local files are
+      looked up by path, modification time and size, other URLs by a hash of
+      their content.
+    :param HTTPFetcher fetcher: Fetch remote URLs with this fetcher, if
+      given.
+    :param bool intern: If True, intern mapping keys and short string values
+      of newly parsed files, and of those from the disk cache; see
+      :py:func:`prance.util.formats.intern_strings`. Files already in the
+      cache are returned as they are. Defaults to False.
+    :param bool freeze: If True, return the parsed file frozen, see
+      :py:mod:`prance.util.frozen`. Frozen files are kept frozen in the
+      cache, so that they can be shared without copying. Defaults to False.
     :return: The parsed file.
     :rtype: dict
     """
+    if cache is None:
+        cache = {}
+
     # Return from cache, if parsed result is already present.
     url_key = (urlresource(url), strict)
     entry = cache.get(url_key, None)
     if entry is not None:
-        return entry.copy()
+        return _cached_copy(entry, freeze)
+
+    # Return from the disk cache, if we can determine the key without fetching
+    # the URL first.
+    disk_key = None
+    if disk_cache is not None:
+        disk_key = _file_cache_key(url, encoding, strict)
+        if disk_key is not None:
+            result = disk_cache.get(disk_key)
+            if result is not None:
+                result = _prepare(result, intern, freeze)
+                cache[url_key] = result
+                return result.copy()
 
     # Fetch URL text
-    content, content_type = fetch_url_text(url, cache, encoding=encoding)
+    content, content_type = fetch_url_text(
+        url, cache, encoding=encoding, fetcher=fetcher
+    )
+
+    # Other URLs are looked up by their content instead.
+    if disk_cache is not None and disk_key is None:
+        import hashlib
+        from .cache import DiskCache
+
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        disk_key = DiskCache.key("content", digest, content_type, url.path, strict)
+        result = disk_cache.get(disk_key)
+        if result is not None:
+            result = _prepare(result, intern, freeze)
+            cache[url_key] = result
+            return result.copy()
 
     # Parse the result
     from .formats import parse_spec
@@ -250,6 +534,10 @@ def fetch_url(url, cache={}, encoding=None, strict=True):
 
         result = stringify_keys(result)
 
-    # Cache and return result
+    # Cache and return result. Strings are interned after keys are stringified,
+    # so that these are interned, too.
+    if disk_cache is not None:
+        disk_cache.set(disk_key, result)
+    result = _prepare(result, intern, freeze)
     cache[url_key] = result
     return result.copy()
@@ -0,0 +1,146 @@
+"""
+This submodule contains a cache of validation backend validators.
+
+Constructing a backend validator involves importing the backend, loading the
+OpenAPI meta-schemas and building a JSON schema validator for them. That is a
+considerable fixed cost when validating small specs, so validators are built
+once per backend and spec version, and shared by all parsers.
+"""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+import threading
+
+# Spec versions each backend can validate, as (major, minor) tuples.
+SPEC_VERSIONS = {
+    "flex": ((2, 0),),
+    "swagger-spec-validator": ((2, 0),),
+    "openapi-spec-validator": ((2, 0), (3, 0), (3, 1)),
+}
+
+_VALIDATORS = {}
+_LOCK = threading.Lock()
+
+
+def _build_flex(major, minor):  # pragma: nocover
+    from flex.core import parse
+
+    return parse
+
+
+def _build_swagger_spec_validator(major, minor):  # pragma: nocover
+    from swagger_spec_validator.common import read_resource_file
+    from swagger_spec_validator.validator20 import validate_spec
+
+    # The backend caches the meta-schema once read.
+    read_resource_file("schemas/v2.0/schema.json")
+    return validate_spec
+
+
+def _build_openapi_spec_validator(major, minor):  # pragma: nocover
+    from openapi_spec_validator import validate
+    from openapi_spec_validator.validation import (
+        OpenAPIV2SpecValidator,
+        OpenAPIV30SpecValidator,
+        OpenAPIV31SpecValidator,
+    )
+
+    classes = {
+        (2, 0): OpenAPIV2SpecValidator,
+        (3, 0): OpenAPIV30SpecValidator,
+        (3, 1): OpenAPIV31SpecValidator,
+    }
+    cls = classes.get((major, minor), None)
+    if cls is None:
+        # Let the backend detect the version and report what it makes of it.
+        return validate
+
+    # The meta-schema validator is built lazily on first use; validating an
+    # empty document forces it to be built, along with its schema registry.
+    cls.schema_validator.is_valid({})
+
+    from jsonschema_path import SchemaPath
+
+    def validator(spec):
+        return cls(SchemaPath.from_dict(spec)).validate()
+
+    return validator
+
+
+_BUILDERS = {
+    "flex": _build_flex,
+    "swagger-spec-validator": _build_swagger_spec_validator,
+    "openapi-spec-validator": _build_openapi_spec_validator,
+}
+
+
+def get_validator(backend, major, minor=0):
+    """
+    Return the validator for the backend and spec version.
+
+    The validator is built on first use, and cached for all later calls.
+
+    :param str backend: The validation backend, see
+        :py:func:`prance.util.validation_backends`.
+    :param int major: The major spec version.
+    :param int minor: [optional] The minor spec version. Defaults to 0.
+    :return: A callable validating a spec, raising the backend's exceptions
+        for invalid specs.
+    :rtype: callable
+    """
+    key = (backend, major, minor)
+    validator = _VALIDATORS.get(key, None)
+    if validator is not None:
+        return validator
+
+    with _LOCK:
+        validator = _VALIDATORS.get(key, None)
+        if validator is None:
+            try:
+                builder = _BUILDERS[backend]
+            except KeyError:
+                raise ValueError(f'Unknown validation backend "{backend}"!')
+            validator = builder(major, minor)
+            _VALIDATORS[key] = validator
+    return validator
+
+
+def warm_up(backends=None, versions=None):
+    """
+    Build validators ahead of time.
+
+    Services validating specs on request can call this at startup, so that
+    the first requests do not pay for building validators.
+
+    :param list backends: [optional] The backends to build validators for.
+        Defaults to all installed backends.
+    :param list versions: [optional] The (major, minor) spec versions to build
+        validators for. Defaults to all versions the backends support;
+        versions a backend does not support are skipped.
+    :return: The (backend, major, minor) keys of the validators built.
+    :rtype: list
+    """
+    if backends is None:
+        from . import validation_backends
+
+        backends = validation_backends()
+
+    built = []
+    for backend in backends:
+        supported = SPEC_VERSIONS.get(backend, ())
+        for major, minor in versions or supported:
+            if (major, minor) not in supported:
+                continue
+            get_validator(backend, major, minor)
+            built.append((backend, major, minor))
+    return built
+
+
+def clear():
+    """Discard all cached validators."""
+    with _LOCK:
+        _VALIDATORS.clear()
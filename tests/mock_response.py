@@ -17,6 +17,8 @@ class MockResponse:
 
     def __init__(self, *args, **kwargs):
         self.ok = kwargs.get("is_ok", True)
+        self.status_code = kwargs.get("status_code", 200 if self.ok else 500)
+        self.reason = kwargs.get("reason", "OK" if self.ok else "Error")
         self.headers = kwargs.get("headers", {"content-type": "text/plain"})
         self.text = kwargs.get("text", "")
 
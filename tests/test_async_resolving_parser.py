@@ -0,0 +1,143 @@
+"""Test suite for prance.AsyncResolvingParser and prance.util.aio ."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from prance import AsyncResolvingParser
+from prance import ResolvingParser
+from prance.util import aio
+from prance.util import fs
+from prance.util import url
+
+from . import none_of
+
+
+class MockRemoteFetcher(aio.AsyncFetcher):
+    def __init__(self):
+        self.fetched = []
+        self.closed = False
+
+    async def fetch(self, url):
+        from .mock_response import PETSTORE_YAML
+
+        self.fetched.append(url.geturl())
+        await asyncio.sleep(0)
+        return PETSTORE_YAML, "text/plain"
+
+    async def close(self):
+        self.closed = True
+
+
+def mock_get_petstore(*args, **kwargs):
+    from .mock_response import MockResponse, PETSTORE_YAML
+
+    return MockResponse(text=PETSTORE_YAML)
+
+
+def test_local_fetcher():
+    fetcher = aio.LocalFetcher()
+    parsed = url.absurl(fs.abspath("tests/specs/petstore.yaml"))
+    content, content_type = asyncio.run(fetcher.fetch(parsed))
+    assert content.startswith("swagger")
+    assert content_type is None
+
+
+def test_default_fetcher_dispatch():
+    remote = MockRemoteFetcher()
+    fetcher = aio.DefaultFetcher(remote=remote)
+
+    async def run():
+        local = await fetcher.fetch(url.absurl("python://tests/specs/petstore.yaml"))
+        remote = await fetcher.fetch(url.absurl("http://example.com/foo.yaml"))
+        await fetcher.close()
+        return local, remote
+
+    local_result, remote_result = asyncio.run(run())
+    assert local_result[0].startswith("swagger")
+    assert remote_result[1] == "text/plain"
+    assert remote.fetched == ["http://example.com/foo.yaml"]
+    assert remote.closed
+
+
+def test_parser_is_always_lazy():
+    parser = AsyncResolvingParser("tests/specs/petstore.yaml", lazy=False)
+    assert parser.specification is None
+
+
+@pytest.mark.skipif(
+    none_of("openapi-spec-validator", "swagger-spec-validator", "flex"),
+    reason="Missing backends",
+)
+@patch("requests.get")
+def test_same_result_as_resolving_parser(mock_get):
+    mock_get.side_effect = mock_get_petstore
+    expected = ResolvingParser("tests/specs/with_externals.yaml")
+
+    # All fetching must go through the async fetcher.
+    mock_get.side_effect = AssertionError("Synchronous fetch!")
+    remote = MockRemoteFetcher()
+    parser = AsyncResolvingParser(
+        "tests/specs/with_externals.yaml",
+        async_fetcher=aio.DefaultFetcher(remote=remote),
+    )
+    asyncio.run(parser.parse())
+
+    assert parser.valid
+    assert parser.version == expected.version
+    assert parser.specification == expected.specification
+    assert len(remote.fetched) == 1
+    assert remote.fetched[0].startswith(
+        "http://finkhaeuser.de/projects/prance/petstore.yaml"
+    )
+
+
+@pytest.mark.skipif(
+    none_of("openapi-spec-validator", "swagger-spec-validator", "flex"),
+    reason="Missing backends",
+)
+def test_concurrent_parsers():
+    async def parse(name):
+        parser = AsyncResolvingParser(
+            name, async_fetcher=aio.DefaultFetcher(remote=MockRemoteFetcher())
+        )
+        await parser.parse()
+        return parser
+
+    async def run():
+        return await asyncio.gather(
+            parse("tests/specs/petstore.yaml"),
+            parse("tests/specs/recursive_files.yaml"),
+            parse_string(),
+        )
+
+    async def parse_string():
+        with open("tests/specs/petstore.yaml") as handle:
+            parser = AsyncResolvingParser(spec_string=handle.read())
+        await parser.parse()
+        return parser
+
+    parsers = asyncio.run(run())
+    for parser in parsers:
+        assert parser.valid
+
+
+@pytest.mark.skipif(
+    none_of("openapi-spec-validator", "swagger-spec-validator", "flex"),
+    reason="Missing backends",
+)
+def test_missing_reference():
+    from prance.util.url import ResolutionError
+
+    parser = AsyncResolvingParser(
+        "tests/specs/missing_reference.yaml",
+        async_fetcher=aio.DefaultFetcher(remote=MockRemoteFetcher()),
+    )
+    with pytest.raises(ResolutionError):
+        asyncio.run(parser.parse())
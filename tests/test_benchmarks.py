@@ -0,0 +1,62 @@
+"""Test suite for the benchmarks."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+import pytest
+
+from benchmarks import generate, run
+
+from . import none_of
+
+
+def test_generate_deterministic():
+    first = generate.generate_specs(paths=5, schemas=7, fanout=3, depth=2, files=2)
+    second = generate.generate_specs(paths=5, schemas=7, fanout=3, depth=2, files=2)
+    assert first == second
+    assert sorted(first) == ["openapi.yaml", "schemas_0.yaml", "schemas_1.yaml"]
+    assert sorted(first["schemas_1.yaml"]) == ["Schema1", "Schema3", "Schema5"]
+
+    with pytest.raises(ValueError):
+        generate.generate_specs(schemas=0)
+
+
+def test_generate_shape(tmpdir):
+    from prance.util import formats, fs
+    from prance.util.resolver import RefResolver
+
+    filename = generate.generate(
+        str(tmpdir), paths=4, schemas=7, fanout=2, depth=1, recursive=True, files=2
+    )
+    specs = formats.parse_spec(fs.read_file(filename), filename)
+    graph = RefResolver(specs, fs.abspath(filename)).reference_graph()
+
+    # The first schema references two others, and each schema without
+    # children references the first one.
+    first = ("Schema0",)
+    schema0 = [node for node in graph.nodes if tuple(node[1]) == first][0]
+    assert len(graph.targets(schema0)) == 2
+    assert [schema0] in [cycle[:1] for cycle in graph.cycles()]
+    assert len(graph.cycles()[0]) == 7
+
+
+@pytest.mark.skipif(none_of("openapi-spec-validator"), reason="Missing backends")
+def test_run():
+    results = run.run(
+        [3],
+        files=2,
+        repeat=2,
+        memory=True,
+        backend="openapi-spec-validator",
+    )
+
+    phases = [result["phase"] for result in results]
+    assert phases == [phase for phase in run.PHASES if phase != "BaseParser"]
+    for result in results:
+        assert 0 < result["best"] <= result["first"]
+        assert result["peak_memory"] > 0
+
+    table = run.format_results(results)
+    assert len(table.splitlines()) == len(results) + 1
@@ -54,6 +54,77 @@ Validates OK as Swagger/OpenAPI 2.0!
     assert result.output == expected
 
 
+@pytest.mark.skipif(none_of("click"), reason="Click does not exist")
+def test_validate_cache_dir(runner, tmpdir):
+    from prance import cli
+
+    import shutil
+
+    fname = str(tmpdir.join("petstore.yaml"))
+    shutil.copyfile("tests/specs/petstore.yaml", fname)
+
+    cache_dir = str(tmpdir.join("cache"))
+    for _ in range(2):
+        result = runner.invoke(cli.validate, ["--cache-dir", cache_dir, fname])
+        assert result.exit_code == 0
+        assert "Validates OK" in result.output
+
+    import os
+
+    assert os.listdir(cache_dir)
+
+
+@pytest.mark.skipif(none_of("click"), reason="Click does not exist")
+def test_validate_jobs(runner):
+    from prance import cli
+
+    result = runner.invoke(
+        cli.validate,
+        [
+            "--jobs",
+            "2",
+            "tests/specs/petstore.yaml",
+            "tests/specs/definitions.yaml",
+            "tests/specs/petstore.yaml",
+        ],
+    )
+    assert result.exit_code == 1
+    assert '"tests/specs/petstore.yaml" validates OK' in result.output
+    assert 'ERROR in "tests/specs/definitions.yaml"' in result.output
+    assert "Validated 3 specs: 2 OK, 1 failed." in result.output
+
+
+@pytest.mark.skipif(none_of("click"), reason="Click does not exist")
+def test_validate_report(runner, tmpdir):
+    from prance import cli
+
+    report = str(tmpdir.join("report.json"))
+    result = runner.invoke(
+        cli.validate, ["--report", report, "tests/specs/petstore.yaml"]
+    )
+    assert result.exit_code == 0
+    assert "Validated 1 specs: 1 OK, 0 failed." in result.output
+
+    import json
+
+    with open(report) as handle:
+        contents = json.load(handle)
+    assert contents["summary"] == {"total": 1, "valid": 1, "invalid": 0}
+    assert contents["results"][0]["url"] == "tests/specs/petstore.yaml"
+    assert contents["results"][0]["version"] == "Swagger/OpenAPI 2.0"
+
+
+@pytest.mark.skipif(none_of("click"), reason="Click does not exist")
+def test_validate_jobs_output_file(runner):
+    from prance import cli
+
+    result = runner.invoke(
+        cli.validate, ["--jobs", "2", "-o", "foo.yaml", "tests/specs/petstore.yaml"]
+    )
+    assert result.exit_code == 2
+    assert "cannot be combined" in result.output
+
+
 @pytest.mark.skipif(none_of("click"), reason="Click does not exist")
 def test_validate_no_resolve(runner):
     from prance import cli
@@ -169,6 +240,136 @@ def test_compile_output(runner):
             assert result.exit_code == 0
 
 
+@pytest.mark.skipif(none_of("click"), reason="Click does not exist")
+def test_timings(runner):
+    from prance import cli
+
+    result = runner.invoke(cli.validate, ["--timings", "tests/specs/petstore.yaml"])
+    assert result.exit_code == 0
+    assert "Validates OK" in result.stdout
+    assert "phase" not in result.stdout
+    phases = [line.split()[0] for line in result.stderr.splitlines()[1:6]]
+    assert phases == ["fetch", "decode", "parse", "resolve", "validate"]
+    assert "file://" in result.stderr
+
+    # Compiled specs on stdout remain intact.
+    result = runner.invoke(cli.compile, ["--timings", "tests/specs/petstore.yaml"])
+    assert result.exit_code == 0
+    assert "serialize" in result.stderr
+    assert "serialize" not in result.stdout
+
+    # Batch mode does not collect timings.
+    result = runner.invoke(
+        cli.validate, ["--timings", "--jobs", "2", "tests/specs/petstore.yaml"]
+    )
+    assert result.exit_code == 2
+
+
+@pytest.mark.skipif(none_of("click"), reason="Click does not exist")
+@pytest.mark.skipif(none_of("openapi-spec-validator"), reason="Missing backends")
+def test_watch(runner, tmpdir):
+    from unittest.mock import patch
+    from prance import cli
+
+    tmpdir.join("root.yaml").write(
+        "openapi: 3.0.0\n"
+        "info:\n  title: test\n  version: 1.0.0\n"
+        "paths: {}\n"
+        "components:\n  schemas:\n"
+        "    Pet:\n      $ref: 'pet.yaml#/Pet'\n"
+    )
+    pet = tmpdir.join("pet.yaml")
+    pet.write("Pet:\n  type: string\n")
+
+    # Each poll interval, edit the referenced file; then stop.
+    edits = ["Pet:\n  type: 42\n", "Pet:\n  type: integer\n"]
+
+    def sleep(interval):
+        if not edits:
+            raise KeyboardInterrupt
+        pet.write(edits.pop(0))
+
+    with patch("time.sleep", side_effect=sleep):
+        result = runner.invoke(
+            cli.watch,
+            ["--backend", "openapi-spec-validator", str(tmpdir.join("root.yaml"))],
+        )
+
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert lines[2].endswith("validates OK as OpenAPI 3.0.0!")
+    assert lines[3] == "Watching for changes; press Ctrl-C to stop."
+    assert lines[4].startswith("Changes affecting")
+    assert "ValidationError" in lines[5]
+    assert lines[6].startswith("Changes affecting")
+    assert lines[7].endswith("validates OK as OpenAPI 3.0.0!")
+
+
+@pytest.mark.skipif(none_of("click"), reason="Click does not exist")
+def test_graph(runner, tmpdir):
+    import json
+    from prance import cli
+
+    result = runner.invoke(cli.graph, ["tests/specs/recursion_limit.yaml"])
+    assert result.exit_code == 0
+    graph = json.loads(result.output)
+    assert len(graph["nodes"]) == 2
+    assert graph["cycles"] == [[graph["nodes"][1]["id"]]]
+
+    # The format follows the output file name.
+    outname = str(tmpdir.join("graph.dot"))
+    result = runner.invoke(cli.graph, ["tests/specs/recursion_limit.yaml", outname])
+    assert result.exit_code == 0
+    assert tmpdir.join("graph.dot").read().startswith("digraph references {")
+
+    # Bad example
+    result = runner.invoke(cli.graph, ["tests/specs/missing.yaml"])
+    assert result.exit_code == 1
+    assert "ResolutionError" in result.output
+
+    # Unsupported schemes are reported, too.
+    result = runner.invoke(cli.graph, ["ftp://example.com/spec.yaml"])
+    assert result.exit_code == 1
+    assert 'ERROR in "ftp://example.com/spec.yaml"' in result.output
+
+
+@pytest.mark.skipif(none_of("click"), reason="Click does not exist")
+def test_stats(runner, tmpdir):
+    from prance import cli
+
+    result = runner.invoke(
+        cli.stats, ["--top", "2", "--sort", "inlined", "tests/specs/petstore.yaml"]
+    )
+    assert result.exit_code == 0
+    lines = result.output.splitlines()
+    assert len(lines) == 3
+    assert lines[1].split()[0] == "3"
+    assert lines[1].endswith("#/definitions/Pet")
+
+    outname = str(tmpdir.join("stats.json"))
+    result = runner.invoke(cli.stats, ["tests/specs/petstore.yaml", outname])
+    assert result.exit_code == 0
+
+    import json
+
+    with open(outname) as handle:
+        references = json.load(handle)["references"]
+    assert len(references) == 3
+    assert references[0]["target"].endswith("#/definitions/Pet")
+
+    # Bad example
+    tmpdir.join("missing.yaml").write("foo:\n  $ref: 'nonexistent.yaml#/bar'\n")
+    result = runner.invoke(cli.stats, [str(tmpdir.join("missing.yaml"))])
+    assert result.exit_code == 1
+    assert "ResolutionError" in result.output
+
+    # Unsupported schemes are reported, too.
+    tmpdir.join("scheme.yaml").write("foo:\n  $ref: 'ftp://example.com/a.yaml#/A'\n")
+    result = runner.invoke(cli.stats, [str(tmpdir.join("scheme.yaml"))])
+    assert result.exit_code == 1
+    assert "ValueError" in result.output
+
+
 @pytest.mark.skipif(none_of("click"), reason="Click does not exist")
 @pytest.mark.requires_network()
 def test_convert_defaults(runner):
@@ -0,0 +1,209 @@
+"""Test suite for prance.LazyResolvingParser and prance.util.lazy ."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+import pytest
+from unittest.mock import patch
+
+from prance import LazyResolvingParser
+from prance import ResolvingParser
+from prance.util import fs
+from prance.util import lazy
+from prance.util import url
+
+from . import none_of
+
+
+def mock_get_petstore(*args, **kwargs):
+    from .mock_response import MockResponse, PETSTORE_YAML
+
+    return MockResponse(text=PETSTORE_YAML)
+
+
+@pytest.mark.skipif(
+    none_of("openapi-spec-validator", "swagger-spec-validator", "flex"),
+    reason="Missing backends",
+)
+@patch("requests.get")
+def test_same_result(mock_get):
+    mock_get.side_effect = mock_get_petstore
+
+    parser = LazyResolvingParser("tests/specs/with_externals.yaml")
+    assert isinstance(parser.specification, lazy.LazyMapping)
+    assert not parser.valid
+
+    eager = ResolvingParser("tests/specs/with_externals.yaml")
+    assert parser.specification == eager.specification
+    assert lazy.materialize(parser.specification) == eager.specification
+
+
+@patch("requests.get")
+def test_resolves_on_access(mock_get):
+    mock_get.side_effect = mock_get_petstore
+
+    parser = LazyResolvingParser("tests/specs/with_externals.yaml")
+    spec = parser.specification
+
+    with patch("prance.util.url.fetch_url_text", wraps=url.fetch_url_text) as fetch:
+        # Paths and methods need nothing but the spec itself.
+        assert sorted(spec["paths"]) == ["/pets", "/pets/{petId}"]
+        assert sorted(spec["paths"]["/pets"]) == ["get", "post"]
+        assert not fetch.called
+
+        # An operation's schema needs the files it references.
+        schema = spec["paths"]["/pets"]["get"]["responses"]["200"]["schema"]
+        assert schema["type"] == "array"
+        assert schema["items"]["required"] == ["id", "name"]
+        fetched = [call.args[0].path for call in fetch.call_args_list]
+        assert fetched == [fs.abspath("tests/specs/definitions.yaml")]
+
+    assert not mock_get.called
+
+    # Values are resolved once, and then remembered.
+    assert spec["paths"]["/pets"] is spec["paths"]["/pets"]
+
+    # Referenced siblings are replaced, as when resolving eagerly.
+    param = spec["paths"]["/pets/{petId}"]["get"]["parameters"][0]
+    assert "overwritten" not in param
+    assert param["in"] == "path"
+
+
+def test_recursion_limit():
+    def handler(limit, refstring, recursions):
+        return None
+
+    from prance.util.resolver import RefResolver
+
+    parser = LazyResolvingParser(
+        "tests/specs/recursion_limit.yaml",
+        recursion_limit=2,
+        recursion_limit_handler=handler,
+    )
+    from prance.util import formats
+
+    specs = formats.parse_spec(fs.read_file("tests/specs/recursion_limit.yaml"))
+    eager = RefResolver(
+        specs,
+        parser.url,
+        recursion_limit=2,
+        recursion_limit_handler=handler,
+    )
+    eager.resolve_references()
+    assert parser.specification == eager.specs
+
+    schema = parser.specification["paths"]["/pets"]["get"]["responses"]["200"]
+    next_schema = schema["schema"]["properties"]["next"]["schema"]
+    assert next_schema["properties"]["next"]["schema"] is None
+
+
+@pytest.mark.skipif(
+    none_of("openapi-spec-validator", "swagger-spec-validator", "flex"),
+    reason="Missing backends",
+)
+def test_validate():
+    parser = LazyResolvingParser("tests/specs/petstore.yaml")
+    assert parser.version is None
+
+    parser.validate()
+    assert parser.valid
+    assert parser.version == "Swagger/OpenAPI 2.0"
+    assert isinstance(parser.specification, lazy.LazyMapping)
+
+
+def test_translate_external():
+    from prance.util.resolver import TRANSLATE_EXTERNAL
+
+    with pytest.raises(ValueError):
+        LazyResolvingParser(
+            "tests/specs/petstore.yaml", resolve_method=TRANSLATE_EXTERNAL
+        )
+
+
+def test_sequence():
+    parser = LazyResolvingParser("tests/specs/petstore.yaml")
+    tags = parser.specification["paths"]["/pets"]["get"]["tags"]
+
+    assert isinstance(tags, lazy.LazySequence)
+    assert tags == ["pets"]
+    assert ["pets"] == tags
+    assert tags != ["dogs"]
+    assert tags[-1] == "pets"
+    assert tags[:1] == ["pets"]
+    assert list(tags) == ["pets"]
+    assert tags != "pets"
+    with pytest.raises(IndexError):
+        tags[1]
+    with pytest.raises(IndexError):
+        tags[-2]
+
+
+def test_sequence_negative_index():
+    items = lazy.wrap(None, "file:///spec.yaml", [1, 2, 3])
+
+    assert items[-1] == 3
+    assert items[-3] == 1
+    for index in (3, -4, -5):
+        with pytest.raises(IndexError):
+            items[index]
+
+
+@pytest.mark.parametrize(
+    "specs",
+    [
+        # Plain keys next to references are dropped; references are resolved
+        # into the referenced value, replacing what is there.
+        {
+            "B": {"type": "object", "properties": {"a": {"$ref": "#/C"}}},
+            "C": {"type": "string"},
+            "p": {"$ref": "#/B", "description": "x", "extra": {"$ref": "#/C"}},
+            "q": {"$ref": "#/B", "type": {"$ref": "#/C"}},
+        },
+        # Chains of references with other keys at each step.
+        {
+            "T": {"a": 1, "b": {"z": 1}},
+            "C": {"type": "string"},
+            "D": {"k": 2},
+            "M2": {"$ref": "#/T", "b": {"$ref": "#/C"}, "c": {"$ref": "#/D"}},
+            "M1": {"$ref": "#/M2", "c": {"$ref": "#/C"}, "d": {"e": {"$ref": "#/D"}}},
+            "x": {"$ref": "#/M1", "b": {"y": {"$ref": "#/D"}}},
+        },
+        # References within containers next to a reference.
+        {
+            "B": {"props": {"a": 1}, "l": [{"q": 1}]},
+            "C": {"type": "string"},
+            "D": {"v": 3},
+            "p": {
+                "$ref": "#/B",
+                "props": {"b": {"$ref": "#/C"}},
+                "l": [{"$ref": "#/C"}],
+                "m": [None, {"$ref": "#/C"}],
+                "extra": {"$ref": "#/C", "more": {"$ref": "#/D"}},
+            },
+        },
+    ],
+)
+@pytest.mark.parametrize("share", [False, True])
+def test_sibling_keys(specs, share):
+    from prance.util.resolver import RefResolver
+
+    res = RefResolver(specs, fs.abspath("spec.yaml"), share_references=share)
+    view = res.lazy_specs()
+    res.resolve_references()
+
+    assert lazy.materialize(view) == res.specs
+    assert view == res.specs
+
+
+def test_serialize():
+    import json
+    import yaml
+
+    parser = LazyResolvingParser("tests/specs/petstore.yaml")
+    eager = ResolvingParser("tests/specs/petstore.yaml")
+
+    assert json.loads(parser.json()) == eager.specification
+    assert yaml.safe_load(parser.yaml()) == eager.specification
+    assert isinstance(parser.specification, lazy.LazyMapping)
@@ -248,3 +248,116 @@ components:
     )
     specs = parser.specification
     assert specs["components"]["schemas"]["SampleEnum"]["enum"] == ["NO", "OFF"]
+
+
+@pytest.mark.skipif(
+    none_of("openapi-spec-validator", "swagger-spec-validator", "flex"),
+    reason="Missing backends",
+)
+@patch("requests.get")
+def test_disk_cache(mock_get, tmpdir):
+    mock_get.side_effect = mock_get_petstore
+
+    cache_dir = str(tmpdir.join("cache"))
+    parser1 = ResolvingParser("tests/specs/with_externals.yaml", disk_cache=cache_dir)
+
+    with patch("prance.util.formats.parse_spec") as mock_parse:
+        parser2 = ResolvingParser(
+            "tests/specs/with_externals.yaml", disk_cache=cache_dir
+        )
+        assert not mock_parse.called
+
+    assert parser1.specification == parser2.specification
+
+
+@pytest.mark.skipif(none_of("openapi-spec-validator"), reason="Missing backends")
+def test_reparse(tmpdir):
+    tmpdir.join("root.yaml").write(
+        "openapi: 3.0.0\n"
+        "info:\n  title: test\n  version: 1.0.0\n"
+        "paths: {}\n"
+        "components:\n  schemas:\n"
+        "    Pet:\n      $ref: 'pet.yaml#/Pet'\n"
+    )
+    tmpdir.join("pet.yaml").write("Pet:\n  type: string\n")
+
+    root = str(tmpdir.join("root.yaml"))
+    parser = ResolvingParser(root, backend="openapi-spec-validator")
+    previous = parser.specification
+
+    # Referenced files are updated incrementally.
+    tmpdir.join("pet.yaml").write("Pet:\n  type: integer\n")
+    from prance.util import url
+
+    with patch("prance.util.url.fetch_url_text", wraps=url.fetch_url_text) as fetch:
+        parser.reparse([str(tmpdir.join("pet.yaml"))])
+        assert fetch.call_count == 1
+    assert parser.valid
+    assert parser.specification["components"]["schemas"]["Pet"]["type"] == "integer"
+    assert previous["components"]["schemas"]["Pet"]["type"] == "string"
+
+    # Changes to the spec file itself mean parsing it again.
+    tmpdir.join("root.yaml").write(
+        tmpdir.join("root.yaml").read().replace("title: test", "title: changed")
+    )
+    parser.reparse([root])
+    assert parser.specification["info"]["title"] == "changed"
+    assert parser.specification["components"]["schemas"]["Pet"]["type"] == "integer"
+
+
+def test_reparse_new_dependency(tmpdir):
+    tmpdir.join("root.yaml").write(
+        "openapi: 3.0.0\n"
+        "info:\n  title: test\n  version: 1.0.0\n"
+        "paths: {}\n"
+        "components:\n  schemas:\n"
+        "    Pet:\n      $ref: 'a.yaml#/Pet'\n"
+    )
+    tmpdir.join("a.yaml").write("Pet:\n  type: string\n")
+    tmpdir.join("b.yaml").write("Name:\n  type: string\n")
+
+    from prance.util.url import absurl, urlresource
+
+    def resource(name):
+        return urlresource(absurl(str(tmpdir.join(name))))
+
+    root = str(tmpdir.join("root.yaml"))
+    parser = ResolvingParser(root, backend="openapi-spec-validator")
+    assert parser.dependencies() == {resource("root.yaml"), resource("a.yaml")}
+
+    # A changed file referencing a new file makes that a dependency.
+    tmpdir.join("a.yaml").write(
+        "Pet:\n  properties:\n    name:\n      $ref: 'b.yaml#/Name'\n"
+    )
+    parser.reparse([str(tmpdir.join("a.yaml"))])
+    assert parser.valid
+    assert parser.dependencies() == {
+        resource("root.yaml"),
+        resource("a.yaml"),
+        resource("b.yaml"),
+    }
+
+
+def test_freeze():
+    from prance.util.formats import serialize_spec
+    from prance.util.frozen import is_frozen, thaw
+
+    plain = ResolvingParser(
+        "tests/specs/petstore.yaml", backend="openapi-spec-validator"
+    )
+    parser = ResolvingParser(
+        "tests/specs/petstore.yaml", backend="openapi-spec-validator", freeze=True
+    )
+    assert parser.valid
+    assert is_frozen(parser.specification)
+    assert parser.specification == plain.specification
+    assert thaw(parser.specification) == plain.specification
+
+    # Frozen specs serialize like plain ones.
+    import yaml
+
+    assert yaml.safe_load(parser.yaml()) == plain.specification
+    assert parser.yaml() == plain.yaml()
+    assert serialize_spec(parser.specification, "x.yaml") == serialize_spec(
+        plain.specification, "x.yaml"
+    )
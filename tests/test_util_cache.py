@@ -0,0 +1,184 @@
+"""Test suite for prance.util.cache ."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+import pytest
+from unittest.mock import patch
+
+from prance.util import cache
+from prance.util import fs
+from prance.util import url
+
+from . import none_of
+
+
+def mock_get_petstore(*args, **kwargs):
+    from .mock_response import MockResponse, PETSTORE_YAML
+
+    return MockResponse(text=PETSTORE_YAML)
+
+
+@pytest.fixture
+def disk_cache(tmpdir):
+    return cache.DiskCache(str(tmpdir.join("cache")))
+
+
+def test_default_cache_dir(monkeypatch):
+    import os.path
+
+    monkeypatch.setenv("XDG_CACHE_HOME", "/some/where")
+    assert cache.default_cache_dir() == os.path.join("/some/where", "prance")
+
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    assert cache.default_cache_dir().endswith(os.path.join(".cache", "prance"))
+
+
+def test_disk_cache_from_option(disk_cache):
+    assert cache.DiskCache.from_option(None) is None
+    assert cache.DiskCache.from_option(False) is None
+    assert cache.DiskCache.from_option(disk_cache) is disk_cache
+    assert cache.DiskCache.from_option("foo").directory == "foo"
+    assert cache.DiskCache.from_option(True).directory == cache.default_cache_dir()
+
+
+def test_disk_cache_get_set(disk_cache):
+    key = disk_cache.key("foo", 42)
+    assert key == disk_cache.key("foo", 42)
+    assert key != disk_cache.key("foo", 43)
+
+    assert disk_cache.get(key) is None
+    assert disk_cache.get(key, 123) == 123
+
+    disk_cache.set(key, {"foo": [1, 2, 3]})
+    assert disk_cache.get(key) == {"foo": [1, 2, 3]}
+
+    disk_cache.clear()
+    assert disk_cache.get(key) is None
+
+
+def test_disk_cache_corrupt_entry(disk_cache):
+    key = disk_cache.key("foo")
+    disk_cache.set(key, "bar")
+
+    with open(disk_cache._filename(key), "wb") as handle:
+        handle.write(b"garbage")
+    assert disk_cache.get(key) is None
+
+
+def test_fetch_url_disk_cache(disk_cache, tmpdir):
+    import shutil
+
+    fname = str(tmpdir.join("petstore.yaml"))
+    shutil.copyfile("tests/specs/petstore.yaml", fname)
+    parsed = url.absurl(fs.abspath(fname))
+
+    content1 = url.fetch_url(parsed, {}, disk_cache=disk_cache)
+    assert content1["swagger"] == "2.0"
+
+    # A fresh in-memory cache must be served from disk without parsing.
+    with patch("prance.util.formats.parse_spec") as mock_parse:
+        content2 = url.fetch_url(parsed, {}, disk_cache=disk_cache)
+        assert not mock_parse.called
+    assert content1 == content2
+
+    # Changing the file invalidates the entry.
+    with open(fname, "a") as handle:
+        handle.write("\nx-changed: true\n")
+    content3 = url.fetch_url(parsed, {}, disk_cache=disk_cache)
+    assert content3["x-changed"] is True
+
+
+def test_fetch_url_python_disk_cache(disk_cache):
+    parsed = url.absurl("python://tests/specs/petstore.yaml")
+
+    content1 = url.fetch_url(parsed, {}, disk_cache=disk_cache)
+    with patch("prance.util.formats.parse_spec") as mock_parse:
+        content2 = url.fetch_url(parsed, {}, disk_cache=disk_cache)
+        assert not mock_parse.called
+    assert content1 == content2
+
+
+def test_reference_cache_basics():
+    rc = cache.ReferenceCache()
+    assert rc.get("foo") is None
+    rc["foo"] = "bar"
+    assert rc["foo"] == "bar"
+    assert "foo" in rc
+    assert list(rc) == ["foo"]
+    assert len(rc) == 1
+
+    del rc["foo"]
+    assert len(rc) == 0
+    with pytest.raises(KeyError):
+        rc["foo"]
+
+    stats = rc.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["entries"] == 0
+    assert stats["size"] == 0
+
+
+def test_reference_cache_max_entries():
+    rc = cache.ReferenceCache(max_entries=2)
+    rc["a"] = 1
+    rc["b"] = 2
+    rc["a"]  # a is now more recently used than b
+    rc["c"] = 3
+
+    assert set(rc) == {"a", "c"}
+    assert rc.evictions == 1
+
+
+def test_reference_cache_max_size():
+    rc = cache.ReferenceCache(max_size=10)
+    rc["a"] = "12345"
+    rc["b"] = "12345"
+    assert rc.size == 10
+    rc["c"] = "1"
+    assert set(rc) == {"b", "c"}
+
+    # Oversized entries are kept until the next insertion.
+    rc["d"] = "x" * 20
+    assert set(rc) == {"d"}
+    assert rc.evictions == 3
+
+
+def test_reference_cache_invalidate():
+    rc = cache.ReferenceCache()
+    parsed = url.absurl(fs.abspath("tests/specs/petstore.yaml"))
+    url.fetch_url(parsed, rc)
+    url.fetch_url(parsed, rc, strict=False)
+    other = url.absurl(fs.abspath("tests/specs/error.json"))
+    url.fetch_url(other, rc)
+    assert len(rc) == 5
+
+    assert rc.invalidate(fs.abspath("tests/specs/petstore.yaml")) == 3
+    assert len(rc) == 2
+
+    plain = {}
+    url.fetch_url(other, plain)
+    assert cache.invalidate(plain, other) == 2
+    assert not plain
+
+
+@pytest.mark.skipif(
+    none_of("openapi-spec-validator", "swagger-spec-validator", "flex"),
+    reason="Missing backends",
+)
+@patch("requests.get")
+def test_reference_cache_shared_between_parsers(mock_get):
+    mock_get.side_effect = mock_get_petstore
+
+    from prance import ResolvingParser
+
+    rc = cache.ReferenceCache(max_entries=100)
+    ResolvingParser("tests/specs/with_externals.yaml", reference_cache=rc)
+    misses = rc.misses
+    ResolvingParser("tests/specs/with_externals.yaml", reference_cache=rc)
+    assert rc.misses == misses
+    assert rc.hits > 0
@@ -0,0 +1,161 @@
+"""Test suite for prance.util.events ."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+import pytest
+
+from prance.util import events
+
+from . import none_of
+
+
+class Recorder(events.Observer):
+    def __init__(self):
+        self.events = []
+
+    def phase_started(self, phase, info):
+        self.events.append(("start", phase, info))
+
+    def phase_ended(self, phase, info, duration, error=None):
+        assert duration >= 0
+        self.events.append(("end", phase, info, error))
+
+
+@pytest.fixture
+def split_spec(tmpdir):
+    tmpdir.join("openapi.yaml").write(
+        "openapi: 3.0.0\n"
+        "info:\n  title: Split\n  version: 1.0.0\n"
+        "paths: {}\n"
+        "components:\n  schemas:\n"
+        "    Pet:\n      $ref: 'pet.yaml#/Pet'\n"
+        "    Error:\n      $ref: 'error.yaml#/Error'\n"
+    )
+    tmpdir.join("pet.yaml").write(
+        "Pet:\n  type: object\n  properties:\n"
+        "    tag:\n      $ref: 'tag.yaml#/Tag'\n"
+    )
+    tmpdir.join("error.yaml").write("Error:\n  type: string\n")
+    tmpdir.join("tag.yaml").write("Tag:\n  type: string\n")
+    return str(tmpdir.join("openapi.yaml"))
+
+
+def test_phase_without_observers():
+    with events.phase("parse", filename="foo.yaml"):
+        pass
+
+
+def test_observe():
+    outer = Recorder()
+    inner = Recorder()
+
+    with events.observe(outer):
+        with events.phase("fetch", url="file:///foo.yaml"):
+            with events.observe(inner, None):
+                with events.phase("decode", filename="/foo.yaml"):
+                    pass
+        with events.phase("parse"):
+            pass
+
+    # Outside the context, nobody is notified.
+    with events.phase("parse"):
+        pass
+
+    assert outer.events == [
+        ("start", "fetch", {"url": "file:///foo.yaml"}),
+        ("start", "decode", {"filename": "/foo.yaml"}),
+        ("end", "decode", {"filename": "/foo.yaml"}, None),
+        ("end", "fetch", {"url": "file:///foo.yaml"}, None),
+        ("start", "parse", {}),
+        ("end", "parse", {}, None),
+    ]
+    assert inner.events == outer.events[1:3]
+
+
+def test_phase_error():
+    recorder = Recorder()
+
+    with events.observe(recorder):
+        with pytest.raises(ValueError):
+            with events.phase("resolve"):
+                raise ValueError("failed")
+
+    assert recorder.events[1][:2] == ("end", "resolve")
+    assert isinstance(recorder.events[1][3], ValueError)
+
+
+def test_timings():
+    timings = events.Timings()
+    timings.phase_ended("parse", {}, 0.5)
+    timings.phase_ended("custom", {}, 0.25)
+    timings.phase_ended("fetch", {"url": "file:///a.yaml"}, 0.25)
+    timings.phase_ended("fetch", {"url": "file:///b.yaml"}, 1.0, ValueError("x"))
+    timings.phase_ended("parse", {}, 1.0)
+
+    assert timings.phases == {
+        "fetch": (2, 1.25),
+        "parse": (2, 1.5),
+        "custom": (1, 0.25),
+    }
+    assert [url for url, _, _ in timings.fetches] == [
+        "file:///a.yaml",
+        "file:///b.yaml",
+    ]
+
+    as_dict = timings.to_dict()
+    assert as_dict["phases"][0] == {"phase": "fetch", "count": 2, "duration": 1.25}
+    assert as_dict["fetches"][1]["error"] == "x"
+
+    lines = timings.format().splitlines()
+    assert lines[1].split() == ["fetch", "2", "1.2500"]
+    # Slowest fetch first
+    assert lines[-2].split() == ["1.0000", "file:///b.yaml", "(failed)"]
+
+
+@pytest.mark.skipif(none_of("openapi-spec-validator"), reason="Missing backends")
+def test_parser_observer(split_spec):
+    from prance import ResolvingParser
+
+    timings = events.Timings()
+    parser = ResolvingParser(
+        split_spec,
+        backend="openapi-spec-validator",
+        observer=timings,
+    )
+    assert parser.valid
+
+    phases = timings.phases
+    assert list(phases) == ["fetch", "decode", "parse", "resolve", "validate"]
+    assert phases["resolve"][0] == 1
+    assert phases["validate"][0] == 1
+    assert phases["fetch"][0] == len(parser.dependencies())
+
+
+@pytest.mark.skipif(none_of("openapi-spec-validator"), reason="Missing backends")
+def test_prefetch_threads(split_spec):
+    import threading
+
+    from prance import ResolvingParser
+
+    threads = set()
+
+    class ThreadRecorder(events.Observer):
+        def phase_ended(self, phase, info, duration, error=None):
+            if phase == "fetch":
+                threads.add(threading.get_ident())
+
+    parser = ResolvingParser(
+        split_spec,
+        backend="openapi-spec-validator",
+        prefetch_workers=2,
+        observer=ThreadRecorder(),
+    )
+    assert parser.valid
+
+    # The referenced files are fetched in worker threads.
+    assert threading.get_ident() in threads
+    assert len(threads) > 1
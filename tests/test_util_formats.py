@@ -7,6 +7,7 @@ __all__ = ()
 
 
 import pytest
+from unittest.mock import Mock, patch
 
 from prance.util import formats
 
@@ -134,3 +135,188 @@ def test_serialize_yaml_ctype():
     # Force YAML with content type
     serialized = formats.serialize_spec(specs, None, content_type="text/yaml")
     assert "foo: bar" in serialized
+
+
+@pytest.fixture
+def pyyaml_backend():
+    pytest.importorskip("yaml")
+    formats.set_yaml_backend("pyyaml")
+    yield
+    formats.set_yaml_backend()
+
+
+def test_yaml_backend_default():
+    assert formats.yaml_backends()[0] == "ruamel"
+    assert formats.yaml_backend() in ("ruamel", "ruamel-c")
+
+
+def test_yaml_backend_unknown():
+    with pytest.raises(ValueError):
+        formats.set_yaml_backend("foo")
+
+
+def test_yaml_backend_pyyaml(pyyaml_backend):
+    assert formats.yaml_backend() in ("pyyaml", "pyyaml-c")
+
+    parsed = formats.parse_spec("foo: bar\n", "foo.yaml")
+    assert parsed == {"foo": "bar"}
+
+    with pytest.raises(formats.ParseError):
+        formats.parse_spec("foo: [bar\n", "foo.yaml")
+
+
+YAML_1_2_SCALARS = """---
+bools: [yes, no, on, off, true, False, TRUE, y, n]
+ints: [017, 0o17, 0x1F, 0b101, 1_000, -12, +5, 0, 08, -0o7]
+floats: [1.5, 1e3, -.5, .inf, -.Inf, 1_0.5, 190:20:30, "1.0", +.5e+3, 1.]
+nulls: [~, null, Null]
+dates: [2001-12-14, 2001-12-14t21:59:43.10-05:00]
+base: &base {k: 1}
+merged: {<<: *base, j: 2}
+tagged: !!str 123
+200: integer key
+'200': string key
+"""
+
+
+def test_yaml_backends_agree(pyyaml_backend):
+    pyyaml = formats.parse_spec(YAML_1_2_SCALARS, "foo.yaml")
+    formats.set_yaml_backend("ruamel")
+    ruamel = formats.parse_spec(YAML_1_2_SCALARS, "foo.yaml")
+
+    assert pyyaml == ruamel
+    assert pyyaml["bools"][:4] == ["yes", "no", "on", "off"]
+    assert pyyaml["ints"][0] == 17
+
+
+def test_yaml_pyyaml_duplicate_keys(pyyaml_backend):
+    from yaml.constructor import ConstructorError
+
+    with pytest.raises(ConstructorError):
+        formats.parse_spec("foo: 1\nfoo: 2\n", "foo.yaml")
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_codec(request):
+    pytest.importorskip(request.param)
+    formats.set_json_codec(request.param)
+    yield request.param
+    formats.set_json_codec()
+
+
+def test_json_codec_unknown():
+    with pytest.raises(ValueError):
+        formats.set_json_codec("foo")
+
+
+def test_json_codec_selected(json_codec):
+    assert formats.json_codec() == json_codec
+
+
+@pytest.mark.parametrize(
+    "specs",
+    [
+        {"foo": "bär", "baz": [1, 2.5, True, None, [], {}]},
+        {200: {"description": "integer key"}, "default": {}},
+        {"floats": [1e16, 1e-05, float("inf")], "nested": {"x": [0.1]}},
+        {"big": 2**80},
+    ],
+)
+def test_json_codec_serialize_like_json(json_codec, specs):
+    import json
+
+    expected = json.dumps(specs, ensure_ascii=False, indent=2)
+    assert formats.serialize_spec(specs, "foo.json") == expected
+
+
+@pytest.mark.parametrize(
+    "spec_str",
+    [
+        '{"foo": "b\\u00e4r", "baz": [1, 2.5, 1e16, true, null]}',
+        '{"nan": NaN, "big": 1208925819614629174706176}',
+    ],
+)
+def test_json_codec_parse_like_json(json_codec, spec_str):
+    import json
+
+    parsed = formats.parse_spec(spec_str, "foo.json")
+    assert json.dumps(parsed) == json.dumps(json.loads(spec_str))
+
+
+def test_json_codec_parse_error(json_codec):
+    with pytest.raises(formats.ParseError):
+        formats.parse_spec("{", "foo.json", content_type="application/json")
+
+
+@pytest.mark.parametrize(
+    "spec_str, expected",
+    [
+        ('{"openapi": "3.0.0"}', "JSON"),
+        ("﻿\n  [1, 2]", "JSON"),
+        ("openapi: 3.0.0\n", "YAML"),
+        ("---\nfoo: bar\n", "YAML"),
+        ("# comment\n{}", "YAML"),
+        ("", "YAML"),
+    ],
+)
+def test_sniff_format(spec_str, expected):
+    assert formats.sniff_format(spec_str) == expected
+
+
+def test_parse_details_sniffed():
+    yaml = """---
+foo: bar
+"""
+    json_parser = Mock(side_effect=formats.ParseError)
+    with patch.dict("prance.util.formats.__FORMAT_TO_PARSER", JSON=json_parser):
+        parsed, ctype, ext = formats.parse_spec_details(
+            yaml, None, content_type="text/plain"
+        )
+    json_parser.assert_not_called()
+    assert parsed["foo"] == "bar"
+    assert "yaml" in ctype
+
+    parsed, ctype, ext = formats.parse_spec_details('{"foo": "bar"}')
+    assert parsed["foo"] == "bar"
+    assert "json" in ctype
+
+
+def test_intern_strings():
+    import sys
+
+    length = formats.INTERN_MAX_LENGTH + 1
+    # Build strings at runtime, so they are not interned as constants.
+    key = "".join(["ty", "pe"])
+    value = "".join(["str", "ing"])
+    inner = {key: value, "description": "x" * length}
+    data = {"a": inner, "b": inner, "list": [value, 42, [inner]], 1: None}
+    data["self"] = data
+
+    result = formats.intern_strings(data)
+    assert result is data
+    assert data["a"] is data["b"] is data["list"][2][0] is inner
+    assert data["self"] is data
+    assert list(data) == ["a", "b", "list", 1, "self"]
+
+    interned_key = [k for k in inner if k == "type"][0]
+    assert interned_key is sys.intern("type")
+    assert inner["type"] is sys.intern("string")
+    assert data["list"][0] is sys.intern("string")
+    assert inner["description"] is not sys.intern("x" * length)
+
+    assert formats.intern_strings("".join(["str", "ing"])) is sys.intern("string")
+
+
+@pytest.mark.parametrize(
+    "spec_str, filename",
+    [
+        ("foo:\n  type: string\n", "spec.yaml"),
+        ('{"foo": {"type": "string"}}', "spec.json"),
+    ],
+)
+def test_parse_spec_intern(spec_str, filename):
+    first = formats.parse_spec(spec_str, filename, intern=True)
+    second = formats.parse_spec(spec_str, filename, intern=True)
+    assert first == second
+    assert first["foo"]["type"] is second["foo"]["type"]
+    assert list(first["foo"])[0] is list(second["foo"])[0]
@@ -0,0 +1,113 @@
+"""Test suite for prance.util.frozen ."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+import copy
+import pickle
+
+import pytest
+
+from prance.util.frozen import (
+    FrozenDict,
+    FrozenList,
+    freeze,
+    is_frozen,
+    replace_paths,
+    thaw,
+)
+
+
+def test_immutable():
+    value = freeze({"foo": [1, {"bar": 2}]})
+
+    with pytest.raises(TypeError):
+        value["foo"] = 1
+    with pytest.raises(TypeError):
+        del value["foo"]
+    with pytest.raises(TypeError):
+        value.update({"baz": 3})
+    with pytest.raises(TypeError):
+        value["foo"].append(3)
+    with pytest.raises(TypeError):
+        value["foo"][0] = 3
+    with pytest.raises(TypeError):
+        value["foo"][1]["bar"] = 3
+
+    assert value == {"foo": [1, {"bar": 2}]}
+
+
+def test_hash():
+    first = freeze({"foo": [1, {"bar": 2}]})
+    second = freeze({"foo": [1, {"bar": 2}]})
+
+    assert hash(first) == hash(second)
+    assert len({first, second}) == 1
+    assert hash(first) != hash(freeze({"foo": [1, {"bar": 3}]}))
+
+
+def test_copy_returns_self():
+    value = freeze({"foo": [1, 2]})
+
+    assert value.copy() is value
+    assert copy.copy(value) is value
+    assert copy.deepcopy(value) is value
+    assert copy.deepcopy({"x": value})["x"] is value
+
+
+def test_pickle():
+    value = freeze({"foo": [1, {"bar": 2}]})
+    result = pickle.loads(pickle.dumps(value))
+
+    assert result == value
+    assert isinstance(result, FrozenDict)
+    assert isinstance(result["foo"], FrozenList)
+    assert isinstance(result["foo"][1], FrozenDict)
+
+
+def test_freeze_thaw():
+    shared = {"type": "string"}
+    value = {"a": shared, "b": [shared, "text"], "c": 1}
+
+    frozen = freeze(value)
+    assert is_frozen(frozen)
+    assert is_frozen(frozen["b"])
+    assert frozen["a"] is frozen["b"][0]
+    assert frozen == value
+
+    # Freezing frozen values does nothing.
+    assert freeze(frozen) is frozen
+    assert freeze({"x": frozen})["x"] is frozen
+
+    thawed = thaw(frozen)
+    assert type(thawed) is dict
+    assert type(thawed["b"]) is list
+    assert thawed["a"] is thawed["b"][0]
+    assert thawed == value
+
+    # Scalars are returned as they are.
+    assert freeze("foo") == "foo"
+    assert thaw(42) == 42
+
+
+def test_freeze_cycle():
+    value = {"foo": {}}
+    value["foo"]["bar"] = value
+
+    with pytest.raises(ValueError):
+        freeze(value)
+
+
+def test_replace_paths():
+    value = freeze({"foo": {"bar": [1, 2]}, "other": {"x": 1}})
+    result = replace_paths(value, [(("foo", "bar", 1), 42), (("new", "key"), 3)])
+
+    assert value == {"foo": {"bar": [1, 2]}, "other": {"x": 1}}
+    assert result == {"foo": {"bar": [1, 42]}, "other": {"x": 1}, "new": {"key": 3}}
+    assert is_frozen(result)
+    assert is_frozen(result["foo"]["bar"])
+    assert is_frozen(result["new"])
+    assert result["other"] is value["other"]
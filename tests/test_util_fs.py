@@ -162,6 +162,65 @@ def test_load_utf8bom_override():
         fs.read_file("tests/specs/utf8bom.yaml", "ascii")
 
 
+def test_detect_encoding_utf8_without_detector():
+    from unittest.mock import patch
+
+    with patch("chardet.detect") as detect:
+        assert fs.detect_encoding("tests/specs/utf8bom.yaml") == "utf-8-sig"
+        assert fs.detect_encoding("tests/specs/petstore.yaml") == "utf-8"
+        assert fs.read_file("tests/specs/petstore.yaml")
+    detect.assert_not_called()
+
+
+def test_detect_and_decode_utf8():
+    raw = "söme täxt\n".encode("utf-8")
+
+    # Complete UTF-8 contents are decoded while detecting, so that reading
+    # them needs no second decoding.
+    assert fs._detect_and_decode(raw) == ("utf-8", "söme täxt\n")
+    assert fs._detect_and_decode(raw[:2], final=False) == ("utf-8", None)
+    assert fs._detect_and_decode(b"\xef\xbb\xbf" + raw) == ("utf-8-sig", None)
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-32", "utf-16-le"])
+def test_read_file_utf16_32(tmpdir, encoding):
+    import codecs
+
+    test_text = "söme täxt\n"
+    raw = test_text.encode(encoding)
+    if encoding == "utf-16-le":
+        raw = codecs.BOM_UTF16_LE + raw
+
+    filename = str(tmpdir.join("test.out"))
+    with open(filename, "wb") as handle:
+        handle.write(raw)
+
+    assert fs.detect_encoding(filename) in ("utf-16", "utf-32")
+    assert fs.read_file(filename) == test_text
+
+
+def test_read_file_newlines(tmpdir):
+    filename = str(tmpdir.join("test.out"))
+    with open(filename, "wb") as handle:
+        handle.write("a: ä\r\nb: c\rd: e\n".encode("utf-8"))
+
+    assert fs.read_file(filename) == "a: ä\nb: c\nd: e\n"
+
+
+def test_read_file_mmap(tmpdir, monkeypatch):
+    monkeypatch.setattr(fs, "_MMAP_THRESHOLD", 16)
+
+    filename = str(tmpdir.join("test.out"))
+    test_text = "söme täxt\n" * 100
+    with open(filename, "w", encoding="utf-8") as handle:
+        handle.write(test_text)
+
+    assert fs.read_file(filename) == test_text
+    assert fs.read_file(filename, "iso-8859-1") == test_text.encode("utf-8").decode(
+        "iso-8859-1"
+    )
+
+
 def test_write_file(tmpdir):
     with sandbox.sandbox(tmpdir):
         test_text = "söme täxt"
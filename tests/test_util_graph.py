@@ -0,0 +1,98 @@
+"""Test suite for prance.util.graph ."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+from prance.util.graph import ReferenceGraph, node_id
+
+ROOT = ("file:///spec.yaml", ())
+A = ("file:///spec.yaml", ("definitions", "A"))
+B = ("file:///other.yaml", ("B",))
+C = ("file:///other.yaml", ("C",))
+
+
+def make_graph():
+    # A and B reference each other, C references itself.
+    graph = ReferenceGraph(ROOT)
+    graph.add_edge(ROOT, A, 2)
+    graph.add_edge(A, B)
+    graph.add_edge(B, A)
+    graph.add_edge(ROOT, C)
+    graph.add_edge(C, C)
+    return graph
+
+
+def test_node_id():
+    assert node_id(ROOT) == "file:///spec.yaml#/"
+    assert node_id(("file:///x.yaml", ("a/b", "0"))) == "file:///x.yaml#/a~1b/0"
+
+
+def test_structure():
+    graph = make_graph()
+    assert graph.nodes == [ROOT, A, B, C]
+    assert len(graph) == 4
+    assert B in graph
+    assert graph.targets(ROOT) == {A: 2, C: 1}
+
+    graph.add_edge(ROOT, A)
+    assert graph.targets(ROOT)[A] == 3
+    assert graph.reference_counts() == {ROOT: 0, A: 4, B: 1, C: 2}
+
+
+def test_cycles():
+    assert make_graph().cycles() == [[A, B], [C]]
+
+    graph = ReferenceGraph(ROOT)
+    graph.add_edge(ROOT, A)
+    graph.add_edge(A, B)
+    assert graph.cycles() == []
+
+
+def test_cycles_deep():
+    # Long chains must not run into the recursion limit.
+    graph = ReferenceGraph(ROOT)
+    previous = ROOT
+    for index in range(5000):
+        node = ("file:///spec.yaml", ("definitions", str(index)))
+        graph.add_edge(previous, node)
+        previous = node
+    graph.add_edge(previous, ("file:///spec.yaml", ("definitions", "0")))
+
+    cycles = graph.cycles()
+    assert len(cycles) == 1
+    assert len(cycles[0]) == 5000
+
+
+def test_to_dict():
+    result = make_graph().to_dict()
+    assert result["root"] == "file:///spec.yaml#/"
+    assert result["nodes"][1] == {
+        "id": "file:///spec.yaml#/definitions/A",
+        "url": "file:///spec.yaml",
+        "pointer": "/definitions/A",
+        "references": 3,
+    }
+    assert {
+        "source": "file:///spec.yaml#/",
+        "target": "file:///spec.yaml#/definitions/A",
+        "count": 2,
+    } in result["edges"]
+    assert result["cycles"] == [
+        ["file:///spec.yaml#/definitions/A", "file:///other.yaml#/B"],
+        ["file:///other.yaml#/C"],
+    ]
+
+
+def test_to_dot():
+    dot = make_graph().to_dot()
+    assert dot.startswith("digraph references {\n")
+    assert '"file:///other.yaml#/B" [label="other.yaml#/B"];' in dot
+    assert (
+        '"file:///spec.yaml#/" -> "file:///spec.yaml#/definitions/A" [label="2"];'
+        in dot
+    )
+    assert '"file:///other.yaml#/C" -> "file:///other.yaml#/C" [color=red];' in dot
+    assert dot.endswith("}\n")
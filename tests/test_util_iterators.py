@@ -86,3 +86,30 @@ def test_reference_iterator_dict_with_references():
     }
     for key, value, path in iterators.reference_iterator(tester):
         assert value == expectations[len(path)]
+
+
+def test_reference_iterator_matches_item_iterator():
+    tester = {
+        "$ref": "root",
+        "foo": [
+            {"$ref": "first"},
+            "bar",
+            {"baz": {"$ref": "second"}, "$ref": "third"},
+        ],
+        "quux": ({"$ref": "tuple"},),
+        "$refs": {"$ref": "fourth"},
+    }
+
+    expected = tuple(
+        (item_path[-1], item, item_path[:-1])
+        for item_path, item in iterators.item_iterator(tester)
+        if len(item_path) > 0 and item_path[-1] == "$ref"
+    )
+    assert tuple(iterators.reference_iterator(tester)) == expected
+    assert len(expected) == 6
+
+
+def test_reference_iterator_path_prefix():
+    tester = {"foo": {"$ref": "bar"}}
+    frozen = tuple(iterators.reference_iterator(tester, ("root",)))
+    assert frozen == (("$ref", "bar", ("root", "foo")),)
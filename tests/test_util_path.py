@@ -8,7 +8,7 @@ __all__ = ()
 
 import pytest
 
-from prance.util.path import path_set, path_get
+from prance.util.path import path_set, path_set_many, path_get, JSONPointer
 
 
 def test_get_bad_path():
@@ -299,3 +299,96 @@ def test_get_informative_index_error():
 
     with pytest.raises(IndexError, match=r'.*"/foo/bar".*123'):
         path_get(base, ("foo", "bar", 123))
+
+
+def test_pointer_parse():
+    pointer = JSONPointer.parse("///foo/a~1b/c~0d/0")
+    assert pointer == ("foo", "a/b", "c~d", "0")
+    assert str(pointer) == "/foo/a~1b/c~0d/0"
+
+    # Pointers are interned
+    assert JSONPointer.parse("///foo/a~1b/c~0d/0") is pointer
+
+    assert JSONPointer.parse("") == ()
+
+
+def test_pointer_resolve():
+    base = {"foo": {"bar": [123, {"a/b": "baz"}]}}
+
+    assert JSONPointer.parse("").resolve(base) is base
+    assert JSONPointer.parse("/foo/bar/0").resolve(base) == 123
+    assert JSONPointer.parse("/foo/bar/1/a~1b").resolve(base) == "baz"
+
+
+def test_pointer_resolve_errors():
+    base = {"foo": {"bar": [123]}}
+
+    with pytest.raises(KeyError, match=r'.*"/foo".*asdf'):
+        JSONPointer.parse("/foo/asdf").resolve(base)
+
+    with pytest.raises(KeyError, match=r'.*"/foo/bar".*integer'):
+        JSONPointer.parse("/foo/bar/x").resolve(base)
+
+    with pytest.raises(IndexError, match=r'.*"/foo/bar".*1'):
+        JSONPointer.parse("/foo/bar/1").resolve(base)
+
+    with pytest.raises(TypeError):
+        JSONPointer.parse("/foo/bar/0/baz").resolve(base)
+
+
+def test_deep_paths():
+    import sys
+
+    depth = sys.getrecursionlimit() * 2
+    path = ("a",) * depth
+
+    base = path_set({}, path, 42, create=True)
+    assert path_get(base, path) == 42
+
+    with pytest.raises(KeyError, match=r'.*"(/a)+".*b'):
+        path_get(base, path[:-1] + ("b",))
+
+
+def test_set_many():
+    base = {"foo": {"bar": [1, 2]}}
+    changes = {
+        ("foo", "bar", 1): 42,
+        ("foo",): {"bar": [0, 0], "baz": {}},
+        ("foo", "baz", "quux"): "x",
+        ("new", 1): "y",
+    }
+
+    result = path_set_many(base, changes.items(), create=True)
+    assert result is base
+    assert base == {
+        "foo": {"bar": [0, 42], "baz": {"quux": "x"}},
+        "new": [None, "y"],
+    }
+
+
+def test_set_many_no_create():
+    with pytest.raises(KeyError):
+        path_set_many({"foo": {}}, [(("foo", "bar"), 1)])
+
+    with pytest.raises(KeyError):
+        path_set_many({}, [((), 1)])
+
+
+def test_set_many_copy():
+    base = {"foo": {"bar": [1, 2]}, "other": {"x": 1}}
+    result = path_set_many(base, [(("foo", "bar", 1), 42)], copy=True)
+
+    assert base == {"foo": {"bar": [1, 2]}, "other": {"x": 1}}
+    assert result == {"foo": {"bar": [1, 42]}, "other": {"x": 1}}
+    assert result["other"] is base["other"]
+
+
+def test_set_many_copy_frozen():
+    from prance.util.frozen import freeze
+
+    base = freeze({"foo": {"bar": [1, 2]}, "other": {"x": 1}})
+    result = path_set_many(base, [(("foo", "bar", 1), 42)], copy=True)
+
+    assert result == {"foo": {"bar": [1, 42]}, "other": {"x": 1}}
+    assert type(result["foo"]["bar"]) is list
+    assert result["other"] is base["other"]
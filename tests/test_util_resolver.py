@@ -743,3 +743,317 @@ def test_resolve_package_ref(mock_get):
         res.specs, ("paths", "/pets/{petId}", "get", "responses", "203", "schema")
     )
     assert "required" in val
+
+
+@patch("requests.get")
+def test_share_references_same_result(mock_get):
+    mock_get.side_effect = mock_get_petstore
+
+    specs = get_specs("tests/specs/with_externals.yaml")
+    res = resolver.RefResolver(specs, fs.abspath("tests/specs/with_externals.yaml"))
+    res.resolve_references()
+
+    shared = resolver.RefResolver(
+        specs, fs.abspath("tests/specs/with_externals.yaml"), share_references=True
+    )
+    shared.resolve_references()
+
+    assert res.specs == shared.specs
+
+
+def test_share_references_shares_objects():
+    specs = get_specs("tests/specs/petstore.yaml")
+    res = resolver.RefResolver(
+        specs, fs.abspath("tests/specs/petstore.yaml"), share_references=True
+    )
+    res.resolve_references()
+
+    from prance.util.path import path_get
+
+    first = path_get(
+        res.specs, ("paths", "/pets", "get", "responses", "default", "schema")
+    )
+    second = path_get(
+        res.specs, ("paths", "/pets", "post", "responses", "default", "schema")
+    )
+    assert "$ref" not in first
+    assert first is second
+
+
+def test_share_references_sibling_keys():
+    # Keys next to a reference are resolved within a copy of the shared value,
+    # not within the shared value itself.
+    specs = {
+        "B": {"type": "object"},
+        "C": {"type": "string"},
+        "W": {"p": {"$ref": "#/B", "extra": {"$ref": "#/C"}}},
+        "X": {"w": {"$ref": "#/W"}, "c": {"$ref": "#/B"}},
+    }
+    res = resolver.RefResolver(specs, fs.abspath("spec.yaml"))
+    res.resolve_references()
+
+    shared = resolver.RefResolver(specs, fs.abspath("spec.yaml"), share_references=True)
+    shared.resolve_references()
+
+    assert res.specs["X"]["c"] == {"type": "object"}
+    assert res.specs["X"]["w"]["p"] == {"type": "object", "extra": {"type": "string"}}
+    assert shared.specs == res.specs
+
+
+def test_share_references_recursion_not_shared(recursion_limit_file):
+    res = resolver.RefResolver(
+        recursion_limit_file,
+        fs.abspath("tests/specs/recursion_limit.yaml"),
+        recursion_limit=2,
+        recursion_limit_handler=recursion_limit_handler_none,
+        share_references=True,
+    )
+    res.resolve_references()
+
+    # Values that hit the recursion limit depend on the recursion stack, so
+    # they must resolve exactly as without sharing.
+    next_field = res.specs["paths"]["/pets"]["get"]["responses"]["200"]["schema"][
+        "properties"
+    ]["next"]["schema"]
+    assert next_field is not None
+    assert next_field["properties"]["next"]["schema"] is None
+
+
+@patch("requests.get")
+def test_prefetch_same_result(mock_get, recursive_files_file):
+    mock_get.side_effect = mock_get_petstore
+
+    res = resolver.RefResolver(
+        recursive_files_file, fs.abspath("tests/specs/recursive_files.yaml")
+    )
+    res.resolve_references()
+
+    cache = {}
+    prefetched = resolver.RefResolver(
+        recursive_files_file,
+        fs.abspath("tests/specs/recursive_files.yaml"),
+        reference_cache=cache,
+        prefetch_workers=4,
+    )
+    prefetched.resolve_references()
+
+    assert res.specs == prefetched.specs
+
+    # All referenced files were parsed, including indirectly referenced ones
+    # and the remote one.
+    from prance.util.url import absurl, urlresource
+
+    parsed = {key[0] for key in cache.keys() if isinstance(key, tuple)}
+    for name in ("definitions.yaml", "error.json", "recursive_files_definitions.yaml"):
+        assert urlresource(absurl(fs.abspath("tests/specs/" + name))) in parsed
+    assert "http://finkhaeuser.de/projects/prance/petstore.yaml" in parsed
+
+
+def test_prefetch_fetches_concurrently(recursive_files_file):
+    # Make every fetch slow, and record how many run at the same time.
+    import threading
+    import time
+    from prance.util import url
+    from .mock_response import PETSTORE_YAML
+
+    original = url.fetch_url_text
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def fetch_url_text(*args, **kwargs):
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        if args[0].scheme == "file":
+            return original(*args, **kwargs)
+        return PETSTORE_YAML, None
+
+    with patch("prance.util.url.fetch_url_text", side_effect=fetch_url_text):
+        res = resolver.RefResolver(
+            recursive_files_file,
+            fs.abspath("tests/specs/recursive_files.yaml"),
+            prefetch_workers=4,
+        )
+        res.resolve_references()
+
+    assert active[1] > 1
+
+
+@patch("requests.get")
+def test_prefetch_missing_reference(mock_get, missing_file):
+    mock_get.side_effect = mock_get_petstore
+
+    res = resolver.RefResolver(
+        missing_file,
+        fs.abspath("tests/specs/missing_reference.yaml"),
+        prefetch_workers=2,
+    )
+    with pytest.raises(ResolutionError) as exc:
+        res.resolve_references()
+
+    assert str(exc.value).startswith("Cannot resolve")
+
+
+@pytest.fixture
+def multi_file_spec(tmpdir):
+    # The root references a.yaml and b.yaml; a.yaml in turn references c.yaml.
+    tmpdir.join("root.yaml").write(
+        "openapi: 3.0.0\n"
+        "pet:\n  $ref: 'a.yaml#/Pet'\n"
+        "error:\n  $ref: 'b.yaml#/Error'\n"
+        "nested:\n  inner:\n    $ref: '#/pet'\n"
+    )
+    tmpdir.join("a.yaml").write("Pet:\n  tag:\n    $ref: 'c.yaml#/Tag'\n")
+    tmpdir.join("b.yaml").write("Error:\n  type: string\n")
+    tmpdir.join("c.yaml").write("Tag:\n  type: string\n")
+    return tmpdir
+
+
+@pytest.mark.parametrize("share", [False, True])
+def test_update_references(multi_file_spec, share):
+    root = str(multi_file_spec.join("root.yaml"))
+    cache = {}
+    res = resolver.RefResolver(
+        get_specs(root),
+        fs.abspath(root),
+        reference_cache=cache,
+        share_references=share,
+    )
+    res.resolve_references()
+    previous = res.specs
+    assert previous["nested"]["inner"]["tag"] == {"type": "string"}
+
+    multi_file_spec.join("c.yaml").write("Tag:\n  type: integer\n")
+    with patch(
+        "prance.util.url.fetch_url_text", wraps=resolver._url.fetch_url_text
+    ) as fetch:
+        count = res.update_references([fs.abspath(str(multi_file_spec.join("c.yaml")))])
+
+    # Only c.yaml was read again, and only the references depending on it -
+    # directly, via a.yaml or via the root - were resolved again.
+    assert fetch.call_count == 1
+    assert count == 2
+    assert res.specs["pet"]["tag"] == {"type": "integer"}
+    assert res.specs["nested"]["inner"]["tag"] == {"type": "integer"}
+    assert res.specs["error"] is previous["error"]
+
+    # The previous result is unmodified.
+    assert previous["pet"]["tag"] == {"type": "string"}
+    assert previous["nested"]["inner"]["tag"] == {"type": "string"}
+
+    # The result matches resolving from scratch.
+    fresh = resolver.RefResolver(get_specs(root), fs.abspath(root))
+    fresh.resolve_references()
+    assert res.specs == fresh.specs
+
+
+def test_update_references_unaffected(multi_file_spec):
+    root = str(multi_file_spec.join("root.yaml"))
+    res = resolver.RefResolver(get_specs(root), fs.abspath(root))
+    res.resolve_references()
+    previous = res.specs
+
+    count = res.update_references([fs.abspath(str(multi_file_spec.join("x.yaml")))])
+    assert count == 0
+    assert res.specs == previous
+
+
+def test_update_references_root_changed(multi_file_spec):
+    root = str(multi_file_spec.join("root.yaml"))
+    res = resolver.RefResolver(get_specs(root), fs.abspath(root))
+    res.resolve_references()
+
+    with pytest.raises(ValueError):
+        res.update_references([fs.abspath(root)])
+
+
+def test_reference_graph(recursive_files_file):
+    res = resolver.RefResolver(
+        recursive_files_file,
+        fs.abspath("tests/specs/recursive_files.yaml"),
+        resolve_types=resolver.RESOLVE_FILES | resolver.RESOLVE_INTERNAL,
+    )
+    graph = res.reference_graph()
+
+    from prance.util.url import absurl, urlresource
+
+    def node(name, *path):
+        return (urlresource(absurl(fs.abspath("tests/specs/" + name))), path)
+
+    root = node("recursive_files.yaml")
+    recursive = node("recursive_files.yaml", "definitions", "Recursive")
+    pet = node("recursive_files.yaml", "definitions", "Pet")
+    bar = node("recursive_files_definitions.yaml", "bar")
+
+    assert graph.root == root
+    assert graph.targets(root)[node("error.json")] == 2
+    assert graph.targets(recursive) == {bar: 1}
+    assert graph.targets(bar) == {pet: 1}
+
+    # References within a referenced object are attributed to that object
+    # only, not also to the document root containing it. The remote
+    # reference in Pet is not resolved, so it is not part of the graph.
+    assert bar not in graph.targets(root)
+    assert graph.targets(pet) == {}
+    assert graph.cycles() == []
+
+    # The specs are left unresolved.
+    assert res.specs == recursive_files_file
+
+
+def test_reference_graph_cycles(recursion_limit_file):
+    res = resolver.RefResolver(
+        recursion_limit_file, fs.abspath("tests/specs/recursion_limit.yaml")
+    )
+    graph = res.reference_graph()
+
+    recursive = (graph.root[0], ("definitions", "Recursive"))
+    assert graph.targets(recursive) == {recursive: 1}
+    assert graph.cycles() == [[recursive]]
+
+
+def test_resolve_intern(multi_file_spec):
+    import sys
+
+    root = str(multi_file_spec.join("root.yaml"))
+    res = resolver.RefResolver(get_specs(root), fs.abspath(root), intern=True)
+    res.resolve_references()
+
+    # Strings from different files are the same objects.
+    assert res.specs["pet"]["tag"]["type"] is sys.intern("string")
+    assert res.specs["error"]["type"] is res.specs["pet"]["tag"]["type"]
+
+
+@pytest.mark.parametrize("share", [False, True])
+def test_resolve_freeze(multi_file_spec, share):
+    from prance.util.frozen import is_frozen
+
+    root = str(multi_file_spec.join("root.yaml"))
+    plain = resolver.RefResolver(get_specs(root), fs.abspath(root))
+    plain.resolve_references()
+
+    cache = {}
+    res = resolver.RefResolver(
+        get_specs(root),
+        fs.abspath(root),
+        freeze=True,
+        reference_cache=cache,
+        share_references=share,
+    )
+    res.resolve_references()
+
+    assert res.specs == plain.specs
+    assert is_frozen(res.specs)
+    assert is_frozen(res.specs["nested"]["inner"]["tag"])
+    assert hash(res.specs) == hash(res.specs)
+
+    # Parsed files are cached frozen, and values without references are
+    # shared with the cache rather than copied.
+    from prance.util.url import absurl, urlresource
+
+    b_key = (urlresource(absurl(fs.abspath(str(multi_file_spec.join("b.yaml"))))), True)
+    assert is_frozen(cache[b_key])
+    assert res.specs["error"] is cache[b_key]["Error"]
@@ -0,0 +1,136 @@
+"""Test suite for prance.util.stats ."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+import pytest
+
+from prance.util import fs, formats
+from prance.util.resolver import RefResolver
+from prance.util.stats import ReferenceStats
+from prance.util.url import ResolutionError
+
+A = ("file:///spec.yaml", ("definitions", "A"))
+B = ("file:///spec.yaml", ("definitions", "B"))
+
+
+def resolve(fname, **options):
+    stats = options.setdefault("reference_stats", ReferenceStats())
+    specs = formats.parse_spec(fs.read_file(fname), fname)
+    resolver = RefResolver(specs, fs.abspath(fname), **options)
+    resolver.resolve_references()
+    return stats, resolver
+
+
+def test_collect():
+    stats = ReferenceStats()
+
+    stats.begin()
+    stats.begin()
+    stats.end(B, {"type": "string"})
+    stats.end(A, {"properties": {"b": {"type": "string"}}})
+    stats.begin()
+    stats.end(B, None, failed=True)
+
+    assert len(stats) == 2
+    a = stats.targets[A]
+    b = stats.targets[B]
+    assert a["inlined"] == 1
+    assert a["nodes"] == 4
+    assert a["bytes"] == len('{"properties":{"b":{"type":"string"}}}')
+    assert b["inlined"] == 1
+    assert b["failed"] == 1
+    assert b["nodes"] == 2
+
+    # The time spent on B is part of the time, but not the self time of A.
+    assert a["time"] >= a["self_time"] >= 0
+
+
+def test_circular_value():
+    stats = ReferenceStats()
+    value = {}
+    value["self"] = value
+
+    stats.begin()
+    stats.end(A, value)
+    assert stats.targets[A]["inlined"] == 1
+    assert stats.targets[A]["bytes"] == 0
+
+
+def test_top():
+    stats = ReferenceStats()
+    for target, value, count in ((A, "a" * 10, 1), (B, "b", 3)):
+        for _ in range(count):
+            stats.begin()
+            stats.end(target, value)
+
+    assert [target for target, _ in stats.top()] == [A, B]
+    assert [target for target, _ in stats.top(sort="inlined")] == [B, A]
+    assert [target for target, _ in stats.top(1, sort="inlined")] == [B]
+    with pytest.raises(ValueError):
+        stats.top(sort="foo")
+
+    as_dict = stats.to_dict(sort="inlined")
+    assert as_dict["references"][0]["target"] == "file:///spec.yaml#/definitions/B"
+    assert as_dict["references"][0]["inlined"] == 3
+
+    lines = stats.format(1).splitlines()
+    assert len(lines) == 2
+    assert lines[1].endswith("file:///spec.yaml#/definitions/A")
+
+
+def petstore_targets():
+    from prance.util.url import absurl, urlresource
+
+    resource = urlresource(absurl(fs.abspath("tests/specs/petstore.yaml")))
+    return (resource, ("definitions", "Pet")), (resource, ("definitions", "Pets"))
+
+
+def test_resolver():
+    stats, resolver = resolve("tests/specs/petstore.yaml")
+    pet, pets = petstore_targets()
+
+    targets = stats.targets
+    assert len(targets) == 3
+    # Pet is referenced directly twice, and once from Pets.
+    assert targets[pet]["inlined"] == 3
+    assert targets[pets]["inlined"] == 2
+    assert targets[pets]["time"] >= targets[pets]["self_time"]
+
+    # Pets includes the size of the inlined Pet.
+    import json
+
+    resolved = resolver.specs["definitions"]["Pets"]
+    assert targets[pets]["bytes"] == 2 * len(
+        json.dumps(resolved, separators=(",", ":"))
+    )
+    assert targets[pets]["nodes"] > targets[pet]["nodes"] / 3 * 2
+
+
+def test_resolver_shared():
+    stats, _ = resolve("tests/specs/petstore.yaml")
+    shared, _ = resolve("tests/specs/petstore.yaml", share_references=True)
+    pet, pets = petstore_targets()
+
+    # References within shared objects are dereferenced only once.
+    assert shared.targets[pets] == dict(
+        stats.targets[pets],
+        time=shared.targets[pets]["time"],
+        self_time=shared.targets[pets]["self_time"],
+    )
+    assert shared.targets[pet]["inlined"] == 2
+
+
+def test_resolver_failed(tmpdir):
+    tmpdir.join("spec.yaml").write("foo:\n  $ref: 'other.yaml#/foo'\n")
+    tmpdir.join("other.yaml").write("foo:\n  $ref: 'nonexistent.yaml#/foo'\n")
+
+    stats = ReferenceStats()
+    with pytest.raises(ResolutionError):
+        resolve(str(tmpdir.join("spec.yaml")), reference_stats=stats)
+
+    # Both the missing reference, and the reference containing it failed.
+    assert sorted(entry["failed"] for entry in stats.targets.values()) == [1, 1]
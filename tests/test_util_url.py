@@ -107,6 +107,34 @@ def test_absurl_paths_win32():
     assert res.geturl() == expect
 
 
+def test_absurl_fragment_no_filesystem():
+    from unittest.mock import patch
+
+    base = url.absurl("file:///etc/passwd#base")
+    with patch("os.lstat") as lstat, patch("os.readlink") as readlink:
+        res = url.absurl("#/definitions/foo", base)
+    lstat.assert_not_called()
+    readlink.assert_not_called()
+    assert res.geturl() == "file:///etc/passwd#/definitions/foo"
+
+
+@pytest.mark.skipif(platform("win32"), reason="Skip on win32")
+def test_absurl_cached(tmpdir):
+    from unittest.mock import patch
+
+    url.absurl.cache_clear()
+    base = url.absurl(str(tmpdir.join("base.yaml")))
+    first = url.absurl("other.yaml#/foo", base)
+    with patch("os.lstat") as lstat, patch("os.readlink") as readlink:
+        second = url.absurl("other.yaml#/bar", base._replace(fragment="/baz"))
+    lstat.assert_not_called()
+    readlink.assert_not_called()
+
+    assert first.path == second.path == str(tmpdir.join("other.yaml"))
+    assert first.fragment == "/foo"
+    assert second.fragment == "/bar"
+
+
 def test_urlresource():
     parsed = url.absurl("http://foo.bar/asdf?some=query#myfrag")
     res = url.urlresource(parsed)
@@ -174,6 +202,29 @@ def test_fetch_url_cached():
     assert id(content1["swagger"]) == id(content2["swagger"])
 
 
+def test_fetch_url_intern(tmpdir):
+    import sys
+
+    from prance.util.cache import DiskCache
+
+    fname = str(tmpdir.join("spec.yaml"))
+    with open(fname, "w") as handle:
+        handle.write("foo:\n  type: string\n200:\n  type: string\n")
+    parsed = url.absurl(fname)
+
+    first = url.fetch_url(parsed, intern=True, strict=False)
+    # Stringified keys are interned, too.
+    key = [k for k in first if k == "200"][0]
+    assert key is sys.intern("200")
+    assert first["foo"]["type"] is sys.intern("string")
+
+    # Results from the disk cache are interned.
+    disk_cache = DiskCache(str(tmpdir.join("cache")))
+    url.fetch_url(parsed, disk_cache=disk_cache)
+    second = url.fetch_url(parsed, disk_cache=disk_cache, intern=True)
+    assert second["foo"]["type"] is sys.intern("string")
+
+
 def test_fetch_url_text_cached():
     from prance.util import fs
 
@@ -201,3 +252,81 @@ def test_fetch_url_python():
     exturl = "python://tests/specs/petstore.yaml"
     content = url.fetch_url(url.absurl(exturl))
     assert content["swagger"] == "2.0"
+
+
+def test_http_fetcher_session():
+    fetcher = url.HTTPFetcher(pool_size=3, retries=5, timeout=7)
+    adapter = fetcher.session.get_adapter("https://example.com/")
+    assert adapter.max_retries.total == 5
+    assert adapter._pool_maxsize == 3
+    assert fetcher.timeout == 7
+    fetcher.close()
+
+
+def test_http_fetcher_fetch():
+    from unittest.mock import Mock
+    from .mock_response import MockResponse, PETSTORE_YAML
+
+    session = Mock()
+    session.get.return_value = MockResponse(text=PETSTORE_YAML)
+
+    with url.HTTPFetcher(session=session, timeout=5) as fetcher:
+        parsed = url.absurl("http://example.com/petstore.yaml#/definitions/Pet")
+        content = url.fetch_url(parsed, {}, fetcher=fetcher)
+        assert content["swagger"] == "2.0"
+
+    session.get.assert_called_once_with(
+        "http://example.com/petstore.yaml", headers={}, timeout=5
+    )
+
+
+def test_http_fetcher_error():
+    from unittest.mock import Mock
+    from .mock_response import MockResponse
+
+    session = Mock()
+    session.get.return_value = MockResponse(is_ok=False, status_code=404)
+
+    fetcher = url.HTTPFetcher(session=session)
+    with pytest.raises(url.ResolutionError):
+        fetcher.fetch(url.absurl("http://example.com/petstore.yaml"))
+
+
+def test_http_fetcher_conditional(tmpdir):
+    from unittest.mock import Mock
+    from .mock_response import MockResponse, PETSTORE_YAML
+
+    headers = {"content-type": "application/yaml", "etag": '"abc"'}
+    session = Mock()
+    session.get.return_value = MockResponse(text=PETSTORE_YAML, headers=headers)
+
+    fetcher = url.HTTPFetcher(session=session, disk_cache=str(tmpdir))
+    parsed = url.absurl("http://example.com/petstore.yaml")
+    assert fetcher.fetch(parsed) == (PETSTORE_YAML, "application/yaml")
+
+    # Revalidation succeeds, so we get the cached content.
+    session.get.return_value = MockResponse(status_code=304, is_ok=False)
+    assert fetcher.fetch(parsed) == (PETSTORE_YAML, "application/yaml")
+    _, kwargs = session.get.call_args
+    assert kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+
+def test_fetch_url_freeze(tmpdir):
+    from prance.util.frozen import is_frozen
+
+    fname = str(tmpdir.join("spec.yaml"))
+    with open(fname, "w") as handle:
+        handle.write("foo:\n  type: string\n")
+    parsed = url.absurl(fname)
+
+    cache = {}
+    first = url.fetch_url(parsed, cache, freeze=True, strict=False)
+    assert is_frozen(first)
+    assert url.fetch_url(parsed, cache, freeze=True, strict=False) is first
+
+    # Callers not asking for frozen specs get plain, mutable copies.
+    plain = url.fetch_url(parsed, cache, strict=False)
+    assert not is_frozen(plain)
+    assert not is_frozen(plain["foo"])
+    plain["foo"]["type"] = "integer"
+    assert first["foo"]["type"] == "string"
@@ -0,0 +1,73 @@
+"""Test suite for prance.util.validators ."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+import pytest
+
+from prance import BaseParser
+from prance import ValidationError
+from prance.util import validators
+
+from . import none_of
+
+
+@pytest.fixture
+def clear_validators():
+    validators.clear()
+    yield
+    validators.clear()
+
+
+def test_unknown_backend(clear_validators):
+    with pytest.raises(ValueError):
+        validators.get_validator("does_not_exist", 2)
+
+
+@pytest.mark.skipif(
+    none_of("openapi_spec_validator"),
+    reason="Missing dependencies: openapi_spec_validator",
+)
+def test_validator_is_cached(clear_validators):
+    first = validators.get_validator("openapi-spec-validator", 3, 0)
+    assert validators.get_validator("openapi-spec-validator", 3, 0) is first
+    assert validators.get_validator("openapi-spec-validator", 2, 0) is not first
+
+
+@pytest.mark.skipif(
+    none_of("openapi_spec_validator"),
+    reason="Missing dependencies: openapi_spec_validator",
+)
+def test_warm_up(clear_validators):
+    built = validators.warm_up(
+        backends=("openapi-spec-validator",), versions=((3, 0), (4, 0))
+    )
+    assert built == [("openapi-spec-validator", 3, 0)]
+
+    built = validators.warm_up(backends=("openapi-spec-validator",))
+    assert built == [
+        ("openapi-spec-validator", 2, 0),
+        ("openapi-spec-validator", 3, 0),
+        ("openapi-spec-validator", 3, 1),
+    ]
+
+
+@pytest.mark.skipif(
+    none_of("openapi_spec_validator"),
+    reason="Missing dependencies: openapi_spec_validator",
+)
+def test_parsers_share_validators(clear_validators):
+    BaseParser("tests/specs/petstore.yaml", backend="openapi-spec-validator")
+    first = validators.get_validator("openapi-spec-validator", 2, 0)
+
+    BaseParser("tests/specs/petstore.yaml", backend="openapi-spec-validator")
+    assert validators.get_validator("openapi-spec-validator", 2, 0) is first
+
+    with pytest.raises(ValidationError):
+        BaseParser(
+            spec_string='{"swagger": "2.0", "info": {}}',
+            backend="openapi-spec-validator",
+        )
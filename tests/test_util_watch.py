@@ -0,0 +1,40 @@
+"""Test suite for prance.util.watch ."""
+
+__author__ = "Jens Finkhaeuser"
+__copyright__ = "Copyright (c) 2016-2021 Jens Finkhaeuser"
+__license__ = "MIT"
+__all__ = ()
+
+
+from prance.util import fs
+from prance.util.url import absurl, urlresource
+from prance.util.watch import FileWatcher, url_to_filename
+
+
+def file_url(path):
+    return urlresource(absurl(fs.abspath(str(path))))
+
+
+def test_url_to_filename(tmpdir):
+    path = tmpdir.join("foo.yaml")
+    assert url_to_filename(file_url(path)) == fs.from_posix(fs.abspath(str(path)))
+    assert url_to_filename("http://example.org/foo.yaml") is None
+
+
+def test_poll(tmpdir):
+    existing = tmpdir.join("existing.yaml")
+    existing.write("foo: bar\n")
+    missing = tmpdir.join("missing.yaml")
+
+    watcher = FileWatcher([file_url(existing), "http://example.org/foo.yaml"])
+    watcher.watch([file_url(missing)])
+    assert watcher.urls() == {file_url(existing), file_url(missing)}
+    assert watcher.poll() == []
+
+    existing.write("foo: quux\n")
+    assert watcher.poll() == [file_url(existing)]
+    assert watcher.poll() == []
+
+    missing.write("foo: bar\n")
+    existing.remove()
+    assert set(watcher.poll()) == {file_url(existing), file_url(missing)}